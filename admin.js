@@ -4,6 +4,11 @@ document.addEventListener('DOMContentLoaded', () => {
     const secretInput = document.getElementById('api-secret-input');
     const statusEl = document.getElementById('status');
     const dashboard = document.getElementById('dashboard-content');
+    const loadMoreLogsBtn = document.getElementById('load-more-logs-btn');
+
+    // --- Состояние пагинации журнала ---
+    let activeToken = null;
+    let logsCursor = null;
 
     // --- Шаблоны ---
     const audienceCardTemplate = document.getElementById('audience-card-template');
@@ -29,9 +34,12 @@ document.addEventListener('DOMContentLoaded', () => {
             if (!response.ok) throw new Error(`Ошибка сервера: ${response.status}`);
 
             const data = await response.json();
+            activeToken = secretToken;
             
             renderAudienceStats(data.audience_stats);
+            document.getElementById('diagnostics-tbody').innerHTML = '';
             renderDiagnosticLogs(data.diagnostic_logs);
+            updateLogsCursor(data.diagnostic_logs_cursor);
             renderTrackStats(data.track_stats);
             
             dashboard.style.display = 'block';
@@ -41,6 +49,31 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     });
     
+    // --- Подгрузка следующей страницы журнала ---
+    loadMoreLogsBtn.addEventListener('click', async () => {
+        if (!activeToken || !logsCursor) return;
+
+        loadMoreLogsBtn.disabled = true;
+        try {
+            const params = new URLSearchParams({ logs_before: logsCursor });
+            const response = await fetch(`/api/stats?${params}`, { headers: { 'Authorization': `Bearer ${activeToken}` } });
+            if (!response.ok) throw new Error(`Ошибка сервера: ${response.status}`);
+
+            const data = await response.json();
+            renderDiagnosticLogs(data.diagnostic_logs);
+            updateLogsCursor(data.diagnostic_logs_cursor);
+        } catch (error) {
+            statusEl.textContent = `Ошибка: ${error.message}`;
+        } finally {
+            loadMoreLogsBtn.disabled = false;
+        }
+    });
+
+    const updateLogsCursor = (cursor) => {
+        logsCursor = cursor || null;
+        loadMoreLogsBtn.style.display = logsCursor ? 'inline-block' : 'none';
+    };
+
     // --- Функции рендеринга ---
 
     const renderAudienceStats = (stats) => {
@@ -66,7 +99,6 @@ document.addEventListener('DOMContentLoaded', () => {
 
     const renderDiagnosticLogs = (logs) => {
         const tbody = document.getElementById('diagnostics-tbody');
-        tbody.innerHTML = '';
         logs.forEach(record => {
             const rowFragment = logRowTemplate.content.cloneNode(true);
             const cells = rowFragment.querySelectorAll('td');
@@ -105,7 +137,9 @@ document.addEventListener('DOMContentLoaded', () => {
                     const trackFragment = trackTemplate.content.cloneNode(true);
                     trackFragment.querySelector('.track-title').textContent = track.title;
                     trackFragment.querySelector('.track-plays').textContent = track.plays;
-                    trackFragment.querySelector('.event-details').textContent = Object.entries(track.events).map(([e, c]) => `${e}: ${c}`).join('; ');
+                    const details = Object.entries(track.events).map(([e, c]) => `${e}: ${c}`);
+                    if (typeof track.unique_listeners === 'number') details.unshift(`слушателей: ~${track.unique_listeners}`);
+                    trackFragment.querySelector('.event-details').textContent = details.join('; ');
                     trackList.appendChild(trackFragment);
                 });
                 albumList.appendChild(albumFragment);
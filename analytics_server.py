@@ -0,0 +1,340 @@
+# analytics_server.py - Асинхронный (ASGI) сервер аналитики для самостоятельного размещения
+#
+# Те же маршруты и форматы ответов, что у api/listen.py и api/stats.py, но
+# поверх redis.asyncio: запрос, ожидающий Redis, не занимает поток, и один
+# процесс держит тысячи одновременных событий прослушивания.
+#
+# Запуск (нужен любой ASGI-сервер, например uvicorn):
+#   uvicorn analytics_server:app --host 0.0.0.0 --port 8000
+# или просто python analytics_server.py (ANALYTICS_HOST, ANALYTICS_PORT).
+# С ANALYTICS_WRITE_BUFFER=1 события пишутся в Redis не сразу, а пачками
+# через буфер (см. api/_event_buffer.py).
+
+import os
+import json
+import asyncio
+import logging
+import dotenv
+from datetime import datetime, timezone
+from urllib.parse import parse_qs
+from redis.exceptions import RedisError, ConnectionError as RedisConnectionError
+from api._redis_pool import get_async_redis_client, reset_async_redis_pool
+from api._analytics import (
+    unpack_event_payload, validate_events, describe_client, user_agent_cache_info,
+    run_steps_async, record_events_steps, timeseries_steps, leaderboard_steps, MAX_BATCH_SIZE
+)
+from api._event_buffer import EventBuffer, WRITE_BUFFER_ENABLED, FLUSH_INTERVAL, FLUSH_MAX_EVENTS
+from api._stats_report import (
+    is_authorized, parse_log_query, parse_series_query, series_response_body, parse_top_query, top_response_body,
+    overview_steps, snapshot_steps
+)
+
+# Загрузка переменных окружения
+dotenv.load_dotenv('.env.development.local')
+
+# Предел тела запроса: пакет из MAX_BATCH_SIZE событий с запасом
+MAX_BODY_SIZE = int(os.environ.get("ANALYTICS_MAX_BODY_SIZE", 256 * 1024))
+# Попытки последнего сброса буфера при остановке сервера
+SHUTDOWN_FLUSH_ATTEMPTS = 3
+
+# --- Конфигурация логирования ---
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+
+class RequestTooLarge(Exception):
+    pass
+
+
+class Request:
+    """Разобранный ASGI-запрос: метод, путь, строка запроса, заголовки, тело."""
+
+    def __init__(self, scope, receive):
+        self.method = scope['method']
+        self.path = scope['path']
+        self.query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        # Имена заголовков в ASGI уже в нижнем регистре
+        self.headers = {name.decode('latin-1'): value.decode('latin-1') for name, value in scope['headers']}
+        self._receive = receive
+
+    async def body(self, limit=MAX_BODY_SIZE):
+        chunks = []
+        size = 0
+        while True:
+            message = await self._receive()
+            if message['type'] == 'http.disconnect':
+                return b''
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > limit:
+                raise RequestTooLarge()
+            chunks.append(chunk)
+            if not message.get('more_body', False):
+                return b''.join(chunks)
+
+
+async def send_response(send, status_code, content_type='application/json; charset=utf-8', body=b'', headers=None):
+    """Отправляет HTTP-ответ."""
+    raw_headers = [(b'content-type', content_type.encode('latin-1'))]
+    raw_headers += [(name.lower().encode('latin-1'), str(value).encode('latin-1')) for name, value in (headers or {}).items()]
+    await send({'type': 'http.response.start', 'status': status_code, 'headers': raw_headers})
+    await send({'type': 'http.response.body', 'body': body or b''})
+
+
+async def send_error(send, status_code, message, headers=None):
+    """Отправляет стандартизированный ответ с ошибкой."""
+    error_payload = json.dumps({'error': message}, ensure_ascii=False).encode('utf-8')
+    await send_response(send, status_code, body=error_payload, headers=headers)
+
+
+# --- Буфер записи ---
+
+class BufferFlusher:
+    """
+    Фоновый сброс EventBuffer в Redis: раз в FLUSH_INTERVAL секунд или
+    сразу, как только накопилось FLUSH_MAX_EVENTS событий. Несброшенное
+    из-за ошибки возвращается в буфер и уходит при следующем сбросе.
+    """
+
+    def __init__(self, interval=FLUSH_INTERVAL, max_events=FLUSH_MAX_EVENTS):
+        self.buffer = EventBuffer()
+        self.interval = interval
+        self.max_events = max_events
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def add(self, events, client):
+        self.start()
+        self.buffer.queue(events, client)
+        if len(self.buffer) >= self.max_events:
+            self._wakeup.set()
+
+    async def _run(self):
+        # Цикл не отменяется, а завершается по флагу: отмена посреди
+        # pipe.execute() оборвала бы сброс уже забранного из буфера пакета
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self):
+        """Сбрасывает накопленное одним конвейером. Возвращает True при успехе."""
+        if not len(self.buffer):
+            return True
+        batch = self.buffer.take()
+        try:
+            pipe = get_async_redis_client().pipeline()
+            batch.apply(pipe)
+            await pipe.execute()
+        except (RedisError, ConnectionError) as e:
+            logging.error(f"Failed to flush {len(batch)} buffered event(s), will retry: {e}")
+            self.buffer.merge(batch)
+            return False
+        except BaseException:
+            # Отмена (CancelledError) или непредвиденная ошибка: пакет
+            # возвращается в буфер. Если Redis успел выполнить конвейер,
+            # события будут записаны повторно - это лучше, чем потерять их.
+            self.buffer.merge(batch)
+            raise
+        logging.info(f"Flushed {len(batch)} buffered event(s) as {len(batch.counters)} counter update(s).")
+        return True
+
+    async def stop(self):
+        """Останавливает фоновый сброс и сбрасывает остаток буфера."""
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            try:
+                await self._task
+            except Exception as e:
+                logging.error(f"Buffer flush loop failed: {e}")
+            self._task = None
+
+        for attempt in range(SHUTDOWN_FLUSH_ATTEMPTS):
+            if await self.flush():
+                return
+            await asyncio.sleep(2 ** attempt)
+        logging.critical(f"Lost {len(self.buffer)} buffered event(s) on shutdown.")
+
+
+write_buffer = BufferFlusher() if WRITE_BUFFER_ENABLED else None
+
+
+# --- /api/listen ---
+
+async def handle_listen(request, send):
+    """Асинхронный вариант api/listen.py: приём событий прослушивания."""
+    try:
+        body = await request.body()
+    except RequestTooLarge:
+        return await send_error(send, 413, "Request body is too large.")
+    if not body:
+        return await send_error(send, 400, "Request body is empty.")
+
+    try:
+        data = json.loads(body.decode('utf-8'))
+    except json.JSONDecodeError:
+        logging.warning("Failed to decode JSON from request body.")
+        return await send_error(send, 400, "Invalid JSON format.")
+
+    try:
+        items, is_batch = unpack_event_payload(data)
+    except ValueError as e:
+        return await send_error(send, 400, str(e))
+    if not items:
+        return await send_error(send, 400, "Request contains no events.")
+    if len(items) > MAX_BATCH_SIZE:
+        return await send_error(send, 413, f"Too many events in one request (max {MAX_BATCH_SIZE}).")
+
+    events, results = validate_events(items, datetime.now(timezone.utc))
+
+    if not events:
+        if not is_batch:
+            return await send_error(send, 400, results[0]['error'])
+        return await send_response(send, 400, body=json.dumps({'accepted': 0, 'rejected': len(results), 'results': results}).encode('utf-8'))
+
+    client = describe_client(
+        request.headers.get('user-agent', 'Unknown'),
+        request.headers.get('x-forwarded-for', 'Not Found'),
+        request.headers.get('x-vercel-ip-country', 'XX'),
+    )
+
+    if write_buffer is not None:
+        # Ответ не ждёт Redis: события уйдут при ближайшем сбросе буфера
+        write_buffer.add(events, client)
+    else:
+        # Все события пакета записываются одним скриптом - один сетевой обмен.
+        # Запись «сырыми» байтами, как и в api/listen.py.
+        await run_steps_async(record_events_steps(events, client), get_async_redis_client())
+
+    logging.info(f"Successfully processed {len(events)} of {len(items)} event(s).")
+    logging.debug(f"User-Agent cache: {user_agent_cache_info()}")
+
+    if not is_batch:
+        return await send_response(send, 204)
+
+    await send_response(send, 200, body=json.dumps({
+        'accepted': len(events),
+        'rejected': len(items) - len(events),
+        'results': results
+    }).encode('utf-8'))
+
+
+# --- /api/stats ---
+
+async def handle_stats(request, send):
+    """Асинхронный вариант api/stats.py."""
+    expected_token = os.environ.get("STATS_API_SECRET")
+    if not expected_token:
+        logging.error("STATS_API_SECRET не установлен на сервере.")
+        return await send_error(send, 500, "Server configuration error.")
+    if not is_authorized(request.headers.get('authorization', ''), expected_token):
+        return await send_error(send, 401, "Unauthorized.")
+
+    query = request.query
+    try:
+        log_query = parse_log_query(query)
+    except ValueError as e:
+        return await send_error(send, 400, str(e))
+
+    redis_client = get_async_redis_client(decode_responses=True)
+
+    if 'series' in query:
+        try:
+            series_query = parse_series_query(query)
+            series = await run_steps_async(timeseries_steps(**series_query), redis_client)
+        except ValueError as e:
+            return await send_error(send, 400, str(e))
+        return await send_response(send, 200, body=series_response_body(series_query, series))
+
+    if 'top' in query:
+        try:
+            top_query = parse_top_query(query)
+        except ValueError as e:
+            return await send_error(send, 400, str(e))
+        ranking = await run_steps_async(leaderboard_steps(**top_query), redis_client)
+        return await send_response(send, 200, body=top_response_body(top_query, ranking))
+
+    if not query:
+        status, body, headers = await run_steps_async(snapshot_steps(log_query, request.headers.get('if-none-match')), redis_client)
+        return await send_response(send, status, body=body, headers=headers)
+
+    await send_response(send, 200, body=await run_steps_async(overview_steps(log_query), redis_client))
+
+
+# --- Приложение ---
+
+ROUTES = {
+    '/api/listen': ('POST', handle_listen),
+    '/api/stats': ('GET', handle_stats),
+}
+
+
+async def lifespan(receive, send):
+    """Запускает сброс буфера записи; при остановке сбрасывает остаток и закрывает соединения Redis."""
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            if write_buffer is not None:
+                write_buffer.start()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            if write_buffer is not None:
+                await write_buffer.stop()
+            await reset_async_redis_pool()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    if scope['type'] != 'http':
+        return
+
+    request = Request(scope, receive)
+    route = ROUTES.get(request.path.rstrip('/'))
+    if route is None:
+        return await send_error(send, 404, "Not found.")
+    method, route_handler = route
+    if request.method != method:
+        return await send_error(send, 405, "Method not allowed.", headers={'Allow': method})
+
+    try:
+        await route_handler(request, send)
+    except RedisConnectionError as e:
+        # Пул не сбрасывается: им одновременно пользуются другие запросы.
+        # Оборванное соединение пул закрывает сам, а остальные проверяет
+        # health_check_interval и повторы (см. api/_redis_pool.py).
+        logging.critical(f"Redis connection lost: {e}")
+        await send_error(send, 503, "Service Unavailable: Cannot connect to the database.")
+    except ConnectionError as e:
+        logging.critical(f"Redis connection failed: {e}")
+        await send_error(send, 503, "Service Unavailable: Cannot connect to the database.")
+    except Exception as e:
+        logging.exception(f"An unexpected error occurred in {request.path} handler: {e}")
+        await send_error(send, 500, "An internal server error occurred.")
+
+
+if __name__ == '__main__':
+    try:
+        import uvicorn
+    except ImportError:
+        print("ОШИБКА: для запуска нужен ASGI-сервер: pip install uvicorn")
+    else:
+        uvicorn.run(
+            'analytics_server:app',
+            host=os.environ.get('ANALYTICS_HOST', '127.0.0.1'),
+            port=int(os.environ.get('ANALYTICS_PORT', 8000)),
+        )
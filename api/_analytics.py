@@ -0,0 +1,840 @@
+# api/_analytics.py - Схема ключей Redis и общие операции аналитики
+import os
+import re
+import hmac
+import hashlib
+import inspect
+import logging
+from functools import lru_cache
+from itertools import islice
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
+from user_agents import parse as parse_user_agent
+
+# --- Шаги запросов к Redis ---
+# Чтения и записи, общие для синхронных обработчиков (api/*.py, redis-py) и
+# асинхронного сервера (analytics_server.py, redis.asyncio), написаны один
+# раз - генераторами шагов. Шаг - функция от клиента Redis; генератор
+# отдаёт шаг и получает обратно его результат, а итог возвращает через
+# return. run_steps выполняет шаги синхронно, run_steps_async - ожидая их,
+# поэтому логика (ключи, разбор, порядок запросов) у обоих одна.
+
+def new_pipeline(redis_client):
+    """Шаг: новый конвейер (pipe = yield new_pipeline)."""
+    return redis_client.pipeline()
+
+
+def execute(pipe):
+    """Шаг: выполнить накопленный конвейер."""
+    return lambda redis_client: pipe.execute()
+
+
+def command(name, *args, **kwargs):
+    """Шаг: одна команда Redis, например command('hget', key, field)."""
+    return lambda redis_client: getattr(redis_client, name)(*args, **kwargs)
+
+
+def run_steps(steps, redis_client):
+    """Выполняет генератор шагов синхронно и возвращает его результат."""
+    result, error = None, None
+    while True:
+        try:
+            step = steps.throw(error) if error is not None else steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            result, error = step(redis_client), None
+        except Exception as e:
+            # Ошибка уходит в генератор: его обработчик (например, снятие
+            # блокировки) тоже может выполнить шаг
+            result, error = None, e
+
+
+async def run_steps_async(steps, redis_client):
+    """Асинхронный run_steps: результаты шагов ожидаются."""
+    result, error = None, None
+    while True:
+        try:
+            step = steps.throw(error) if error is not None else steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            result, error = step(redis_client), None
+            if inspect.isawaitable(result):
+                result = await result
+        except Exception as e:
+            result, error = None, e
+
+
+# --- Приём событий ---
+# Клиент может прислать одно событие {trackId, eventType} или пакет:
+# список событий либо {"events": [...]}. Время события (timestamp) задаёт
+# клиент - в мс от эпохи или в ISO 8601; явно неправдоподобное время
+# (из будущего или старше суток) заменяется серверным.
+MAX_BATCH_SIZE = int(os.environ.get("ANALYTICS_MAX_BATCH_SIZE", 50))
+CLIENT_CLOCK_MAX_SKEW = timedelta(minutes=5)
+CLIENT_EVENT_MAX_AGE = timedelta(hours=24)
+PLAY_EVENT_TYPE = '30s_listen'
+
+
+def unpack_event_payload(data):
+    """
+    Приводит тело запроса к списку событий.
+
+    Returns:
+        (items, is_batch) - is_batch равен False для одиночного события,
+        чтобы обработчик сохранил прежний формат ответа.
+    """
+    if isinstance(data, list):
+        return data, True
+    if isinstance(data, dict) and 'events' in data:
+        if not isinstance(data['events'], list):
+            raise ValueError("events must be a list.")
+        return data['events'], True
+    return [data], False
+
+
+def _parse_client_timestamp(value, now):
+    """Разбирает клиентское время события, возвращая datetime в UTC."""
+    if value is None:
+        return now
+    if isinstance(value, bool):
+        raise ValueError("timestamp is invalid.")
+    if isinstance(value, (int, float)):
+        moment = datetime.fromtimestamp(value / 1000, tz=timezone.utc)
+    elif isinstance(value, str):
+        moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+    else:
+        raise ValueError("timestamp is invalid.")
+
+    if moment > now + CLIENT_CLOCK_MAX_SKEW or moment < now - CLIENT_EVENT_MAX_AGE:
+        return now
+    return moment
+
+
+def validate_event(raw, now):
+    """
+    Проверяет одно событие из тела запроса.
+
+    Returns:
+        (event, None) в случае успеха или (None, сообщение об ошибке).
+    """
+    if not isinstance(raw, dict):
+        return None, "Event must be a JSON object."
+
+    track_id = raw.get('trackId')
+    if not track_id or not isinstance(track_id, str):
+        return None, "trackId is required."
+
+    event_type = raw.get('eventType', 'unknown')
+    if not isinstance(event_type, str) or TRACK_EVENT_SEPARATOR in event_type:
+        return None, "eventType is invalid."
+
+    try:
+        moment = _parse_client_timestamp(raw.get('timestamp'), now)
+    except (ValueError, OverflowError, OSError):
+        return None, "timestamp is invalid."
+
+    return {'trackId': track_id, 'eventType': event_type, 'moment': moment}, None
+
+
+def validate_events(items, now):
+    """
+    Проверяет все события пакета.
+
+    Returns:
+        (events, results) - принятые события и статус каждого элемента
+        пакета в формате ответа /api/listen.
+    """
+    results = []
+    events = []
+    for index, raw in enumerate(items):
+        event, error = validate_event(raw, now)
+        if error:
+            results.append({'index': index, 'status': 'error', 'error': error})
+        else:
+            results.append({'index': index, 'status': 'ok'})
+            events.append(event)
+    return events, results
+
+
+def describe_client(user_agent_string, forwarded_for, country):
+    """Собирает сведения о слушателе по значениям заголовков запроса."""
+    browser, os_family, device = classify_user_agent(user_agent_string)
+    return {
+        'ip': forwarded_for,
+        'country': country,
+        'userAgent': user_agent_string,
+        'browser': browser,
+        'os': os_family,
+        'device': device,
+        'listener': listener_id(forwarded_for, user_agent_string),
+    }
+
+
+def queue_events(pipe, events, client):
+    """
+    Добавляет в конвейер записи всех событий пакета и один раз
+    увеличивает версию данных статистики (см. STATS_VERSION_KEY).
+    """
+    for event in events:
+        queue_event(pipe, event, client)
+    pipe.incr(STATS_VERSION_KEY)
+
+
+def queue_event(pipe, event, client):
+    """
+    Добавляет в конвейер все записи одного события.
+
+    Args:
+        event: Результат validate_event.
+        client: Сведения о слушателе - ip, country, userAgent, browser, os, device.
+    """
+    track_id = event['trackId']
+    event_type = event['eventType']
+
+    if event_type == PLAY_EVENT_TYPE:
+        pipe.hincrby('v2:listen_counts', track_id, 1)
+
+    pipe.hincrby(TRACK_EVENTS_KEY, track_event_field(track_id, event_type), 1)
+
+    pipe.hincrby('v2:stats:browsers', client['browser'], 1)
+    pipe.hincrby('v2:stats:os', client['os'], 1)
+    pipe.hincrby('v2:stats:devices', client['device'], 1)
+    pipe.hincrby('v2:stats:countries', client['country'], 1)
+
+    queue_timeseries(pipe, event, client)
+
+    if event_type == PLAY_EVENT_TYPE and client.get('listener'):
+        queue_unique_listener(pipe, event, client['listener'])
+
+    if event_type == PLAY_EVENT_TYPE:
+        queue_leaderboards(pipe, event)
+
+    append_diagnostic_log(pipe, {
+        'ip': client['ip'],
+        'country': client['country'],
+        'userAgent': client['userAgent'],
+        'trackId': track_id,
+        'eventType': event_type,
+        'timestamp': event['moment'].isoformat()
+    })
+
+
+# --- Классификация User-Agent ---
+# Разбор User-Agent - каскад регулярных выражений и самый дорогой шаг приёма
+# события. Аудитория использует небольшой набор строк UA, поэтому результат
+# кэшируется (LRU) на время жизни процесса. Очень длинные строки обрезаются,
+# чтобы размер кэша оставался ограниченным и по памяти.
+USER_AGENT_CACHE_SIZE = int(os.environ.get("USER_AGENT_CACHE_SIZE", 1024))
+MAX_USER_AGENT_LENGTH = 512
+
+
+@lru_cache(maxsize=USER_AGENT_CACHE_SIZE)
+def _classify_user_agent(user_agent_string):
+    user_agent = parse_user_agent(user_agent_string)
+    return (
+        user_agent.browser.family,
+        user_agent.os.family,
+        'Mobile' if user_agent.is_mobile else 'Desktop',
+    )
+
+
+def classify_user_agent(user_agent_string):
+    """Возвращает (browser, os, device) для строки User-Agent, используя кэш."""
+    return _classify_user_agent(user_agent_string[:MAX_USER_AGENT_LENGTH])
+
+
+def user_agent_cache_info():
+    """Счётчики кэша User-Agent: hits, misses, maxsize, currsize."""
+    return _classify_user_agent.cache_info()
+
+
+# --- Снимок статистики ---
+# Каждая запись событий увеличивает STATS_VERSION_KEY. /api/stats хранит
+# готовый ответ в хеше STATS_SNAPSHOT_KEY (version, built_at, body) и
+# пересобирает его, только если версия изменилась и с прошлой сборки прошло
+# не меньше STATS_SNAPSHOT_MIN_AGE секунд. Версия снимка служит ETag.
+STATS_VERSION_KEY = 'v2:stats:version'
+STATS_SNAPSHOT_KEY = 'v2:stats:snapshot'
+STATS_SNAPSHOT_LOCK_KEY = 'v2:stats:snapshot:lock'
+STATS_SNAPSHOT_MIN_AGE = int(os.environ.get("STATS_SNAPSHOT_MIN_AGE", 30))
+STATS_SNAPSHOT_LOCK_TTL = 30
+
+
+# --- Счётчики событий по трекам ---
+# Все счётчики лежат в одном хеше с полями "<trackId>|<eventType>", поэтому
+# статистика читает их одной командой HGETALL, без сканирования ключей.
+TRACK_EVENTS_KEY = 'v2:track_events'
+TRACK_EVENT_SEPARATOR = '|'
+
+
+def track_event_field(track_id, event_type):
+    """Возвращает поле хеша TRACK_EVENTS_KEY для пары трек/событие."""
+    return f"{track_id}{TRACK_EVENT_SEPARATOR}{event_type}"
+
+
+def split_track_event_field(field):
+    """
+    Разбирает поле хеша TRACK_EVENTS_KEY на (trackId, eventType).
+
+    Разделитель ищется справа: тип события его не содержит,
+    а в идентификаторе трека (URL) он теоретически возможен.
+    """
+    track_id, _, event_type = field.rpartition(TRACK_EVENT_SEPARATOR)
+    return track_id, event_type
+
+
+# Суффикс версии в папке релиза (см. release_versions.py)
+RELEASE_VERSION_PATTERN = re.compile(r'@v\d{14}$')
+
+
+def track_identity(full_url):
+    """
+    (исполнитель, альбом, название) трека по его URL или None, если URL
+    не похож на music/<исполнитель>/<релиз>/<файл>.
+    """
+    # ВАЖНО: Используем lstrip, чтобы убрать возможный / в начале
+    path = urlparse(full_url).path.lstrip('/')
+    parts = path.split('/')
+
+    if len(parts) != 4 or parts[0] != 'music':
+        return None
+
+    artist_name, album_raw, track_file = parts[1], parts[2], parts[3]
+
+    # Заменённые альбомы лежат в папках версий "<релиз>@v<дата>" -
+    # статистика всех версий сводится к одному альбому
+    album_raw = RELEASE_VERSION_PATTERN.sub('', album_raw)
+    album_name = re.sub(r'^(Album|EP|Demo)\.\s*', '', album_raw, flags=re.IGNORECASE).strip()
+    track_name = re.sub(r'^\d{1,2}[\s.\-_]*', '', os.path.splitext(track_file)[0]).strip()
+    return artist_name, album_name, track_name
+
+
+# --- Рейтинги треков ---
+# Отсортированные множества (ZINCRBY при каждом засчитанном прослушивании):
+# общий рейтинг, рейтинг каждого исполнителя и суточный рейтинг. Участник -
+# "<исполнитель>/<альбом>/<название>" (см. track_identity), так что версии
+# одного трека после замены альбома копят общий счёт. Первые N треков
+# читаются ZREVRANGE за O(log n + N) без выгрузки всей статистики.
+LEADERBOARD_PREFIX = 'v2:top:'
+LEADERBOARD_GLOBAL_KEY = f'{LEADERBOARD_PREFIX}tracks'
+LEADERBOARD_DAY_TTL = timedelta(days=int(os.environ.get("LEADERBOARD_DAILY_RETENTION_DAYS", 90)))
+LEADERBOARD_DEFAULT_LIMIT = 10
+LEADERBOARD_MAX_LIMIT = 100
+
+
+def leaderboard_member(full_url):
+    """Участник рейтингов для трека или None, если URL не похож на трек."""
+    try:
+        identity = track_identity(full_url)
+    except ValueError:
+        return None
+    return '/'.join(identity) if identity else None
+
+
+def split_leaderboard_member(member):
+    """'<исполнитель>/<альбом>/<название>' -> (исполнитель, альбом, название)."""
+    return tuple(member.split('/', 2))
+
+
+def leaderboard_artist_key(artist):
+    return f"{LEADERBOARD_PREFIX}artist:{artist}"
+
+
+def leaderboard_day_key(moment):
+    return f"{LEADERBOARD_PREFIX}day:{moment.astimezone(timezone.utc):%Y%m%d}"
+
+
+def queue_leaderboards(pipe, event):
+    """Добавляет в конвейер прослушивание трека во все рейтинги."""
+    member = leaderboard_member(event['trackId'])
+    if member is None:
+        return
+    artist = split_leaderboard_member(member)[0]
+    day_key = leaderboard_day_key(event['moment'])
+    pipe.zincrby(LEADERBOARD_GLOBAL_KEY, 1, member)
+    pipe.zincrby(leaderboard_artist_key(artist), 1, member)
+    pipe.zincrby(day_key, 1, member)
+    pipe.expire(day_key, LEADERBOARD_DAY_TTL)
+
+
+def queue_leaderboard_read(pipe, limit, artist=None, day=None):
+    """Добавляет в конвейер чтение первых limit треков рейтинга."""
+    if artist is not None:
+        key = leaderboard_artist_key(artist)
+    elif day is not None:
+        key = leaderboard_day_key(day)
+    else:
+        key = LEADERBOARD_GLOBAL_KEY
+    pipe.zrevrange(key, 0, limit - 1, withscores=True)
+
+
+def parse_leaderboard(result):
+    """Разбирает результат queue_leaderboard_read в список мест."""
+    ranking = []
+    for rank, (member, score) in enumerate(result, start=1):
+        artist, album, title = split_leaderboard_member(member)
+        ranking.append({'rank': rank, 'artist': artist, 'album': album, 'title': title, 'plays': int(score)})
+    return ranking
+
+
+def leaderboard_steps(limit, artist=None, day=None):
+    """Шаги чтения рейтинга (см. queue_leaderboard_read)."""
+    pipe = yield new_pipeline
+    queue_leaderboard_read(pipe, limit, artist, day)
+    return parse_leaderboard((yield execute(pipe))[0])
+
+
+# --- Временные ряды ---
+# Счётчики по интервалам времени: один хеш на интервал, поля вида
+# "<измерение>:<значение>" (например, "plays:<trackId>" или "country:DE").
+# Событие сразу пишется во все гранулярности, так что суточные и месячные
+# интервалы - это уже свёрнутые часовые. Мелкие интервалы живут недолго,
+# крупные - дольше; месячные хранятся бессрочно.
+TIMESERIES_PREFIX = 'v2:ts:'
+TIMESERIES_DIMENSIONS = ('plays', 'event', 'browser', 'os', 'device', 'country')
+TIMESERIES_GRANULARITIES = {
+    'hour': {'format': '%Y%m%d%H', 'ttl': timedelta(days=int(os.environ.get("TIMESERIES_HOURLY_RETENTION_DAYS", 14))), 'max_buckets': 24 * 14},
+    'day': {'format': '%Y%m%d', 'ttl': timedelta(days=int(os.environ.get("TIMESERIES_DAILY_RETENTION_DAYS", 400))), 'max_buckets': 400},
+    'month': {'format': '%Y%m', 'ttl': None, 'max_buckets': 120},
+}
+
+
+def timeseries_key(granularity, moment):
+    """Возвращает ключ хеша интервала, содержащего момент времени (UTC)."""
+    bucket = moment.astimezone(timezone.utc).strftime(TIMESERIES_GRANULARITIES[granularity]['format'])
+    return f"{TIMESERIES_PREFIX}{granularity}:{bucket}"
+
+
+def queue_timeseries(pipe, event, client):
+    """Добавляет в конвейер инкременты временных рядов для одного события."""
+    fields = [
+        f"event:{event['eventType']}",
+        f"browser:{client['browser']}",
+        f"os:{client['os']}",
+        f"device:{client['device']}",
+        f"country:{client['country']}",
+    ]
+    if event['eventType'] == PLAY_EVENT_TYPE:
+        fields.append(f"plays:{event['trackId']}")
+
+    for granularity, config in TIMESERIES_GRANULARITIES.items():
+        key = timeseries_key(granularity, event['moment'])
+        for field in fields:
+            pipe.hincrby(key, field, 1)
+        if config['ttl'] is not None:
+            pipe.expire(key, config['ttl'])
+
+
+def _bucket_starts(granularity, start, end):
+    """Перечисляет начала интервалов гранулярности от start до end включительно."""
+    start = start.astimezone(timezone.utc)
+    if granularity == 'hour':
+        current = start.replace(minute=0, second=0, microsecond=0)
+    elif granularity == 'day':
+        current = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    else:
+        current = start.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    while current <= end:
+        yield current
+        if granularity == 'hour':
+            current += timedelta(hours=1)
+        elif granularity == 'day':
+            current += timedelta(days=1)
+        else:
+            current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def queue_timeseries_reads(pipe, granularity, start, end, dimension, member=None):
+    """
+    Добавляет в конвейер чтение временного ряда одного измерения за период.
+
+    Args:
+        dimension: Одно из TIMESERIES_DIMENSIONS.
+        member: Необязательное значение измерения (например, trackId) -
+            тогда читается одно поле вместо всего хеша интервала.
+
+    Returns:
+        Список начал интервалов - для parse_timeseries.
+    """
+    # Генератор обрывается на max_buckets + 1: огромный период отклоняется,
+    # не перебирая все его интервалы
+    max_buckets = TIMESERIES_GRANULARITIES[granularity]['max_buckets']
+    buckets = list(islice(_bucket_starts(granularity, start, end), max_buckets + 1))
+    if len(buckets) > max_buckets:
+        raise ValueError(f"Range is too long for '{granularity}' granularity (max {max_buckets} buckets).")
+
+    for bucket in buckets:
+        if member is None:
+            pipe.hgetall(timeseries_key(granularity, bucket))
+        else:
+            pipe.hget(timeseries_key(granularity, bucket), f"{dimension}:{member}")
+    return buckets
+
+
+def parse_timeseries(buckets, results, dimension, member=None):
+    """
+    Разбирает результаты queue_timeseries_reads.
+
+    Returns:
+        Список {'start': ISO-время, 'values': {значение: счётчик}}.
+    """
+    prefix = f"{dimension}:"
+    series = []
+    for bucket, result in zip(buckets, results):
+        if member is None:
+            values = {k[len(prefix):]: int(v) for k, v in result.items() if k.startswith(prefix)}
+        else:
+            values = {member: int(result or 0)}
+        series.append({'start': bucket.isoformat(), 'values': values})
+    return series
+
+
+def timeseries_steps(granularity, start, end, dimension, member=None):
+    """Шаги чтения временного ряда одного измерения за период одним конвейером."""
+    pipe = yield new_pipeline
+    buckets = queue_timeseries_reads(pipe, granularity, start, end, dimension, member)
+    return parse_timeseries(buckets, (yield execute(pipe)), dimension, member)
+
+
+def read_timeseries(redis_client, granularity, start, end, dimension, member=None):
+    """Читает временной ряд одного измерения за период одним конвейером."""
+    return run_steps(timeseries_steps(granularity, start, end, dimension, member), redis_client)
+
+
+# --- Уникальные слушатели ---
+# Оценка числа разных слушателей (HyperLogLog, PFADD/PFCOUNT): по треку за
+# всё время и по всем трекам за сутки. Слушатель - это HMAC-SHA256 от IP
+# клиента и User-Agent с секретной солью ANALYTICS_LISTENER_SALT; сами IP
+# в счётчики не попадают, а без соли хеш нельзя сопоставить с адресом.
+# Каждый счётчик занимает не больше ~12 КБ независимо от числа слушателей.
+# Слушателем считается тот, чьё прослушивание засчитано (PLAY_EVENT_TYPE).
+# Без соли уникальные слушатели не считаются.
+UNIQUE_LISTENERS_PREFIX = 'v2:uniq:'
+UNIQUE_LISTENERS_DAY_TTL = timedelta(days=int(os.environ.get("UNIQUE_LISTENERS_RETENTION_DAYS", 400)))
+UNIQUE_LISTENERS_STATS_DAYS = int(os.environ.get("UNIQUE_LISTENERS_STATS_DAYS", 30))
+LISTENER_SALT = os.environ.get("ANALYTICS_LISTENER_SALT", "")
+LISTENER_ID_LENGTH = 16
+_listener_salt_warned = False
+
+
+def listener_id(forwarded_for, user_agent_string):
+    """
+    Анонимный идентификатор слушателя или None, если соль не задана.
+
+    Из X-Forwarded-For берётся первый адрес - адрес клиента, остальные
+    добавлены прокси.
+    """
+    global _listener_salt_warned
+    if not LISTENER_SALT:
+        # Предупреждаем при первом событии, а не при импорте: logging.warning
+        # до logging.basicConfig в обработчике отменил бы его настройку
+        if not _listener_salt_warned:
+            logging.warning("ANALYTICS_LISTENER_SALT is not set, unique listeners will not be counted.")
+            _listener_salt_warned = True
+        return None
+    ip = forwarded_for.split(',', 1)[0].strip()
+    message = f"{ip}|{user_agent_string}".encode('utf-8')
+    return hmac.new(LISTENER_SALT.encode('utf-8'), message, hashlib.sha256).hexdigest()[:LISTENER_ID_LENGTH]
+
+
+def unique_listeners_track_key(track_id):
+    return f"{UNIQUE_LISTENERS_PREFIX}track:{track_id}"
+
+
+def unique_listeners_day_key(moment):
+    return f"{UNIQUE_LISTENERS_PREFIX}day:{moment.astimezone(timezone.utc):%Y%m%d}"
+
+
+def queue_unique_listener(pipe, event, listener):
+    """Добавляет в конвейер учёт слушателя трека и суток события."""
+    pipe.pfadd(unique_listeners_track_key(event['trackId']), listener)
+    day_key = unique_listeners_day_key(event['moment'])
+    pipe.pfadd(day_key, listener)
+    pipe.expire(day_key, UNIQUE_LISTENERS_DAY_TTL)
+
+
+# --- Диагностический журнал ---
+# Журнал хранится в потоках Redis (Streams), по одному на сутки (UTC).
+# Каждый поток обрезается по MAXLEN и удаляется по TTL, поэтому память
+# ограничена, а идентификаторы записей (мс-<seq>) сразу упорядочены по времени.
+DIAGNOSTIC_LOG_PREFIX = 'v2:logs:'
+DIAGNOSTIC_LOG_RETENTION_DAYS = int(os.environ.get("DIAGNOSTIC_LOG_RETENTION_DAYS", 14))
+DIAGNOSTIC_LOG_MAXLEN = int(os.environ.get("DIAGNOSTIC_LOG_MAXLEN", 10000))
+DIAGNOSTIC_LOG_DEFAULT_LIMIT = 100
+DIAGNOSTIC_LOG_MAX_LIMIT = 1000
+
+
+def diagnostic_log_key(moment):
+    """Возвращает ключ суточного потока журнала для момента времени (UTC)."""
+    return f"{DIAGNOSTIC_LOG_PREFIX}{moment.astimezone(timezone.utc):%Y-%m-%d}"
+
+
+def append_diagnostic_log(pipe, record):
+    """
+    Добавляет запись журнала в конвейер (pipeline).
+
+    Поток выбирается по времени приёма, а не по клиентскому timestamp записи:
+    идентификаторы потока назначает Redis, и курсор пагинации опирается на них.
+    Поток обрезается приблизительно (MAXLEN ~), что для Redis почти бесплатно,
+    а TTL продлевается до конца окна хранения.
+    """
+    key = diagnostic_log_key(datetime.now(timezone.utc))
+    pipe.xadd(key, record, maxlen=DIAGNOSTIC_LOG_MAXLEN, approximate=True)
+    pipe.expire(key, timedelta(days=DIAGNOSTIC_LOG_RETENTION_DAYS + 1))
+
+
+def _stream_id_to_datetime(stream_id):
+    """Извлекает время записи из идентификатора потока вида '<мс>-<seq>'."""
+    millis = int(str(stream_id).split('-', 1)[0])
+    return datetime.fromtimestamp(millis / 1000, tz=timezone.utc)
+
+
+def validate_log_cursor(cursor):
+    """
+    Проверяет курсор страницы журнала ('<мс>-<seq>'). Время курсора должно
+    укладываться в datetime, иначе чтение журнала упало бы с OverflowError.
+    """
+    if not re.fullmatch(r'\d+-\d+', cursor):
+        raise ValueError("logs_before must be a log cursor.")
+    try:
+        _stream_id_to_datetime(cursor)
+    except (OverflowError, OSError, ValueError):
+        raise ValueError("logs_before must be a log cursor.")
+
+
+def diagnostic_log_window(before=None, since=None):
+    """
+    Границы чтения журнала: (первые сутки, последние сутки, max, min) -
+    потоки читаются от первых суток к более старым, max и min - аргументы
+    XREVRANGE для первого потока (для остальных max равен '+').
+    """
+    now = datetime.now(timezone.utc)
+    retention_start = now - timedelta(days=DIAGNOSTIC_LOG_RETENTION_DAYS)
+    oldest_day = retention_start.date()
+    # since старше срока хранения ничего не ограничивает; без этой проверки
+    # время до 1970 года дало бы отрицательный (недопустимый) ID потока
+    if since is not None and since <= retention_start:
+        since = None
+    if since is not None:
+        oldest_day = since.date()
+
+    day = _stream_id_to_datetime(before).date() if before else now.date()
+    upper = f"({before}" if before else '+'
+    lower = f"{int(since.timestamp() * 1000)}-0" if since is not None else '-'
+    return day, oldest_day, upper, lower
+
+
+def diagnostic_log_key_for_day(day):
+    """Возвращает ключ суточного потока журнала для даты (UTC)."""
+    return f"{DIAGNOSTIC_LOG_PREFIX}{day:%Y-%m-%d}"
+
+
+def diagnostic_log_steps(limit=DIAGNOSTIC_LOG_DEFAULT_LIMIT, before=None, since=None):
+    """
+    Шаги чтения самых свежих записей журнала, от новых к старым.
+
+    Args:
+        limit: Максимальное число записей на страницу.
+        before: Курсор - идентификатор записи потока; возвращаются записи строго старше него.
+        since: datetime - нижняя граница окна (включительно).
+
+    Returns:
+        (records, next_cursor) - next_cursor равен None, если записей больше нет.
+    """
+    day, oldest_day, upper, lower = diagnostic_log_window(before, since)
+
+    records = []
+    last_id = None
+    while day >= oldest_day and len(records) < limit:
+        key = diagnostic_log_key_for_day(day)
+        entries = yield command('xrevrange', key, max=upper, min=lower, count=limit - len(records))
+        for entry_id, fields in entries:
+            records.append({**fields, 'id': entry_id})
+            last_id = entry_id
+        day -= timedelta(days=1)
+        upper = '+'
+
+    # Страница заполнена целиком - возможно, есть записи старше.
+    next_cursor = last_id if len(records) >= limit else None
+    return records, next_cursor
+
+
+def read_diagnostic_logs(redis_client, limit=DIAGNOSTIC_LOG_DEFAULT_LIMIT, before=None, since=None):
+    """Читает страницу журнала (см. diagnostic_log_steps)."""
+    return run_steps(diagnostic_log_steps(limit, before, since), redis_client)
+
+
+# --- Запись событий одним скриптом ---
+# Все записи пакета событий (счётчики, события треков, аудитория, временные
+# ряды, журнал) выполняет один Lua-скрипт: один EVALSHA вместо десятков
+# команд, и запись атомарна. Разбор User-Agent и времени остаётся в Python -
+# скрипт получает готовые значения и ключи. Скрипт повторяет queue_event
+# (его по-прежнему использует буфер записи), и менять их нужно вместе.
+#
+# KEYS: listen_counts, track_events, browsers, os, devices, countries,
+#       версия статистики, поток журнала, общий рейтинг, затем ключи
+#       интервалов временных рядов, счётчиков уникальных слушателей и рейтингов.
+# ARGV: browser, os, device, country, ip, userAgent, слушатель ('' - не учитывать),
+#       тип события прослушивания, разделитель поля TRACK_EVENTS_KEY, MAXLEN
+#       журнала, TTL журнала, TTL суточного счётчика слушателей, TTL суточного
+#       рейтинга, число гранулярностей G, G значений TTL (0 - бессрочно), затем
+#       на каждое событие: trackId, eventType, timestamp, номера ключей
+#       слушателей трека и суток в KEYS (0 - нет), участник рейтингов
+#       ('' - нет), номера ключей рейтингов исполнителя и суток и G номеров
+#       ключей интервалов в KEYS.
+EVENT_SCRIPT = """
+local browser, os_name, device, country, ip, user_agent = ARGV[1], ARGV[2], ARGV[3], ARGV[4], ARGV[5], ARGV[6]
+local listener = ARGV[7]
+local play_type, separator = ARGV[8], ARGV[9]
+local log_maxlen, log_ttl, listeners_day_ttl, leaderboard_day_ttl = ARGV[10], ARGV[11], ARGV[12], ARGV[13]
+local granularities = tonumber(ARGV[14])
+local ttls = {}
+for i = 1, granularities do
+    ttls[i] = tonumber(ARGV[14 + i])
+end
+
+local pos = 15 + granularities
+local count = 0
+while pos <= #ARGV do
+    local track_id, event_type, timestamp = ARGV[pos], ARGV[pos + 1], ARGV[pos + 2]
+    local is_play = event_type == play_type
+    if is_play then
+        redis.call('HINCRBY', KEYS[1], track_id, 1)
+    end
+    redis.call('HINCRBY', KEYS[2], track_id .. separator .. event_type, 1)
+
+    local track_listeners, day_listeners = tonumber(ARGV[pos + 3]), tonumber(ARGV[pos + 4])
+    if track_listeners > 0 then
+        redis.call('PFADD', KEYS[track_listeners], listener)
+        redis.call('PFADD', KEYS[day_listeners], listener)
+        redis.call('EXPIRE', KEYS[day_listeners], listeners_day_ttl)
+    end
+
+    local member = ARGV[pos + 5]
+    if member ~= '' then
+        local artist_board, day_board = KEYS[tonumber(ARGV[pos + 6])], KEYS[tonumber(ARGV[pos + 7])]
+        redis.call('ZINCRBY', KEYS[9], 1, member)
+        redis.call('ZINCRBY', artist_board, 1, member)
+        redis.call('ZINCRBY', day_board, 1, member)
+        redis.call('EXPIRE', day_board, leaderboard_day_ttl)
+    end
+
+    for i = 1, granularities do
+        local key = KEYS[tonumber(ARGV[pos + 7 + i])]
+        redis.call('HINCRBY', key, 'event:' .. event_type, 1)
+        redis.call('HINCRBY', key, 'browser:' .. browser, 1)
+        redis.call('HINCRBY', key, 'os:' .. os_name, 1)
+        redis.call('HINCRBY', key, 'device:' .. device, 1)
+        redis.call('HINCRBY', key, 'country:' .. country, 1)
+        if is_play then
+            redis.call('HINCRBY', key, 'plays:' .. track_id, 1)
+        end
+        if ttls[i] > 0 then
+            redis.call('EXPIRE', key, ttls[i])
+        end
+    end
+
+    redis.call('XADD', KEYS[8], 'MAXLEN', '~', log_maxlen, '*',
+        'ip', ip, 'country', country, 'userAgent', user_agent,
+        'trackId', track_id, 'eventType', event_type, 'timestamp', timestamp)
+
+    count = count + 1
+    pos = pos + 8 + granularities
+end
+
+-- Аудитория одинакова для всего пакета - один инкремент на измерение
+redis.call('HINCRBY', KEYS[3], browser, count)
+redis.call('HINCRBY', KEYS[4], os_name, count)
+redis.call('HINCRBY', KEYS[5], device, count)
+redis.call('HINCRBY', KEYS[6], country, count)
+
+redis.call('EXPIRE', KEYS[8], log_ttl)
+redis.call('INCR', KEYS[7])
+return count
+"""
+
+
+def event_script_call(events, client):
+    """
+    Аргументы EVENT_SCRIPT для пакета событий.
+
+    Returns:
+        (keys, args)
+    """
+    log_ttl = timedelta(days=DIAGNOSTIC_LOG_RETENTION_DAYS + 1)
+    keys = [
+        'v2:listen_counts', TRACK_EVENTS_KEY,
+        'v2:stats:browsers', 'v2:stats:os', 'v2:stats:devices', 'v2:stats:countries',
+        STATS_VERSION_KEY, diagnostic_log_key(datetime.now(timezone.utc)),
+        LEADERBOARD_GLOBAL_KEY,
+    ]
+    listener = client.get('listener') or ''
+    args = [
+        client['browser'], client['os'], client['device'], client['country'],
+        client['ip'], client['userAgent'], listener,
+        PLAY_EVENT_TYPE, TRACK_EVENT_SEPARATOR,
+        DIAGNOSTIC_LOG_MAXLEN, int(log_ttl.total_seconds()), int(UNIQUE_LISTENERS_DAY_TTL.total_seconds()),
+        int(LEADERBOARD_DAY_TTL.total_seconds()),
+        len(TIMESERIES_GRANULARITIES),
+    ]
+    args += [int(config['ttl'].total_seconds()) if config['ttl'] is not None else 0
+             for config in TIMESERIES_GRANULARITIES.values()]
+
+    # Ключи интервалов у событий пакета обычно совпадают - передаются один раз
+    key_numbers = {}
+
+    def key_number(key):
+        if key not in key_numbers:
+            keys.append(key)
+            key_numbers[key] = len(keys)
+        return key_numbers[key]
+
+    for event in events:
+        args += [event['trackId'], event['eventType'], event['moment'].isoformat()]
+        if listener and event['eventType'] == PLAY_EVENT_TYPE:
+            args += [key_number(unique_listeners_track_key(event['trackId'])),
+                     key_number(unique_listeners_day_key(event['moment']))]
+        else:
+            args += [0, 0]
+        member = leaderboard_member(event['trackId']) if event['eventType'] == PLAY_EVENT_TYPE else None
+        if member:
+            artist = split_leaderboard_member(member)[0]
+            args += [member, key_number(leaderboard_artist_key(artist)),
+                     key_number(leaderboard_day_key(event['moment']))]
+        else:
+            args += ['', 0, 0]
+        for granularity in TIMESERIES_GRANULARITIES:
+            args.append(key_number(timeseries_key(granularity, event['moment'])))
+    return keys, args
+
+
+# Объект скрипта создаётся один раз на процесс для каждого типа клиента
+# (redis-py и redis.asyncio дают разные объекты скрипта): SHA считается
+# однажды, вызов идёт через EVALSHA, а SCRIPT LOAD выполняется, только если
+# Redis ещё не знает скрипт (например, после перезапуска).
+_event_scripts = {}
+
+
+def _call_event_script(keys, args):
+    def step(redis_client):
+        script = _event_scripts.get(type(redis_client))
+        if script is None:
+            script = _event_scripts[type(redis_client)] = redis_client.register_script(EVENT_SCRIPT)
+        return script(keys=keys, args=args, client=redis_client)
+    return step
+
+
+def record_events_steps(events, client):
+    """Шаги записи пакета событий одним вызовом EVENT_SCRIPT."""
+    keys, args = event_script_call(events, client)
+    return (yield _call_event_script(keys, args))
+
+
+def record_events(redis_client, events, client):
+    """Записывает пакет событий одним вызовом EVENT_SCRIPT."""
+    return run_steps(record_events_steps(events, client), redis_client)
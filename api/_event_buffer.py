@@ -0,0 +1,116 @@
+# api/_event_buffer.py - Буфер записи событий аналитики (write-behind)
+import os
+from collections import defaultdict
+from api._analytics import queue_events, DIAGNOSTIC_LOG_MAXLEN
+
+# Буфер нужен долгоживущему процессу (analytics_server.py): события копятся
+# в памяти и сбрасываются в Redis одним конвейером по порогу числа событий
+# или по времени. Одинаковые инкременты (трек, тип события, браузер, ОС,
+# страна, интервал временного ряда) складываются, так что горячий трек
+# даёт один HINCRBY за сброс вместо одного на каждое прослушивание.
+# В serverless-функциях буфер не используется: после ответа процесс может
+# быть заморожен, и сброс не гарантирован.
+WRITE_BUFFER_ENABLED = os.environ.get("ANALYTICS_WRITE_BUFFER", "").lower() in ("1", "true", "yes")
+FLUSH_INTERVAL = float(os.environ.get("ANALYTICS_FLUSH_INTERVAL", 1.0))
+FLUSH_MAX_EVENTS = int(os.environ.get("ANALYTICS_FLUSH_MAX_EVENTS", 1000))
+
+
+class EventBuffer:
+    """
+    Накопитель записей с интерфейсом конвейера Redis.
+
+    queue_events() пишет в буфер так же, как в pipeline: hincrby, incr,
+    zincrby, pfadd, expire и xadd. Счётчики с одинаковыми ключами складываются,
+    слушатели HyperLogLog собираются во множества, TTL запоминается
+    последний для ключа, записи журнала хранятся по порядку
+    (не больше DIAGNOSTIC_LOG_MAXLEN - поток всё равно обрезается до этой длины).
+    """
+
+    def __init__(self):
+        self.counters = defaultdict(int)
+        self.unique = defaultdict(set)
+        self.expires = {}
+        self.log_entries = []
+        self.events = 0
+
+    def __len__(self):
+        return self.events
+
+    # --- Интерфейс конвейера ---
+
+    def hincrby(self, name, key, amount=1):
+        self.counters[('hincrby', name, key)] += amount
+        return self
+
+    def incr(self, name, amount=1):
+        self.counters[('incrby', name, None)] += amount
+        return self
+
+    def zincrby(self, name, amount, value):
+        self.counters[('zincrby', name, value)] += amount
+        return self
+
+    def pfadd(self, name, *values):
+        self.unique[name].update(values)
+        return self
+
+    def expire(self, name, time):
+        self.expires[name] = time
+        return self
+
+    def xadd(self, name, fields, **kwargs):
+        self.log_entries.append((name, fields, kwargs))
+        if len(self.log_entries) > DIAGNOSTIC_LOG_MAXLEN:
+            del self.log_entries[:len(self.log_entries) - DIAGNOSTIC_LOG_MAXLEN]
+        return self
+
+    # --- Буфер ---
+
+    def queue(self, events, client):
+        """Добавляет события пакета (см. queue_events)."""
+        queue_events(self, events, client)
+        self.events += len(events)
+
+    def take(self):
+        """Забирает накопленное в новый буфер и очищает этот."""
+        taken = EventBuffer()
+        taken.counters, self.counters = self.counters, defaultdict(int)
+        taken.unique, self.unique = self.unique, defaultdict(set)
+        taken.expires, self.expires = self.expires, {}
+        taken.log_entries, self.log_entries = self.log_entries, []
+        taken.events, self.events = self.events, 0
+        return taken
+
+    def merge(self, other):
+        """Возвращает в буфер записи, которые не удалось сбросить."""
+        for key, amount in other.counters.items():
+            self.counters[key] += amount
+        for name, values in other.unique.items():
+            self.unique[name].update(values)
+        for name, time in other.expires.items():
+            self.expires.setdefault(name, time)
+        self.log_entries[:0] = other.log_entries
+        if len(self.log_entries) > DIAGNOSTIC_LOG_MAXLEN:
+            del self.log_entries[:len(self.log_entries) - DIAGNOSTIC_LOG_MAXLEN]
+        self.events += other.events
+
+    def apply(self, pipe):
+        """
+        Переносит накопленные записи в настоящий конвейер.
+
+        TTL ставится последним: EXPIRE на ещё не созданный ключ ничего не делает.
+        """
+        for (command, name, key), amount in self.counters.items():
+            if command == 'hincrby':
+                pipe.hincrby(name, key, amount)
+            elif command == 'zincrby':
+                pipe.zincrby(name, amount, key)
+            else:
+                pipe.incrby(name, amount)
+        for name, values in self.unique.items():
+            pipe.pfadd(name, *values)
+        for name, fields, kwargs in self.log_entries:
+            pipe.xadd(name, fields, **kwargs)
+        for name, time in self.expires.items():
+            pipe.expire(name, time)
+        return pipe
@@ -0,0 +1,148 @@
+# api/_redis_pool.py - Общий пул соединений Redis для функций аналитики
+import os
+import logging
+import threading
+from redis import Redis, ConnectionPool, RedisError
+from redis import asyncio as redis_asyncio
+from redis.asyncio.retry import Retry as AsyncRetry
+from redis.backoff import ExponentialBackoff
+from redis.retry import Retry
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+
+# Интервал (в секундах), после которого соединение из пула проверяется PING
+# перед использованием. Тёплые serverless-инстансы могут простаивать минутами,
+# и без проверки первый запрос после паузы получит оборванный сокет.
+HEALTH_CHECK_INTERVAL = int(os.environ.get("REDIS_HEALTH_CHECK_INTERVAL", 30))
+MAX_CONNECTIONS = int(os.environ.get("REDIS_MAX_CONNECTIONS", 10))
+SOCKET_TIMEOUT = float(os.environ.get("REDIS_SOCKET_TIMEOUT", 5))
+ASYNC_MAX_CONNECTIONS = int(os.environ.get("REDIS_ASYNC_MAX_CONNECTIONS", 50))
+
+# Пулы живут на уровне модуля и переживают тёплые вызовы функции.
+# Ключ - (url, decode_responses): listen.py пишет «сырыми» байтами,
+# stats.py читает строки, и смешивать эти режимы в одном пуле нельзя.
+_pools = {}
+_pools_lock = threading.Lock()
+
+# Асинхронные пулы (analytics_server.py) привязаны к циклу событий процесса;
+# весь доступ к ним идёт из этого цикла, поэтому блокировка не нужна.
+_async_pools = {}
+
+
+def _get_redis_url():
+    """Возвращает REDIS_URL, выбрасывая исключение, если он не задан."""
+    redis_url = os.environ.get("REDIS_URL")
+    if not redis_url:
+        logging.error("REDIS_URL is not set in environment variables.")
+        raise ConnectionError("Database configuration is missing.")
+    return redis_url
+
+
+def _pool_options(decode_responses, max_connections):
+    """Общие параметры синхронного и асинхронного пулов."""
+    return {
+        'decode_responses': decode_responses,
+        'max_connections': max_connections,
+        'health_check_interval': HEALTH_CHECK_INTERVAL,
+        'socket_timeout': SOCKET_TIMEOUT,
+        'socket_connect_timeout': SOCKET_TIMEOUT,
+        'socket_keepalive': True,
+        'retry_on_error': [RedisConnectionError, RedisTimeoutError],
+    }
+
+
+def _create_pool(redis_url, decode_responses):
+    """Создаёт пул с проверками здоровья и повторами при обрыве соединения."""
+    return ConnectionPool.from_url(
+        redis_url,
+        retry=Retry(ExponentialBackoff(cap=1, base=0.05), 3),
+        **_pool_options(decode_responses, MAX_CONNECTIONS),
+    )
+
+
+def get_redis_client(decode_responses=False):
+    """
+    Возвращает клиента Redis поверх общего, лениво создаваемого пула.
+
+    Сам клиент дёшев - дорогое TCP/TLS-рукопожатие выполняется один раз
+    на соединение пула и переиспользуется между запросами.
+    """
+    redis_url = _get_redis_url()
+    key = (redis_url, decode_responses)
+
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                try:
+                    pool = _create_pool(redis_url, decode_responses)
+                except (RedisError, ValueError) as e:
+                    logging.error(f"Failed to create Redis connection pool: {e}")
+                    raise ConnectionError("Could not connect to the database.") from e
+                _pools[key] = pool
+
+    return Redis(connection_pool=pool)
+
+
+def reset_redis_pool():
+    """
+    Закрывает все соединения пулов, чтобы следующий запрос переподключился.
+
+    Вызывается после ошибки соединения, которую не смогли исправить встроенные
+    повторы, например, если Redis был перезапущен или сменил адрес.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+
+    for pool in pools:
+        try:
+            pool.disconnect()
+        except RedisError as e:
+            logging.warning(f"Failed to close Redis connection pool cleanly: {e}")
+
+
+def get_async_redis_client(decode_responses=False):
+    """
+    Асинхронный клиент Redis (redis.asyncio) поверх общего пула процесса.
+
+    Один долгоживущий процесс обслуживает множество одновременных запросов,
+    поэтому размер пула задаётся отдельно - REDIS_ASYNC_MAX_CONNECTIONS.
+    Запрос, которому не хватило соединения, ждёт освобождения (до SOCKET_TIMEOUT).
+    """
+    redis_url = _get_redis_url()
+    key = (redis_url, decode_responses)
+
+    pool = _async_pools.get(key)
+    if pool is None:
+        try:
+            pool = redis_asyncio.BlockingConnectionPool.from_url(
+                redis_url,
+                timeout=SOCKET_TIMEOUT,
+                retry=AsyncRetry(ExponentialBackoff(cap=1, base=0.05), 3),
+                **_pool_options(decode_responses, ASYNC_MAX_CONNECTIONS),
+            )
+        except (RedisError, ValueError) as e:
+            logging.error(f"Failed to create async Redis connection pool: {e}")
+            raise ConnectionError("Could not connect to the database.") from e
+        _async_pools[key] = pool
+
+    return redis_asyncio.Redis(connection_pool=pool)
+
+
+async def reset_async_redis_pool():
+    """
+    Закрывает асинхронные пулы при остановке сервера.
+
+    В отличие от reset_redis_pool, после ошибки соединения не вызывается:
+    пулом одновременно пользуются другие запросы, а оборванные соединения
+    пул отбрасывает сам.
+    """
+    pools = list(_async_pools.values())
+    _async_pools.clear()
+
+    for pool in pools:
+        try:
+            await pool.disconnect()
+        except RedisError as e:
+            logging.warning(f"Failed to close async Redis connection pool cleanly: {e}")
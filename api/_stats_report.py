@@ -0,0 +1,374 @@
+# api/_stats_report.py - Разбор запросов /api/stats и сборка ответа
+# Общие для синхронного обработчика (api/stats.py) и асинхронного сервера
+# (analytics_server.py): чтения из Redis ставятся в конвейер, результаты
+# разбираются отдельно, а сборка ответа целиком записана шагами
+# (см. run_steps в api/_analytics.py), так что обработчику остаётся только
+# выполнить их.
+import json
+import time
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from api._analytics import (
+    split_track_event_field, TRACK_EVENTS_KEY, TIMESERIES_DIMENSIONS, TIMESERIES_GRANULARITIES,
+    DIAGNOSTIC_LOG_DEFAULT_LIMIT, DIAGNOSTIC_LOG_MAX_LIMIT, STATS_SNAPSHOT_MIN_AGE,
+    unique_listeners_track_key, unique_listeners_day_key, UNIQUE_LISTENERS_STATS_DAYS,
+    track_identity, validate_log_cursor, LEADERBOARD_DEFAULT_LIMIT, LEADERBOARD_MAX_LIMIT,
+    new_pipeline, execute, command, diagnostic_log_steps,
+    STATS_VERSION_KEY, STATS_SNAPSHOT_KEY, STATS_SNAPSHOT_LOCK_KEY, STATS_SNAPSHOT_LOCK_TTL
+)
+
+def is_authorized(auth_header, expected_token):
+    """Проверяет заголовок Authorization: Bearer <STATS_API_SECRET>."""
+    return auth_header.startswith('Bearer ') and auth_header.split(' ')[1] == expected_token
+
+
+def parse_log_query(query):
+    """
+    Извлекает параметры страницы журнала из строки запроса:
+    logs_limit, logs_before (курсор) и logs_since (ISO-время).
+    """
+    try:
+        limit = int(query.get('logs_limit', [DIAGNOSTIC_LOG_DEFAULT_LIMIT])[0])
+    except ValueError:
+        raise ValueError("logs_limit must be an integer.")
+    limit = max(1, min(limit, DIAGNOSTIC_LOG_MAX_LIMIT))
+
+    before = query.get('logs_before', [None])[0]
+    if before is not None:
+        validate_log_cursor(before)
+
+    since = query.get('logs_since', [None])[0]
+    if since is not None:
+        since = parse_datetime(since, 'logs_since')
+
+    return {'limit': limit, 'before': before, 'since': since}
+
+
+def parse_datetime(value, name):
+    """Разбирает ISO-дату/время из строки запроса (UTC по умолчанию)."""
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO 8601 timestamp.")
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment
+
+
+# Допустимые границы временного ряда: вне них арифметика дат (интервал
+# по умолчанию, шаг по месяцам) вышла бы за пределы datetime
+SERIES_EARLIEST = datetime(1970, 1, 1, tzinfo=timezone.utc)
+SERIES_LATEST = datetime(9000, 1, 1, tzinfo=timezone.utc)
+
+
+def parse_series_bound(value, name):
+    """Разбирает from/to временного ряда и проверяет, что они в допустимых границах."""
+    moment = parse_datetime(value, name)
+    if not SERIES_EARLIEST <= moment <= SERIES_LATEST:
+        raise ValueError(f"{name} must be between {SERIES_EARLIEST.date()} and {SERIES_LATEST.date()}.")
+    return moment
+
+
+def parse_series_query(query):
+    """
+    Извлекает параметры временного ряда: series (измерение), granularity,
+    from, to и необязательный member (например, trackId для series=plays).
+    """
+    dimension = query['series'][0]
+    if dimension not in TIMESERIES_DIMENSIONS:
+        raise ValueError(f"series must be one of: {', '.join(TIMESERIES_DIMENSIONS)}.")
+
+    granularity = query.get('granularity', ['day'])[0]
+    if granularity not in TIMESERIES_GRANULARITIES:
+        raise ValueError(f"granularity must be one of: {', '.join(TIMESERIES_GRANULARITIES)}.")
+
+    default_span = {'hour': timedelta(hours=23), 'day': timedelta(days=6), 'month': timedelta(days=365)}[granularity]
+    end = datetime.now(timezone.utc)
+    if 'to' in query:
+        end = parse_series_bound(query['to'][0], 'to')
+    start = end - default_span
+    if 'from' in query:
+        start = parse_series_bound(query['from'][0], 'from')
+    if start > end:
+        raise ValueError("from must not be later than to.")
+
+    return {
+        'granularity': granularity,
+        'start': start,
+        'end': end,
+        'dimension': dimension,
+        'member': query.get('member', [None])[0],
+    }
+
+
+def series_response_body(series_query, series):
+    """Тело ответа в режиме временного ряда."""
+    return json.dumps({
+        'series': series_query['dimension'],
+        'member': series_query['member'],
+        'granularity': series_query['granularity'],
+        'from': series_query['start'].isoformat(),
+        'to': series_query['end'].isoformat(),
+        'buckets': series,
+    }, ensure_ascii=False).encode('utf-8')
+
+
+def parse_top_query(query):
+    """
+    Извлекает параметры рейтинга: top (число треков), необязательный artist
+    (папка исполнителя) или date (YYYY-MM-DD, суточный рейтинг).
+    """
+    try:
+        limit = int(query['top'][0] or LEADERBOARD_DEFAULT_LIMIT)
+    except ValueError:
+        raise ValueError("top must be an integer.")
+    limit = max(1, min(limit, LEADERBOARD_MAX_LIMIT))
+
+    artist = query.get('artist', [None])[0]
+    day = query.get('date', [None])[0]
+    if artist is not None and day is not None:
+        raise ValueError("artist and date cannot be combined.")
+    if day is not None:
+        day = parse_datetime(day, 'date')
+
+    return {'limit': limit, 'artist': artist, 'day': day}
+
+
+def top_response_body(top_query, ranking):
+    """Тело ответа в режиме рейтинга."""
+    return json.dumps({
+        'top': top_query['limit'],
+        'artist': top_query['artist'],
+        'date': top_query['day'].date().isoformat() if top_query['day'] else None,
+        'tracks': ranking,
+    }, ensure_ascii=False).encode('utf-8')
+
+
+def queue_overview_reads(pipe):
+    """Добавляет в конвейер чтение счётчиков для обзора статистики."""
+    pipe.hgetall('v2:listen_counts')
+    pipe.hgetall('v2:stats:browsers')
+    pipe.hgetall('v2:stats:os')
+    pipe.hgetall('v2:stats:devices')
+    pipe.hgetall('v2:stats:countries')
+    pipe.hgetall(TRACK_EVENTS_KEY)
+
+
+def parse_overview(results):
+    """Разбирает результаты queue_overview_reads."""
+    data = {
+        'listen_counts': {k: int(v) for k, v in results[0].items()},
+        'browsers': {k: int(v) for k, v in results[1].items()},
+        'os': {k: int(v) for k, v in results[2].items()},
+        'devices': {k: int(v) for k, v in results[3].items()},
+        'countries': {k: int(v) for k, v in results[4].items()},
+    }
+
+    event_data = defaultdict(dict)
+    for field, count in results[5].items():
+        track_id, event_type = split_track_event_field(field)
+        event_data[track_id][event_type] = int(count)
+    data['events'] = event_data
+
+    return data
+
+
+def process_track_stats(listen_counts, all_events, unique_listeners=None):
+    """
+    Агрегирует статистику по трекам в структурированный формат.
+
+    unique_listeners - оценки из parse_unique_listeners: {идентичность трека: число}.
+    """
+    unique_listeners = unique_listeners or {}
+    grouped_stats = defaultdict(lambda: {'total_plays': 0, 'albums': defaultdict(lambda: {'total_plays': 0, 'tracks': []})})
+
+    for full_url, plays in listen_counts.items():
+        try:
+            identity = track_identity(full_url)
+            if identity is None:
+                logging.warning(f"Skipping malformed track URL: '{full_url}'")
+                continue
+            artist_name, album_name, track_name = identity
+
+            event_details = all_events.get(full_url, {})
+
+            artist_stats = grouped_stats[artist_name]
+            album_stats = artist_stats['albums'][album_name]
+
+            artist_stats['total_plays'] += plays
+            album_stats['total_plays'] += plays
+            track_stats = next((track for track in album_stats['tracks'] if track['title'] == track_name), None)
+            if track_stats is None:
+                album_stats['tracks'].append({
+                    'title': track_name,
+                    'plays': plays,
+                    'unique_listeners': unique_listeners.get(identity, 0),
+                    'events': dict(event_details)
+                })
+            else:
+                track_stats['plays'] += plays
+                for event_type, count in event_details.items():
+                    track_stats['events'][event_type] = track_stats['events'].get(event_type, 0) + count
+        except Exception as e:
+            logging.error(f"Failed to process track stat for URL '{full_url}': {e}")
+            continue
+
+    return grouped_stats
+
+
+def queue_unique_listener_reads(pipe, track_ids, days=UNIQUE_LISTENERS_STATS_DAYS):
+    """
+    Добавляет в конвейер оценки уникальных слушателей: по каждому треку,
+    по каждым суткам за последние days дней и за весь этот период.
+
+    PFCOUNT по нескольким ключам считает объединение, поэтому слушатель
+    разных версий одного трека (см. RELEASE_VERSION_PATTERN) учитывается
+    один раз.
+
+    Returns:
+        План чтения для parse_unique_listeners.
+    """
+    track_keys = defaultdict(list)
+    for track_id in track_ids:
+        try:
+            identity = track_identity(track_id)
+        except ValueError:
+            continue
+        if identity is not None:
+            track_keys[identity].append(unique_listeners_track_key(track_id))
+
+    now = datetime.now(timezone.utc)
+    day_moments = [now - timedelta(days=offset) for offset in range(days - 1, -1, -1)]
+    day_keys = [unique_listeners_day_key(moment) for moment in day_moments]
+
+    for keys in track_keys.values():
+        pipe.pfcount(*keys)
+    for key in day_keys:
+        pipe.pfcount(key)
+    pipe.pfcount(*day_keys)
+    return list(track_keys), day_moments
+
+
+def parse_unique_listeners(plan, results):
+    """
+    Разбирает результаты queue_unique_listener_reads.
+
+    Returns:
+        {'tracks': {идентичность трека: число}, 'days': [{'date', 'listeners'}], 'period': число}
+    """
+    identities, day_moments = plan
+    track_counts = results[:len(identities)]
+    day_counts = results[len(identities):len(identities) + len(day_moments)]
+    return {
+        'tracks': dict(zip(identities, track_counts)),
+        'days': [{'date': moment.date().isoformat(), 'listeners': count} for moment, count in zip(day_moments, day_counts)],
+        'period': results[-1],
+    }
+
+
+def overview_response_body(data, unique_listeners, diagnostic_logs, logs_cursor):
+    """
+    Собирает тело ответа обзора из parse_overview, parse_unique_listeners
+    и страницы журнала.
+    """
+    final_response = {
+        'track_stats': process_track_stats(data['listen_counts'], data['events'], unique_listeners['tracks']),
+        'audience_stats': {
+            'browsers': data['browsers'],
+            'os': data['os'],
+            'devices': data['devices'],
+            'countries': data['countries'],
+        },
+        'unique_listeners': {
+            'days': unique_listeners['days'],
+            'period_days': len(unique_listeners['days']),
+            'period': unique_listeners['period'],
+        },
+        'diagnostic_logs': diagnostic_logs,
+        'diagnostic_logs_cursor': logs_cursor,
+        # --- ОТЛАДОЧНАЯ СЕКЦИЯ ---
+        '_debug_info': {
+            'raw_listen_count_keys': list(data['listen_counts'].keys()),
+            'raw_diagnostic_logs': diagnostic_logs[:5] # Первые 5 логов для анализа
+        }
+    }
+
+    return json.dumps(final_response, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def snapshot_is_stale(current_version, snapshot_version, built_at):
+    """
+    Нужно ли пересобрать снимок: его нет, либо версия данных изменилась
+    и с прошлой сборки прошло не меньше STATS_SNAPSHOT_MIN_AGE секунд.
+    """
+    is_fresh = snapshot_version == current_version
+    is_recent = built_at is not None and time.time() - float(built_at) < STATS_SNAPSHOT_MIN_AGE
+    return snapshot_version is None or not (is_fresh or is_recent)
+
+
+def cache_headers(version):
+    """Заголовки условного кэширования для снимка заданной версии."""
+    return {'ETag': f'"stats-v{version}"', 'Cache-Control': 'private, no-cache'}
+
+
+def overview_steps(log_query):
+    """Шаги сборки полного ответа статистики; возвращают тело ответа."""
+    pipe = yield new_pipeline
+    queue_overview_reads(pipe)
+    data = parse_overview((yield execute(pipe)))
+
+    # Уникальные слушатели - вторым конвейером: нужен список треков из первого
+    pipe = yield new_pipeline
+    plan = queue_unique_listener_reads(pipe, data['listen_counts'])
+    unique_listeners = parse_unique_listeners(plan, (yield execute(pipe)))
+
+    # Журнал читается постранично: только последние N записей
+    diagnostic_logs, logs_cursor = yield from diagnostic_log_steps(**log_query)
+    return overview_response_body(data, unique_listeners, diagnostic_logs, logs_cursor)
+
+
+def snapshot_steps(log_query, if_none_match=None):
+    """
+    Шаги ответа готовым снимком статистики с пересборкой при необходимости.
+
+    Если версия снимка совпадает с If-None-Match, ответ - 304 без тела.
+
+    Returns:
+        (status, body, headers)
+    """
+    pipe = yield new_pipeline
+    pipe.get(STATS_VERSION_KEY)
+    pipe.hmget(STATS_SNAPSHOT_KEY, 'version', 'built_at')
+    current_version, (snapshot_version, built_at) = yield execute(pipe)
+    current_version = current_version or '0'
+
+    # Пересборку выполняет только один запрос - остальные отдают прежний снимок
+    if snapshot_is_stale(current_version, snapshot_version, built_at):
+        locked = yield command('set', STATS_SNAPSHOT_LOCK_KEY, 1, nx=True, ex=STATS_SNAPSHOT_LOCK_TTL)
+        if locked or snapshot_version is None:
+            # Блокировка снимается и при ошибке. Не через finally: закрытие
+            # брошенного генератора (GeneratorExit) не может выполнять шаги,
+            # а блокировка всё равно истечёт через STATS_SNAPSHOT_LOCK_TTL.
+            try:
+                body = yield from overview_steps(log_query)
+                yield command('hset', STATS_SNAPSHOT_KEY, mapping={
+                    'version': current_version,
+                    'built_at': time.time(),
+                    'body': body,
+                })
+            except Exception:
+                if locked:
+                    yield command('delete', STATS_SNAPSHOT_LOCK_KEY)
+                raise
+            if locked:
+                yield command('delete', STATS_SNAPSHOT_LOCK_KEY)
+            logging.info(f"Rebuilt stats snapshot at version {current_version}.")
+            return 200, body, cache_headers(current_version)
+
+    etag_headers = cache_headers(snapshot_version)
+    if if_none_match == etag_headers['ETag']:
+        return 304, None, etag_headers
+
+    body = yield command('hget', STATS_SNAPSHOT_KEY, 'body')
+    return 200, body.encode('utf-8'), etag_headers
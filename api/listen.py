@@ -3,9 +3,13 @@ import os
 import json
 import logging
 from http.server import BaseHTTPRequestHandler
-from redis import from_url, RedisError
-from user_agents import parse
+from redis.exceptions import ConnectionError as RedisConnectionError
 from datetime import datetime, timezone
+from api._redis_pool import get_redis_client, reset_redis_pool
+from api._analytics import (
+    unpack_event_payload, validate_events, record_events, describe_client,
+    user_agent_cache_info, MAX_BATCH_SIZE
+)
 
 # --- Конфигурация логирования ---
 logging.basicConfig(
@@ -20,18 +24,10 @@ class handler(BaseHTTPRequestHandler):
     """
 
     def _get_redis_client(self):
-        """Подключается к Redis, выбрасывая исключение, если URL не найден."""
-        redis_url = os.environ.get("REDIS_URL")
-        if not redis_url:
-            logging.error("REDIS_URL is not set in environment variables.")
-            raise ConnectionError("Database configuration is missing.")
-        try:
-            # Важно: Не используем decode_responses=True для записи,
-            # чтобы избежать конфликтов типов с hincrby.
-            return from_url(redis_url)
-        except RedisError as e:
-            logging.error(f"Failed to connect to Redis: {e}")
-            raise ConnectionError("Could not connect to the database.") from e
+        """Возвращает клиента Redis из общего пула соединений модуля."""
+        # Важно: Не используем decode_responses=True для записи,
+        # чтобы избежать конфликтов типов с hincrby.
+        return get_redis_client()
 
     def _send_response(self, status_code, content_type='application/json', body=None):
         """Отправляет HTTP-ответ клиенту."""
@@ -46,6 +42,14 @@ class handler(BaseHTTPRequestHandler):
         error_payload = json.dumps({'error': message})
         self._send_response(status_code, body=error_payload)
 
+    def _get_client_info(self):
+        """Собирает сведения о слушателе из заголовков запроса."""
+        return describe_client(
+            self.headers.get('User-Agent', 'Unknown'),
+            self.headers.get('X-Forwarded-For', 'Not Found'),
+            self.headers.get('X-Vercel-IP-Country', 'XX'),
+        )
+
     def do_POST(self):
         try:
             # --- 1. Сбор и валидация данных ---
@@ -56,59 +60,51 @@ class handler(BaseHTTPRequestHandler):
             post_data = self.rfile.read(content_length)
             data = json.loads(post_data.decode('utf-8'))
 
-            track_id = data.get('trackId')
-            if not track_id:
-                return self._send_error(400, "trackId is required.")
+            try:
+                items, is_batch = unpack_event_payload(data)
+            except ValueError as e:
+                return self._send_error(400, str(e))
+            if not items:
+                return self._send_error(400, "Request contains no events.")
+            if len(items) > MAX_BATCH_SIZE:
+                return self._send_error(413, f"Too many events in one request (max {MAX_BATCH_SIZE}).")
 
-            # Определяем переменную в стандартном для Python стиле snake_case
-            event_type = data.get('eventType', 'unknown')
+            events, results = validate_events(items, datetime.now(timezone.utc))
 
-            user_agent_string = self.headers.get('User-Agent', 'Unknown')
-            user_agent = parse(user_agent_string)
-            ip_address = self.headers.get('X-Forwarded-For', 'Not Found')
-            country_code = self.headers.get('X-Vercel-IP-Country', 'XX')
+            if not events:
+                if not is_batch:
+                    return self._send_error(400, results[0]['error'])
+                return self._send_response(400, body=json.dumps({'accepted': 0, 'rejected': len(results), 'results': results}))
+
+            client = self._get_client_info()
 
             # --- 2. Работа с Redis ---
+            # Все события пакета записываются одним скриптом - один сетевой обмен.
             redis_client = self._get_redis_client()
-            pipe = redis_client.pipeline()
+            record_events(redis_client, events, client)
 
-            # --- 3. Формирование команд для атомарной записи ---
-            # Последовательно используем переменную event_type
+            logging.info(f"Successfully processed {len(events)} of {len(items)} event(s).")
+            logging.debug(f"User-Agent cache: {user_agent_cache_info()}")
             
-            if event_type == '30s_listen':
-                pipe.hincrby('v2:listen_counts', track_id, 1)
+            # --- 3. Отправка успешного ответа ---
+            if not is_batch:
+                return self._send_response(204)
 
-            pipe.hincrby(f'v2:events:{track_id}', event_type, 1)
-
-            pipe.hincrby('v2:stats:browsers', user_agent.browser.family, 1)
-            pipe.hincrby('v2:stats:os', user_agent.os.family, 1)
-            pipe.hincrby('v2:stats:devices', 'Mobile' if user_agent.is_mobile else 'Desktop', 1)
-            pipe.hincrby('v2:stats:countries', country_code, 1)
-            
-            timestamp = datetime.now(timezone.utc).isoformat()
-            log_key = f"{timestamp}-{ip_address}"
-            
-            log_payload = json.dumps({
-                'ip': ip_address,
-                'country': country_code,
-                'userAgent': user_agent_string,
-                'trackId': track_id,
-                'eventType': event_type,
-                'timestamp': timestamp
-            })
-            pipe.hset('v2:diagnostic_logs', log_key, log_payload)
-            
-            # --- 4. Выполнение всех команд ---
-            pipe.execute()
-
-            logging.info(f"Successfully processed event '{event_type}' for track '{track_id}'.")
-            
-            # --- 5. Отправка успешного ответа ---
-            self._send_response(204)
+            self._send_response(200, body=json.dumps({
+                'accepted': len(events),
+                'rejected': len(items) - len(events),
+                'results': results
+            }))
 
         except json.JSONDecodeError:
             logging.warning("Failed to decode JSON from request body.")
             self._send_error(400, "Invalid JSON format.")
+        except RedisConnectionError as e:
+            # Встроенные повторы не помогли - сбрасываем пул, чтобы
+            # следующий вызов открыл свежие соединения.
+            logging.critical(f"Redis connection lost: {e}")
+            reset_redis_pool()
+            self._send_error(503, "Service Unavailable: Cannot connect to the database.")
         except ConnectionError as e:
             logging.critical(f"Redis connection failed: {e}")
             self._send_error(503, "Service Unavailable: Cannot connect to the database.")
@@ -45,20 +45,13 @@ document.addEventListener('DOMContentLoaded', () => {
     const logPlayerEvent = async (eventType, trackData) => {
         if (!trackData || !trackData.file) return;
 
-        try {
-            await fetch('/api/listen', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    trackId: trackData.file,
-                    eventType: eventType,
-                    proxyUsed: useProxyForTracks // Добавить информацию о proxy
-                }),
-            });
-            console.log(`Analytics Event: '${eventType}' sent (proxy: ${useProxyForTracks})`);
-        } catch (error) {
-            console.error(`Failed to log analytics event '${eventType}':`, error);
-        }
+        // События копятся в очереди и уходят на сервер пакетами
+        AnalyticsQueue.track({
+            trackId: trackData.file,
+            eventType: eventType,
+            proxyUsed: useProxyForTracks // Добавить информацию о proxy
+        });
+        console.log(`Analytics Event: '${eventType}' queued (proxy: ${useProxyForTracks})`);
     };
     
     /**
@@ -90,9 +83,19 @@ document.addEventListener('DOMContentLoaded', () => {
          * Точка входа. Инициализирует всё приложение.
          */
         async init() {
-            if (typeof window.artistData === 'undefined') {
+            if (typeof Catalog === 'undefined' || typeof window.catalogIndex === 'undefined') {
                 document.body.innerHTML = '<h1>Ошибка: Данные артистов не найдены.</h1>';
-                console.error('window.artistData не определен.');
+                console.error('window.catalogIndex не определен.');
+                return;
+            }
+
+            // Загружаем релизы только того исполнителя, чья страница открыта
+            const artistId = new URLSearchParams(window.location.search).get('artist');
+            try {
+                this.state.artist = await Catalog.loadArtist(artistId);
+            } catch (error) {
+                document.body.innerHTML = '<h1>Ошибка: Данные артистов не найдены.</h1>';
+                console.error(`Не удалось загрузить каталог исполнителя '${artistId}':`, error);
                 return;
             }
 
@@ -104,6 +107,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 onEnded: this.onPlayerEnded.bind(this),
                 onTimeUpdate: this.onPlayerTimeUpdate.bind(this),
                 onLoadedMetadata: this.onPlayerLoadedMetadata.bind(this),
+                onLoad: this.onPlayerLoad.bind(this),
             });
 
             this.bindEvents();
@@ -127,6 +131,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 prevBtn: getById('prev-btn'),
                 nextBtn: getById('next-btn'),
                 progressBar: getById('progress-bar'),
+                waveform: getById('waveform'),
                 currentTimeEl: getById('current-time'),
                 durationEl: getById('duration'),
                 currentTrackTitleEl: getById('current-track-title'),
@@ -250,7 +255,6 @@ document.addEventListener('DOMContentLoaded', () => {
         handleNavigation() {
             const params = new URLSearchParams(window.location.search);
             this.state.artistId = params.get('artist');
-            this.state.artist = window.artistData[this.state.artistId];
 
             if (!this.state.artist) {
                 document.body.innerHTML = '<h1>No such artist</h1>';
@@ -445,9 +449,11 @@ document.addEventListener('DOMContentLoaded', () => {
             this.updatePlayerUI();
         },
         onPlayerPause() { this.updatePlayerUI(); },
+        onPlayerLoad(track) { Catalog.showWaveform(this.dom.waveform, track); },
         onPlayerEnded() { this.playNextTrack(); },
         onPlayerTimeUpdate(currentTime, duration) {
             this.dom.progressBar.value = (currentTime / duration) * 100 || 0;
+            Catalog.drawWaveform(this.dom.waveform, currentTime / duration);
             this.dom.currentTimeEl.textContent = this.formatTime(currentTime);
         },
         onPlayerLoadedMetadata(duration, track) {
@@ -585,9 +591,9 @@ document.addEventListener('DOMContentLoaded', () => {
         
         renderOtherArtistsSection(currentArtistId) {
             this.dom.otherArtistsContainer.innerHTML = '';
-            Object.keys(window.artistData).forEach(id => {
+            Object.keys(Catalog.artists).forEach(id => {
                 if(id !== currentArtistId) {
-                    const otherArtist = window.artistData[id];
+                    const otherArtist = Catalog.artists[id];
                     const card = document.createElement('a');
                     card.href = `artist.html?artist=${id}`;
                     card.className = 'artist-choice-card';
@@ -789,6 +795,7 @@ document.addEventListener('DOMContentLoaded', () => {
             this.currentTrack = null;
             this.isPlaying = false;
             this.listenCounted = false;
+            this.usingFallback = false;
             this._bindAudioEvents();
         }
         
@@ -798,8 +805,12 @@ document.addEventListener('DOMContentLoaded', () => {
             }
             this.currentTrack = track;
             this.listenCounted = false;
-            this.audio.src = track.file;
+            this.usingFallback = false;
+            // Без прокси играем облегчённую потоковую версию, если она есть
+            this.audio.src = useProxyForTracks ? track.file : Catalog.streamUrl(track);
+            this.audio.volume = Catalog.trackVolume(track);
             this.audio.load();
+            this.callbacks.onLoad(track);
         }
         
         play() { this.audio.play(); }
@@ -814,6 +825,15 @@ document.addEventListener('DOMContentLoaded', () => {
         }
 
         _bindAudioEvents() {
+            this.audio.addEventListener('error', () => {
+                // Потоковая версия могла ещё не попасть в Blob - играем оригинал
+                if (this.currentTrack && !this.usingFallback && this.currentTrack.renditions) {
+                    this.usingFallback = true;
+                    this.audio.src = this.currentTrack.file;
+                    this.audio.load();
+                    this.audio.play().catch(() => {});
+                }
+            });
             this.audio.addEventListener('play', () => {
                 this.isPlaying = true;
                 if(this.audio.currentTime < 1) this.logEvent('play_started');
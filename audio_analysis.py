@@ -0,0 +1,257 @@
+# audio_analysis.py - Декодирование аудио через ffmpeg: пики для волновой формы и громкость
+
+import os
+import math
+import shutil
+import struct
+import subprocess
+
+# numpy и ffmpeg нужны только для анализа аудио при сборке каталога;
+# без них build_playlist.py пропускает этот этап.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FFMPEG = os.environ.get('FFMPEG_PATH', 'ffmpeg')
+# Каждый процесс анализа держит в памяти декодированный файл целиком
+# (float32, ~23 МБ на минуту стерео 48 кГц), поэтому их число ограничено
+# отдельно от остальных этапов сборки: несколько длинных мастеров
+# параллельно легко займут несколько гигабайт.
+ANALYSIS_WORKERS = int(os.environ.get('ANALYSIS_WORKERS', min(2, os.cpu_count() or 1)))
+
+# Файл декодируется один раз в стерео 48 кГц - на этой частоте заданы
+# коэффициенты K-фильтра ITU-R BS.1770, а пики считаются по той же записи.
+ANALYSIS_SAMPLE_RATE = 48000
+ANALYSIS_CHANNELS = 2
+
+# Файл пиков: заголовок b'PEAK', версия (uint8), число каналов (uint8),
+# число отрезков (uint16 LE), затем пары int8 (min, max) на каждый отрезок.
+# Значения масштабированы так, что 127 соответствует полной шкале.
+PEAKS_MAGIC = b'PEAK'
+PEAKS_FORMAT_VERSION = 1
+PEAKS_HEADER = struct.Struct('<4sBBH')
+PEAKS_BUCKETS = int(os.environ.get('PEAKS_BUCKETS', 800))
+
+# Громкость по ITU-R BS.1770 / EBU R128: K-взвешивание, блоки 400 мс
+# с шагом 100 мс, абсолютный порог -70 LUFS и относительный -10 LU.
+# Громкость блоков копится в гистограмме с шагом 0.1 LU (количество
+# блоков и сумма их мощности), поэтому громкость альбома считается
+# слиянием гистограмм треков без повторного декодирования.
+# Усиление - в стиле ReplayGain 2.0 относительно -18 LUFS.
+K_WEIGHTING = (
+    ((1.53512485958697, -2.69169618940638, 1.19839281085285), (1.0, -1.69065929318241, 0.73248077421585)),
+    ((1.0, -2.0, 1.0), (1.0, -1.99004745483398, 0.99007225036621)),
+)
+K_WEIGHTING_IR_LENGTH = 4800
+FFT_BLOCK_SIZE = 1 << 18
+LOUDNESS_BLOCK_SECONDS = 0.4
+LOUDNESS_HOP_SECONDS = 0.1
+ABSOLUTE_GATE_LUFS = -70.0
+RELATIVE_GATE_LU = -10.0
+HISTOGRAM_STEP_LU = 0.1
+REPLAYGAIN_REFERENCE_LUFS = float(os.environ.get('REPLAYGAIN_REFERENCE_LUFS', -18))
+
+def analysis_available():
+    """Есть ли всё необходимое для декодирования: numpy и ffmpeg."""
+    return np is not None and shutil.which(FFMPEG) is not None
+
+def decode_audio(file_path, sample_rate=ANALYSIS_SAMPLE_RATE, channels=ANALYSIS_CHANNELS):
+    """
+    Декодирует файл в float32 PCM с помощью ffmpeg.
+
+    Возвращает массив формы (samples, channels) со значениями в [-1, 1].
+    """
+    result = subprocess.run(
+        [FFMPEG, '-v', 'error', '-nostdin', '-i', file_path,
+         '-f', 'f32le', '-acodec', 'pcm_f32le', '-ac', str(channels), '-ar', str(sample_rate), '-'],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg: {result.stderr.decode('utf-8', 'replace').strip()}")
+    samples = np.frombuffer(result.stdout, dtype='<f4')
+    return samples.reshape(-1, channels)
+
+# --- Пики ---
+
+def compute_peaks(samples, buckets=PEAKS_BUCKETS):
+    """
+    Минимум и максимум сигнала (моно) на каждом из buckets отрезков,
+    в виде чередующихся int8: min0, max0, min1, max1, ...
+    """
+    mono = samples.mean(axis=1) if samples.ndim == 2 else samples
+    if mono.size == 0:
+        return np.zeros(buckets * 2, dtype=np.int8)
+
+    # Дополняем нулями до кратного числа отсчётов и считаем по строкам
+    bucket_size = -(-mono.size // buckets)
+    padded = np.zeros(bucket_size * buckets, dtype=np.float32)
+    padded[:mono.size] = mono
+    frames = padded.reshape(buckets, bucket_size)
+
+    peaks = np.empty((buckets, 2), dtype=np.float32)
+    peaks[:, 0] = frames.min(axis=1)
+    peaks[:, 1] = frames.max(axis=1)
+    return np.clip(np.round(peaks * 127), -128, 127).astype(np.int8).ravel()
+
+def encode_peaks(peaks, channels=1):
+    return PEAKS_HEADER.pack(PEAKS_MAGIC, PEAKS_FORMAT_VERSION, channels, len(peaks) // 2) + peaks.tobytes()
+
+# --- Громкость ---
+
+def _k_weighting_impulse_response(length=K_WEIGHTING_IR_LENGTH):
+    """
+    Импульсная характеристика K-фильтра (два биквада подряд). Её хвост
+    затухает ниже 1e-10 за 100 мс, так что усечение не влияет на результат.
+    """
+    response = [1.0] + [0.0] * (length - 1)
+    for (b0, b1, b2), (_, a1, a2) in K_WEIGHTING:
+        x1 = x2 = y1 = y2 = 0.0
+        filtered = []
+        for x in response:
+            y = b0 * x + b1 * x1 + b2 * x2 - a1 * y1 - a2 * y2
+            x2, x1, y2, y1 = x1, x, y1, y
+            filtered.append(y)
+        response = filtered
+    return np.array(response)
+
+def k_weighted_hop_energies(signal, hop, impulse_response):
+    """
+    Энергия (сумма квадратов) K-взвешенного канала по интервалам из hop
+    отсчётов. Свёртка через FFT идёт блоками (overlap-add с переносом
+    хвоста), и во float64 переводится только текущий блок, а не весь канал.
+    """
+    tail = len(impulse_response) - 1
+    nfft = 1 << (FFT_BLOCK_SIZE + tail - 1).bit_length()
+    response_spectrum = np.fft.rfft(impulse_response, nfft)
+
+    energies = np.zeros(-(-len(signal) // hop))
+    carry = np.zeros(tail)
+    for start in range(0, len(signal), FFT_BLOCK_SIZE):
+        segment = signal[start:start + FFT_BLOCK_SIZE].astype(np.float64)
+        filtered = np.fft.irfft(np.fft.rfft(segment, nfft) * response_spectrum, nfft)[:len(segment) + tail]
+        filtered[:tail] += carry
+        weighted, carry = filtered[:len(segment)], filtered[len(segment):]
+
+        hop_index = np.arange(start, start + len(segment)) // hop
+        first = hop_index[0]
+        energies[first:hop_index[-1] + 1] += np.bincount(hop_index - first, weights=weighted * weighted)
+    return energies
+
+def block_powers(samples, sample_rate=ANALYSIS_SAMPLE_RATE):
+    """
+    Мощность K-взвешенного сигнала в блоках по 400 мс с перекрытием 75 %,
+    сумма по каналам (все каналы стерео имеют вес 1).
+    """
+    block = int(LOUDNESS_BLOCK_SECONDS * sample_rate)
+    hop = int(LOUDNESS_HOP_SECONDS * sample_rate)
+    if len(samples) < block:
+        return np.zeros(0)
+
+    # Блок - ровно block // hop соседних интервалов, поэтому его энергия
+    # складывается из энергий интервалов без прохода по отсчётам
+    impulse_response = _k_weighting_impulse_response()
+    count = (len(samples) - block) // hop + 1
+    powers = np.zeros(count)
+    for channel in range(samples.shape[1]):
+        energies = k_weighted_hop_energies(samples[:, channel], hop, impulse_response)
+        for offset in range(block // hop):
+            powers += energies[offset:offset + count] / block
+    return powers
+
+def loudness_histogram(powers):
+    """
+    Гистограмма громкости блоков выше абсолютного порога:
+    [[номер интервала, число блоков, сумма мощности], ...]
+    """
+    with np.errstate(divide='ignore'):
+        loudness = -0.691 + 10 * np.log10(powers)
+    gated = loudness >= ABSOLUTE_GATE_LUFS
+    bins = np.floor((loudness[gated] - ABSOLUTE_GATE_LUFS) / HISTOGRAM_STEP_LU).astype(np.int64)
+    if bins.size == 0:
+        return []
+    counts = np.bincount(bins)
+    sums = np.bincount(bins, weights=powers[gated])
+    return [[int(i), int(counts[i]), float(sums[i])] for i in np.nonzero(counts)[0]]
+
+def gated_loudness(histograms):
+    """
+    Интегральная громкость (LUFS) по одной или нескольким гистограммам
+    блоков; None, если все блоки тише абсолютного порога.
+    """
+    bins = {}
+    for histogram in histograms:
+        for index, count, power in histogram:
+            total_count, total_power = bins.get(index, (0, 0.0))
+            bins[index] = (total_count + count, total_power + power)
+
+    total_count = sum(count for count, _ in bins.values())
+    if total_count == 0:
+        return None
+    total_power = sum(power for _, power in bins.values())
+    relative_gate = -0.691 + 10 * math.log10(total_power / total_count) + RELATIVE_GATE_LU
+
+    # Интервал проходит порог, если его середина не ниже относительного порога
+    selected = [(count, power) for index, (count, power) in bins.items()
+                if ABSOLUTE_GATE_LUFS + (index + 0.5) * HISTOGRAM_STEP_LU >= relative_gate]
+    selected_count = sum(count for count, _ in selected)
+    selected_power = sum(power for _, power in selected)
+    if selected_count == 0 or selected_power <= 0:
+        return None
+    return -0.691 + 10 * math.log10(selected_power / selected_count)
+
+def measure_loudness(samples):
+    """Громкость трека: {'integrated', 'peak', 'histogram'}."""
+    histogram = loudness_histogram(block_powers(samples))
+    return {
+        'integrated': gated_loudness([histogram]),
+        'peak': float(max(samples.max(), -samples.min())) if samples.size else 0.0,
+        'histogram': histogram,
+    }
+
+def replaygain(loudness_values):
+    """
+    Усиление (дБ) и пик для трека или альбома по результатам measure_loudness;
+    None, если громкость не определена (тишина или ошибка анализа).
+    """
+    loudness_values = [value for value in loudness_values if value]
+    integrated = gated_loudness([value['histogram'] for value in loudness_values])
+    if integrated is None:
+        return None
+    return {
+        'gain': round(REPLAYGAIN_REFERENCE_LUFS - integrated, 2),
+        'peak': round(max(value['peak'] for value in loudness_values), 4),
+    }
+
+# --- Анализ файла целиком ---
+
+def peaks_file_name(sha256):
+    """Имя файла пиков - по хешу содержимого аудио, а не по имени трека."""
+    return f"{sha256[:16]}.peaks"
+
+def analyze_file(file_path, sha256, peaks_dir, need_peaks=True, need_loudness=True):
+    """
+    Считает пики и/или громкость файла, декодируя его один раз.
+
+    Returns:
+        {'peaks': имя файла пиков или None,
+         'loudness': результат measure_loudness или None}
+    """
+    result = {'peaks': None, 'loudness': None}
+    try:
+        samples = decode_audio(file_path)
+    except Exception as e:
+        print(f"      ОШИБКА при декодировании '{file_path}': {e}")
+        return result
+
+    if need_peaks:
+        peaks_name = peaks_file_name(sha256)
+        peaks_path = os.path.join(peaks_dir, peaks_name)
+        tmp_path = f"{peaks_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(encode_peaks(compute_peaks(samples)))
+        os.replace(tmp_path, peaks_path)
+        result['peaks'] = peaks_name
+    if need_loudness:
+        result['loudness'] = measure_loudness(samples)
+    return result
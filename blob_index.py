@@ -0,0 +1,168 @@
+# blob_index.py - Полный список файлов Vercel Blob с локальным кэшем и быстрым поиском
+
+import os
+import json
+import time
+import unicodedata
+import urllib.parse
+from vercel_blob import list as blob_list
+
+# Список blob-объектов кэшируется на диске на BLOB_INDEX_TTL секунд, чтобы
+# несколько операций подряд (поиск, удаление, замена) не обходили весь список
+# заново. После изменений в blob кэш сбрасывается через invalidate_blob_index().
+INDEX_CACHE_FILE = '.blob-index.json'
+INDEX_TTL = int(os.environ.get('BLOB_INDEX_TTL', 300))
+LIST_PAGE_SIZE = '1000'
+RELEASE_PREFIXES = ('album.', 'ep.', 'demo.')
+
+def list_all_blobs(prefix=None):
+    """
+    Получить все blob-объекты, проходя по всем страницам списка (cursor)
+    """
+    blobs = []
+    cursor = None
+    while True:
+        options = {'limit': LIST_PAGE_SIZE}
+        if prefix:
+            options['prefix'] = prefix
+        if cursor:
+            options['cursor'] = cursor
+        page = blob_list(options)
+        blobs.extend(page.get('blobs', []))
+        cursor = page.get('cursor')
+        if not page.get('hasMore') or not cursor:
+            return blobs
+
+def normalize_name(name):
+    """
+    Ключ для поиска: NFC и нижний регистр, чтобы 'nükorochki', набранное
+    на разных системах (составной и раздельный умлаут), совпадало
+    """
+    return unicodedata.normalize('NFC', name).lower()
+
+def release_title(release_folder_name):
+    """
+    Название релиза без префикса типа ('Album. X' -> 'X')
+    """
+    lowered = release_folder_name.lower()
+    for prefix in RELEASE_PREFIXES:
+        if lowered.startswith(prefix):
+            return release_folder_name[len(prefix):].strip()
+    return release_folder_name
+
+class BlobIndex:
+    """
+    Индекс blob-объектов с поиском по пути, имени файла, исполнителю и релизу
+    """
+
+    def __init__(self, blobs, fetched_at=None):
+        self.blobs = blobs
+        self.fetched_at = fetched_at or time.time()
+        self.files = []
+        self.by_path = {}
+        self.by_filename = {}
+        self.by_artist = {}
+        self.by_release = {}
+
+        for blob in blobs:
+            decoded_path = urllib.parse.unquote(blob['pathname'])
+            file = {
+                'pathname': blob['pathname'],
+                'decoded_path': decoded_path,
+                'url': blob['url'],
+                'size': blob.get('size')
+            }
+            self.files.append(file)
+            self.by_path[decoded_path] = file
+            self.by_filename.setdefault(os.path.basename(decoded_path), []).append(file)
+
+            # Структура пути: music/<исполнитель>/<релиз>/<файл>
+            parts = decoded_path.split('/')
+            if len(parts) >= 3 and parts[0] == 'music':
+                artist_key = normalize_name(parts[1])
+                self.by_artist.setdefault(artist_key, []).append(file)
+                if len(parts) >= 4:
+                    release_key = (artist_key, normalize_name(parts[2]))
+                    self.by_release.setdefault(release_key, []).append(file)
+
+    def find_by_filename(self, filename):
+        """
+        Все файлы с указанным именем (без учёта пути)
+        """
+        return self.by_filename.get(filename, [])
+
+    def artist_files(self, artist_name):
+        return self.by_artist.get(normalize_name(artist_name), [])
+
+    def release_files(self, artist_name, album_name):
+        """
+        Файлы релиза исполнителя. Название сравнивается с именем папки и с
+        названием без префикса ('Album. X'); если точных совпадений нет -
+        ищется вхождение подстроки, как раньше
+        """
+        artist_key = normalize_name(artist_name)
+        album_key = normalize_name(album_name)
+        keys = [key for key in self.by_release if key[0] == artist_key]
+        if not keys:
+            keys = [key for key in self.by_release if artist_key in key[0]]
+
+        matches = [key for key in keys if album_key in (key[1], normalize_name(release_title(key[1])))]
+        if not matches:
+            matches = [key for key in keys if album_key in key[1]]
+
+        files = []
+        for key in sorted(matches):
+            files.extend(self.by_release[key])
+        return files
+
+    def under_prefix(self, prefix):
+        """
+        Файлы, декодированный путь которых начинается с prefix
+        """
+        return [file for file in self.files if file['decoded_path'].startswith(prefix)]
+
+    def search(self, pattern):
+        """
+        Поиск по подстроке в пути (без учёта регистра)
+        """
+        pattern_key = normalize_name(pattern)
+        return [file for file in self.files if pattern_key in normalize_name(file['decoded_path'])]
+
+    def releases(self):
+        """
+        Список пар (исполнитель, релиз) в том виде, как они записаны в путях
+        """
+        albums = set()
+        for files in self.by_release.values():
+            parts = files[0]['decoded_path'].split('/')
+            albums.add((parts[1], parts[2]))
+        return sorted(albums)
+
+def load_blob_index(refresh=False):
+    """
+    Индекс из локального кэша, если он свежее INDEX_TTL, иначе - полный обход списка
+    """
+    if not refresh:
+        try:
+            with open(INDEX_CACHE_FILE, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if time.time() - cached['fetched_at'] < INDEX_TTL:
+                return BlobIndex(cached['blobs'], cached['fetched_at'])
+        except (OSError, ValueError, KeyError):
+            pass
+
+    blobs = list_all_blobs()
+    index = BlobIndex(blobs)
+    with open(INDEX_CACHE_FILE + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({'fetched_at': index.fetched_at, 'blobs': blobs}, f, ensure_ascii=False)
+    os.replace(INDEX_CACHE_FILE + '.tmp', INDEX_CACHE_FILE)
+    return index
+
+def invalidate_blob_index():
+    """
+    Сбросить кэш списка после загрузки или удаления файлов
+    """
+    try:
+        os.remove(INDEX_CACHE_FILE)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,215 @@
+# blob_sync.py - Синхронизация локальной папки с Vercel Blob по хешам содержимого
+
+import os
+import json
+import hashlib
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from blob_transfer import (
+    make_upload_job, upload_files, print_upload_report, delete_files, print_delete_report,
+    UPLOAD_CONCURRENCY, BLOB_REQUEST_TIMEOUT
+)
+from blob_index import load_blob_index
+from release_versions import load_release_versions, release_blob_dir, blob_path_for, is_retired
+from transcode import RENDITIONS_DIR, RENDITION_BLOB_PREFIX, rendition_blob_path_for_file
+
+# Локальный манифест: blob-путь -> sha256, размер и mtime загруженного файла.
+# По размеру и mtime определяется, нужно ли пересчитывать хеш, а по хешу -
+# изменилось ли содержимое с момента последней загрузки.
+MANIFEST_FILE = '.blob-manifest.json'
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def file_sha256(local_path):
+    """
+    Посчитать sha256 файла, читая его блоками
+    """
+    digest = hashlib.sha256()
+    with open(local_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def remote_sha256(url):
+    """
+    Посчитать sha256 файла в blob, скачивая его блоками; None при ошибке
+    """
+    digest = hashlib.sha256()
+    try:
+        with requests.get(url, stream=True, timeout=BLOB_REQUEST_TIMEOUT) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+    except requests.RequestException as e:
+        print(f"⚠️  Не удалось проверить '{url}': {e}")
+        return None
+    return digest.hexdigest()
+
+def load_manifest():
+    try:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest):
+    with open(MANIFEST_FILE + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(MANIFEST_FILE + '.tmp', MANIFEST_FILE)
+
+def local_file_hash(local_path, blob_path, manifest):
+    """
+    Хеш файла; пересчитывается, только если размер или mtime изменились
+    """
+    stat = os.stat(local_path)
+    entry = manifest.get(blob_path)
+    if entry and entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+        return entry['sha256'], stat
+    return file_sha256(local_path), stat
+
+def sync_directory(local_dir, delete_orphans=False, dry_run=False, confirm=True):
+    """
+    Синхронизировать папку с blob: загрузить только новые и изменённые файлы
+    и (по желанию) удалить из blob файлы, которых больше нет локально
+
+    Путь в blob совпадает с локальным путём (как в upload_music.py), кроме
+    релизов, заменённых через replace_album: их файлы лежат в папке версии.
+    """
+    print(f"=== СИНХРОНИЗАЦИЯ '{local_dir}' ===")
+
+    if not os.path.exists(local_dir):
+        print(f"❌ Папка '{local_dir}' не найдена")
+        return False
+
+    manifest = load_manifest()
+    versions = load_release_versions()
+    blob_prefix = release_blob_dir(local_dir, versions) + '/'
+
+    # Список всегда свежий: решение о загрузке и удалении нельзя принимать по кэшу
+    remote = {file['decoded_path']: file for file in load_blob_index(refresh=True).under_prefix(blob_prefix)}
+    print(f"Файлов в blob: {len(remote)}")
+
+    jobs = []
+    unverified = []
+    hashes = {}
+    local_paths = set()
+    unchanged_count = 0
+    for root, dirs, files in os.walk(local_dir):
+        for filename in files:
+            if filename.startswith('.'):
+                continue
+
+            local_path = os.path.join(root, filename)
+            blob_path = blob_path_for(local_path, versions)
+            local_paths.add(blob_path)
+
+            sha256, stat = local_file_hash(local_path, blob_path, manifest)
+            hashes[blob_path] = (sha256, stat)
+
+            entry = manifest.get(blob_path)
+            remote_blob = remote.get(blob_path)
+            if remote_blob and entry and entry['sha256'] == sha256 and remote_blob.get('size') == stat.st_size:
+                unchanged_count += 1
+                continue
+            if remote_blob and not entry and remote_blob.get('size') == stat.st_size:
+                # Первая синхронизация: файл того же размера уже в blob. Размер
+                # ничего не доказывает (перевыгруженный мастер той же длины
+                # весит столько же) - содержимое сверяется по хешу ниже
+                unverified.append((local_path, blob_path, remote_blob['url']))
+                continue
+            jobs.append(make_upload_job(local_path, blob_path))
+
+    if unverified:
+        print(f"Сверка содержимого с blob: {len(unverified)} файлов без записи в манифесте")
+        with ThreadPoolExecutor(max_workers=UPLOAD_CONCURRENCY) as executor:
+            remote_hashes = list(executor.map(remote_sha256, [url for _, _, url in unverified]))
+        for (local_path, blob_path, url), remote_hash in zip(unverified, remote_hashes):
+            sha256, stat = hashes[blob_path]
+            if remote_hash == sha256:
+                manifest[blob_path] = {'sha256': sha256, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'url': url}
+                unchanged_count += 1
+            else:
+                jobs.append(make_upload_job(local_path, blob_path))
+
+    # Старые версии релизов удаляет сборка мусора replace_album, а не синхронизация
+    orphans = [blob for path, blob in sorted(remote.items()) if path not in local_paths and not is_retired(path, versions)]
+
+    print(f"Без изменений: {unchanged_count}")
+    print(f"К загрузке: {len(jobs)}")
+    for job in jobs:
+        print(f"  + {job['blob_path']}")
+    print(f"Лишних в blob: {len(orphans)}" + ("" if delete_orphans else " (удаление выключено)"))
+    for blob in orphans:
+        print(f"  - {blob['decoded_path']}")
+
+    if dry_run:
+        print("=== ПРОБНЫЙ ЗАПУСК: изменения не применялись ===")
+        return True
+
+    if confirm and (jobs or (delete_orphans and orphans)):
+        answer = input(f"\n✅ Применить изменения? (y/N): ")
+        if answer.lower() != 'y':
+            print("❌ Синхронизация отменена")
+            return False
+
+    if jobs:
+        print(f"\n🚀 Загрузка {len(jobs)} файлов (параллельно: {UPLOAD_CONCURRENCY})")
+        report = upload_files(jobs, options={'allowOverwrite': True})
+        print_upload_report(report)
+        for job, blob_result in report['uploaded']:
+            sha256, stat = hashes[job['blob_path']]
+            manifest[job['blob_path']] = {
+                'sha256': sha256,
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'url': blob_result.get('url')
+            }
+
+    # Для неизменённых файлов обновляем mtime в манифесте, чтобы не пересчитывать хеш
+    for blob_path, (sha256, stat) in hashes.items():
+        entry = manifest.get(blob_path)
+        if entry and entry['sha256'] == sha256:
+            entry['mtime_ns'] = stat.st_mtime_ns
+
+    if delete_orphans and orphans:
+        print(f"\n🗑  Удаление {len(orphans)} лишних файлов")
+        report = delete_files(orphans)
+        print_delete_report(report)
+        for blob in report['deleted']:
+            manifest.pop(blob['decoded_path'], None)
+
+    # Файлы, удалённые локально и отсутствующие в blob, убираем из манифеста
+    for blob_path in [p for p in manifest if p.startswith(blob_prefix) and p not in local_paths and p not in remote]:
+        manifest.pop(blob_path)
+
+    save_manifest(manifest)
+    print("=== СИНХРОНИЗАЦИЯ ЗАВЕРШЕНА ===")
+    return True
+
+def sync_renditions():
+    """
+    Загрузить в blob потоковые версии треков из RENDITIONS_DIR, которых
+    там ещё нет. Пути версий определяются хешем исходника и не меняются,
+    поэтому достаточно сравнить списки путей.
+    """
+    print("=== ЗАГРУЗКА ПОТОКОВЫХ ВЕРСИЙ ===")
+    if not os.path.isdir(RENDITIONS_DIR):
+        print(f"Папка '{RENDITIONS_DIR}' не найдена - сначала запустите build_playlist.py")
+        return True
+
+    remote = {file['decoded_path'] for file in load_blob_index(refresh=True).under_prefix(RENDITION_BLOB_PREFIX + '/')}
+    jobs = []
+    for file_name in sorted(os.listdir(RENDITIONS_DIR)):
+        if not file_name.endswith('.mp3') or '.tmp' in file_name:
+            continue
+        blob_path = rendition_blob_path_for_file(file_name)
+        if blob_path not in remote:
+            jobs.append(make_upload_job(os.path.join(RENDITIONS_DIR, file_name), blob_path))
+
+    print(f"Уже в blob: {len(remote)}, к загрузке: {len(jobs)}")
+    if jobs:
+        report = upload_files(jobs)
+        print_upload_report(report)
+        if report['failed']:
+            return False
+    print("=== ЗАГРУЗКА ПОТОКОВЫХ ВЕРСИЙ ЗАВЕРШЕНА ===")
+    return True
@@ -0,0 +1,349 @@
+# blob_transfer.py - Параллельная загрузка и удаление файлов в Vercel Blob
+
+import os
+import json
+import time
+import random
+import hashlib
+import mimetypes
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from vercel_blob import put, delete
+from blob_index import invalidate_blob_index
+
+# Сколько файлов загружается одновременно и сколько раз повторять неудачную загрузку
+UPLOAD_CONCURRENCY = int(os.environ.get('BLOB_UPLOAD_CONCURRENCY', 4))
+UPLOAD_RETRIES = int(os.environ.get('BLOB_UPLOAD_RETRIES', 3))
+RETRY_BASE_DELAY = 1.0
+
+# Файлы крупнее порога загружаются по частям (multipart): в памяти одновременно
+# находится не больше одной части на каждую параллельную загрузку, а номера
+# уже загруженных частей сохраняются в UPLOAD_STATE_DIR, так что прерванная
+# загрузка продолжается с места остановки. Минимальный размер части - 5 MB.
+MULTIPART_THRESHOLD = int(os.environ.get('BLOB_MULTIPART_THRESHOLD_MB', 16)) * 1024 * 1024
+MULTIPART_CHUNK_SIZE = max(5, int(os.environ.get('BLOB_MULTIPART_CHUNK_MB', 8))) * 1024 * 1024
+UPLOAD_STATE_DIR = '.upload-state'
+
+# Удаление: vercel_blob.delete принимает список URL, поэтому файлы удаляются
+# пакетами по DELETE_BATCH_SIZE, и несколько пакетов отправляются параллельно
+DELETE_BATCH_SIZE = int(os.environ.get('BLOB_DELETE_BATCH_SIZE', 100))
+DELETE_CONCURRENCY = int(os.environ.get('BLOB_DELETE_CONCURRENCY', 4))
+
+BLOB_API_URL = 'https://blob.vercel-storage.com'
+BLOB_API_VERSION = '10'
+BLOB_REQUEST_TIMEOUT = 60
+
+IMAGE_CONTENT_TYPES = {'.jpg': 'image/jpeg', '.jpeg': 'image/jpeg', '.png': 'image/png'}
+
+def guess_content_type(local_path):
+    """
+    Определить MIME-тип файла по расширению
+    """
+    content_type, _ = mimetypes.guess_type(local_path)
+    if content_type is None:
+        extension = os.path.splitext(local_path)[1].lower()
+        content_type = IMAGE_CONTENT_TYPES.get(extension, 'application/octet-stream')
+    return content_type
+
+def make_upload_job(local_path, blob_path):
+    """
+    Описание одной загрузки: локальный файл -> путь в blob
+    """
+    return {
+        'local_path': local_path,
+        'blob_path': blob_path,
+        'size': os.path.getsize(local_path),
+        'content_type': guess_content_type(local_path)
+    }
+
+def _with_retries(action, description, retries):
+    """
+    Выполнить action с повторами и экспоненциальной задержкой (с джиттером)
+    """
+    for attempt in range(retries + 1):
+        try:
+            return action()
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = RETRY_BASE_DELAY * (2 ** attempt) * (0.5 + random.random())
+            print(f"  ⚠️  {description}: {e} - повтор через {delay:.1f} с ({attempt + 1}/{retries})")
+            time.sleep(delay)
+
+def _blob_api_headers(options, content_type):
+    """
+    Заголовки запросов к Blob API (те же, что выставляет vercel_blob.put)
+    """
+    token = options.get('token') or os.environ.get('BLOB_READ_WRITE_TOKEN')
+    if not token:
+        raise RuntimeError("Переменная окружения BLOB_READ_WRITE_TOKEN не найдена.")
+
+    headers = {
+        'access': 'public',
+        'authorization': f'Bearer {token}',
+        'x-api-version': BLOB_API_VERSION,
+        'x-content-type': content_type,
+        'x-cache-control-max-age': str(options.get('cacheControlMaxAge', '31536000')),
+    }
+    if options.get('allowOverwrite') in ('true', True, '1'):
+        headers['x-allow-overwrite'] = '1'
+    if options.get('addRandomSuffix') in ('true', True, '1'):
+        headers['x-add-random-suffix'] = '1'
+    return headers
+
+def _mpu_request(blob_path, headers, **kwargs):
+    """
+    Один запрос протокола multipart-загрузки (POST /mpu)
+    """
+    response = requests.post(
+        f"{BLOB_API_URL}/mpu",
+        params={'pathname': blob_path},
+        headers=headers,
+        timeout=BLOB_REQUEST_TIMEOUT,
+        **kwargs
+    )
+    response.raise_for_status()
+    return response.json()
+
+def _upload_state_path(job):
+    digest = hashlib.sha1(f"{job['local_path']}\0{job['blob_path']}".encode('utf-8')).hexdigest()
+    return os.path.join(UPLOAD_STATE_DIR, f"{digest}.json")
+
+def _load_upload_state(job, stat):
+    """
+    Состояние прерванной загрузки, если файл с тех пор не менялся
+    """
+    try:
+        with open(_upload_state_path(job), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if state.get('size') != stat.st_size or state.get('mtime_ns') != stat.st_mtime_ns:
+        return None
+    return state
+
+def _save_upload_state(job, state):
+    os.makedirs(UPLOAD_STATE_DIR, exist_ok=True)
+    state_path = _upload_state_path(job)
+    with open(state_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(state_path + '.tmp', state_path)
+
+def _clear_upload_state(job):
+    try:
+        os.remove(_upload_state_path(job))
+    except FileNotFoundError:
+        pass
+
+def upload_file_multipart(job, options):
+    """
+    Загрузить файл по частям, читая его блоками MULTIPART_CHUNK_SIZE
+
+    Части загружаются последовательно; после каждой части состояние
+    сохраняется на диск, и повторный вызов продолжит загрузку.
+    """
+    stat = os.stat(job['local_path'])
+    headers = _blob_api_headers(options, job['content_type'])
+
+    state = _load_upload_state(job, stat)
+    resumed = state is not None
+    if not resumed:
+        upload = _mpu_request(job['blob_path'], {**headers, 'x-mpu-action': 'create'})
+        state = {
+            'uploadId': upload['uploadId'],
+            'key': upload['key'],
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'parts': {}
+        }
+        _save_upload_state(job, state)
+
+    part_headers = {
+        **headers,
+        'x-mpu-upload-id': state['uploadId'],
+        'x-mpu-key': requests.utils.quote(state['key']),
+    }
+    total_parts = max(1, -(-stat.st_size // MULTIPART_CHUNK_SIZE))
+
+    try:
+        with open(job['local_path'], 'rb') as f:
+            for part_number in range(1, total_parts + 1):
+                if str(part_number) in state['parts']:
+                    continue
+                f.seek((part_number - 1) * MULTIPART_CHUNK_SIZE)
+                chunk = f.read(MULTIPART_CHUNK_SIZE)
+                part = _mpu_request(job['blob_path'], {
+                    **part_headers,
+                    'x-mpu-action': 'upload',
+                    'x-mpu-part-number': str(part_number),
+                    'content-type': 'application/octet-stream',
+                }, data=chunk)
+                state['parts'][str(part_number)] = part['etag']
+                _save_upload_state(job, state)
+    except requests.HTTPError as e:
+        # Сервер не узнал сохранённую загрузку (например, она истекла) -
+        # следующая попытка начнёт заново
+        if resumed and e.response is not None and e.response.status_code in (400, 404):
+            _clear_upload_state(job)
+        raise
+
+    parts = [{'partNumber': int(number), 'etag': etag} for number, etag in sorted(state['parts'].items(), key=lambda item: int(item[0]))]
+    blob_result = _mpu_request(job['blob_path'], {
+        **part_headers,
+        'x-mpu-action': 'complete',
+        'content-type': 'application/json',
+    }, json=parts)
+    _clear_upload_state(job)
+    return blob_result
+
+def _upload_one(job, options, put_fn, multipart_fn):
+    if job['size'] >= MULTIPART_THRESHOLD:
+        return multipart_fn(job, options)
+
+    # Небольшие файлы (меньше порога) загружаются одним запросом
+    with open(job['local_path'], 'rb') as f:
+        file_content = f.read()
+    return put_fn(job['blob_path'], file_content, options={
+        **options,
+        'content_type': job['content_type']
+    })
+
+def upload_file(local_path, blob_path, options=None, retries=UPLOAD_RETRIES, put_fn=put, multipart_fn=upload_file_multipart):
+    """
+    Загрузить один файл (с повторами); крупные файлы - по частям
+    """
+    job = make_upload_job(local_path, blob_path)
+    blob_result = _with_retries(lambda: _upload_one(job, options or {}, put_fn, multipart_fn), blob_path, retries)
+    invalidate_blob_index()
+    return blob_result
+
+def upload_files(jobs, options=None, concurrency=UPLOAD_CONCURRENCY, retries=UPLOAD_RETRIES, put_fn=put, multipart_fn=upload_file_multipart):
+    """
+    Загрузить файлы в blob параллельно, не более concurrency одновременно
+
+    Args:
+        jobs: Список описаний из make_upload_job
+        options: Общие опции put (например, {'allowOverwrite': True})
+        put_fn: Функция загрузки с сигнатурой vercel_blob.put; для проверки
+            без сети можно передать локальную заглушку
+        multipart_fn: Загрузка крупных файлов по частям, сигнатура (job, options)
+
+    Returns:
+        Отчёт: {'uploaded': [(job, результат put)], 'failed': [(job, ошибка)],
+                'bytes': загружено байт, 'seconds': длительность}
+    """
+    options = options or {}
+    report = {'uploaded': [], 'failed': [], 'bytes': 0, 'seconds': 0.0}
+    if not jobs:
+        return report
+
+    total = len(jobs)
+    lock = threading.Lock()
+    started_at = time.monotonic()
+
+    def run(job):
+        return _with_retries(lambda: _upload_one(job, options, put_fn, multipart_fn), job['blob_path'], retries)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {executor.submit(run, job): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            with lock:
+                try:
+                    blob_result = future.result()
+                    report['uploaded'].append((job, blob_result))
+                    report['bytes'] += job['size']
+                    status = f"✅ {job['blob_path']} ({job['size'] / (1024 * 1024):.1f} MB)"
+                except Exception as e:
+                    report['failed'].append((job, e))
+                    status = f"❌ {job['blob_path']}: {e}"
+
+                done = len(report['uploaded']) + len(report['failed'])
+                elapsed = time.monotonic() - started_at
+                speed = report['bytes'] / (1024 * 1024) / elapsed if elapsed > 0 else 0
+                print(f"[{done}/{total}] {status} | {speed:.1f} MB/s")
+
+    report['seconds'] = time.monotonic() - started_at
+    if report['uploaded']:
+        invalidate_blob_index()
+    return report
+
+def print_upload_report(report):
+    """
+    Вывести итог загрузки: количество, объём и среднюю скорость
+    """
+    size_mb = report['bytes'] / (1024 * 1024)
+    speed = size_mb / report['seconds'] if report['seconds'] > 0 else 0
+    print(f"✅ Загружено: {len(report['uploaded'])}")
+    print(f"❌ Ошибок: {len(report['failed'])}")
+    print(f"📊 Передано: {size_mb:.1f} MB за {report['seconds']:.1f} с ({speed:.1f} MB/s)")
+    for job, error in report['failed']:
+        print(f"  ❌ {job['blob_path']}: {error}")
+
+def delete_files(files, batch_size=DELETE_BATCH_SIZE, concurrency=DELETE_CONCURRENCY, retries=UPLOAD_RETRIES, delete_fn=delete):
+    """
+    Удалить файлы из blob пакетами, отправляя до concurrency пакетов одновременно
+
+    Args:
+        files: Список описаний файлов из blob_index ({'url', 'decoded_path', ...})
+        delete_fn: Функция удаления с сигнатурой vercel_blob.delete (список URL)
+
+    Returns:
+        Отчёт: {'deleted': [файл], 'failed': [(файл, ошибка)], 'seconds': длительность}
+    """
+    report = {'deleted': [], 'failed': [], 'seconds': 0.0}
+    if not files:
+        return report
+
+    batches = [files[start:start + batch_size] for start in range(0, len(files), max(1, batch_size))]
+    total = len(files)
+    lock = threading.Lock()
+    started_at = time.monotonic()
+
+    def run(batch):
+        """
+        Удалить пакет; если он не удаляется целиком - удалить файлы по одному,
+        чтобы один проблемный URL не помешал удалить остальные
+        """
+        try:
+            _with_retries(lambda: delete_fn([file['url'] for file in batch]), f"удаление {len(batch)} файлов", retries)
+            return []
+        except Exception as e:
+            if len(batch) == 1:
+                return [(batch[0], e)]
+        failures = []
+        for file in batch:
+            try:
+                delete_fn([file['url']])
+            except Exception as e:
+                failures.append((file, e))
+        return failures
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {executor.submit(run, batch): batch for batch in batches}
+        for future in as_completed(futures):
+            batch = futures[future]
+            with lock:
+                failures = future.result()
+                failed_urls = {file['url'] for file, _ in failures}
+                report['deleted'].extend(file for file in batch if file['url'] not in failed_urls)
+                report['failed'].extend(failures)
+                status = f"❌ ошибок: {len(failures)}," if failures else "✅"
+
+                done = len(report['deleted']) + len(report['failed'])
+                print(f"[{done}/{total}] {status} пакет из {len(batch)} файлов")
+
+    report['seconds'] = time.monotonic() - started_at
+    if report['deleted']:
+        invalidate_blob_index()
+    return report
+
+def print_delete_report(report):
+    """
+    Вывести итог удаления и список файлов, которые удалить не удалось
+    """
+    print(f"🗑  Удалено: {len(report['deleted'])} за {report['seconds']:.1f} с")
+    print(f"❌ Ошибок: {len(report['failed'])}")
+    for file, error in report['failed']:
+        print(f"  ❌ {file['decoded_path']}: {error}")
@@ -3,10 +3,24 @@
 import os
 import json
 import re
+import copy
+import gzip
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from mutagen.mp3 import MP3
 from mutagen.wave import WAVE
+from mutagen.flac import FLAC
 from mutagen import MutagenError
 from dotenv import load_dotenv
+from release_versions import load_release_versions, release_blob_dir
+from audio_analysis import analysis_available, analyze_file, peaks_file_name, replaygain, ANALYSIS_WORKERS
+from blob_sync import file_sha256
+from transcode import encoder_available, transcode_file, rendition_blob_path, prune_renditions, TRANSCODE_WORKERS
+
+try:
+    import brotli
+except ImportError:  # brotli необязателен: без него пишутся только .gz
+    brotli = None
 
 # --- Конфигурация ---
 ARTIST_INFO = {
@@ -20,7 +34,43 @@ ARTIST_INFO = {
 }
 
 MUSIC_DIR = 'music'
+# playlist-data.js - небольшой индекс исполнителей (имя, аватар, описание и
+# путь к файлу релизов); сами релизы лежат в catalog/artists/<id>.<хеш>.json.
+# Хеш содержимого в имени позволяет кэшировать эти файлы навсегда, а
+# страница исполнителя загружает только свой файл.
 OUTPUT_FILE = 'playlist-data.js'
+CATALOG_DIR = 'catalog'
+ARTIST_CATALOG_DIR = os.path.join(CATALOG_DIR, 'artists')
+CATALOG_HASH_LENGTH = 10
+RELEASE_TYPES = ('albums', 'eps', 'demos')
+# Пики для волновой формы: catalog/peaks/<хеш аудио>.peaks, а также громкость
+# треков и альбомов (см. audio_analysis.py). Этап анализа выполняется,
+# только если установлены numpy и ffmpeg. Потоковые версии треков
+# (см. transcode.py) создаются, если есть ffmpeg.
+PEAKS_DIR = os.path.join(CATALOG_DIR, 'peaks')
+# Компактный режим: адреса треков и обложек хранятся без общего префикса
+# BLOB_URL (он записывается один раз в поле "base" и восстанавливается на
+# клиенте в js/catalog.js), а неиспользуемое сайтом поле originalTitle
+# не попадает в каталог. CATALOG_MINIFY=0 оставляет полные адреса.
+CATALOG_MINIFY = os.environ.get('CATALOG_MINIFY', '1') != '0'
+# Рядом с каждым файлом каталога пишутся сжатые копии .gz и .br - только
+# как артефакты сборки: по ним считается отчёт о размере, их может отдавать
+# собственный сервер (nginx gzip_static/brotli_static). Vercel сжимает
+# статику сам, поэтому копии не коммитятся и не деплоятся (.gitignore,
+# .vercelignore), а brotli не входит в requirements.txt.
+COMPRESSED_SUFFIXES = ('.gz', '.br')
+# Кэш метаданных между запусками: длительности и хеши файлов по (путь, размер,
+# mtime), громкость по хешу содержимого и готовые объекты релизов по «подписи»
+# содержимого папки релиза.
+CACHE_FILE = '.playlist-cache.json'
+CACHE_VERSION = 1
+# Число процессов для чтения метаданных аудио (по умолчанию - по числу ядер)
+WORKERS = int(os.environ.get('PLAYLIST_WORKERS', os.cpu_count() or 1))
+# Аудиофайлы, которые попадают в каталог. FLAC играет через потоковые
+# версии mp3 (см. transcode.py), оригинал - только запасной вариант.
+# .m4a и .ogg upload_album.py загружает, но в каталог они не входят:
+# для них не делаются потоковые версии, а Safari не играет ogg.
+AUDIO_EXTENSIONS = ('.mp3', '.wav', '.flac')
 # --- Конец конфигурации ---
 
 def natural_sort_key(s):
@@ -30,6 +80,7 @@ def get_audio_duration(file_path):
     try:
         if file_path.lower().endswith('.mp3'): audio = MP3(file_path)
         elif file_path.lower().endswith('.wav'): audio = WAVE(file_path)
+        elif file_path.lower().endswith('.flac'): audio = FLAC(file_path)
         else: return 0
         return int(audio.info.length)
     except Exception as e:
@@ -48,6 +99,339 @@ def parse_track_number_and_title(filename):
             return num, re.sub(r'^[\s\.\-_]+', '', clean_title), original_title
     return None, title, original_title
 
+def load_cache(blob_base_url):
+    """Загружает кэш сборки. Кэш другой версии или для другого BLOB_URL игнорируется."""
+    empty = {"version": CACHE_VERSION, "blob_base_url": blob_base_url, "files": {}, "releases": {}, "loudness": {}, "renditions": {}}
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return empty
+    if cache.get("version") != CACHE_VERSION or cache.get("blob_base_url") != blob_base_url:
+        return empty
+    cache.setdefault("loudness", {})
+    cache.setdefault("renditions", {})
+    return cache
+
+def save_cache(cache):
+    """Атомарно сохраняет кэш сборки."""
+    tmp_file = CACHE_FILE + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False)
+    os.replace(tmp_file, CACHE_FILE)
+
+def release_signature(release_path):
+    """
+    Подпись папки релиза: имя, размер и mtime каждого файла (только stat, без
+    чтения). Набор AUDIO_EXTENSIONS тоже входит в подпись - при его изменении
+    релизы пересобираются.
+    """
+    signature = []
+    with os.scandir(release_path) as entries:
+        for entry in entries:
+            if entry.is_file():
+                stat = entry.stat()
+                signature.append([entry.name, stat.st_size, stat.st_mtime_ns])
+    return [list(AUDIO_EXTENSIONS)] + sorted(signature)
+
+def get_cached_duration(file_path, cache):
+    """Длительность из кэша, если размер и mtime файла не изменились; иначе читает файл."""
+    stat = os.stat(file_path)
+    key = file_path.replace("\\", "/")
+    entry = cache["files"].get(key)
+    if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return entry["duration"]
+    duration = get_audio_duration(file_path)
+    cache["files"][key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "duration": duration}
+    return duration
+
+def prefetch_durations(release_paths, cache, workers=WORKERS):
+    """
+    Заранее читает длительности всех файлов, которых нет в кэше, параллельно.
+
+    Разбор файлов mutagen - чистый Python, поэтому используются процессы,
+    а не потоки. Результаты попадают в кэш, и последующая сборка релизов
+    идёт уже только по кэшу, в прежнем детерминированном порядке.
+    """
+    pending = []
+    for release_path in release_paths:
+        for f in sorted(os.listdir(release_path), key=natural_sort_key):
+            if not f.lower().endswith(AUDIO_EXTENSIONS):
+                continue
+            file_path = os.path.join(release_path, f)
+            stat = os.stat(file_path)
+            entry = cache["files"].get(file_path.replace("\\", "/"))
+            if not (entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns):
+                pending.append((file_path, stat))
+
+    if not pending:
+        return
+
+    paths = [file_path for file_path, _ in pending]
+    print(f"Читаю метаданные {len(paths)} файлов (процессов: {workers})...")
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            durations = list(executor.map(get_audio_duration, paths, chunksize=4))
+    else:
+        durations = [get_audio_duration(file_path) for file_path in paths]
+
+    for (file_path, stat), duration in zip(pending, durations):
+        cache["files"][file_path.replace("\\", "/")] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "duration": duration}
+
+def _analysis_job(args):
+    file_path, sha256, need_peaks, need_loudness = args
+    return analyze_file(file_path, sha256, PEAKS_DIR, need_peaks, need_loudness)
+
+def _map_in_workers(function, items, workers):
+    if workers > 1 and len(items) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(function, items))
+    return [function(item) for item in items]
+
+def release_audio_paths(release_paths):
+    audio_paths = []
+    for release_path in release_paths:
+        for f in sorted(os.listdir(release_path), key=natural_sort_key):
+            if f.lower().endswith(AUDIO_EXTENSIONS):
+                audio_paths.append(os.path.join(release_path, f))
+    return audio_paths
+
+def prefetch_hashes(audio_paths, cache, workers=WORKERS):
+    """
+    Хеши содержимого файлов, которых ещё нет в кэше. Хеш запоминается по
+    (путь, размер, mtime), а результаты анализа и перекодирования
+    привязаны к нему, поэтому переименованный или скопированный трек
+    повторно не обрабатывается.
+    """
+    unhashed = [path for path in audio_paths if "sha256" not in cache["files"][path.replace("\\", "/")]]
+    for file_path, sha256 in zip(unhashed, _map_in_workers(file_sha256, unhashed, workers)):
+        cache["files"][file_path.replace("\\", "/")]["sha256"] = sha256
+
+def prefetch_analysis(audio_paths, cache, features, workers=ANALYSIS_WORKERS):
+    """
+    Считает пики и громкость аудиофайлов, которых ещё нет в кэше.
+
+    Громкость хранится в cache["loudness"] по хешу содержимого, пики - в
+    файле с хешем в имени. Декодирование - самая дорогая часть сборки,
+    поэтому каждый файл декодируется один раз для всех этапов, а файлы
+    обрабатываются параллельно в процессах.
+    """
+    pending = []
+    scheduled = set()
+    for file_path in audio_paths:
+        sha256 = cache["files"][file_path.replace("\\", "/")]["sha256"]
+        need_peaks = features["peaks"] and not os.path.exists(os.path.join(PEAKS_DIR, peaks_file_name(sha256)))
+        need_loudness = features["loudness"] and sha256 not in cache["loudness"]
+        if (need_peaks or need_loudness) and sha256 not in scheduled:
+            pending.append((file_path, sha256, need_peaks, need_loudness))
+            scheduled.add(sha256)
+
+    if not pending:
+        return
+
+    os.makedirs(PEAKS_DIR, exist_ok=True)
+    print(f"Анализирую аудио {len(pending)} файлов (процессов: {workers})...")
+    for (file_path, sha256, need_peaks, need_loudness), result in zip(pending, _map_in_workers(_analysis_job, pending, workers)):
+        if need_loudness:
+            cache["loudness"][sha256] = result["loudness"]
+
+def prefetch_renditions(audio_paths, cache, workers=TRANSCODE_WORKERS):
+    """
+    Создаёт потоковые версии (низкий и высокий битрейт) для файлов, у
+    которых их ещё нет. Список готовых версий хранится в cache["renditions"]
+    по хешу исходника; кодирует ffmpeg в отдельных процессах, поэтому
+    для параллельности достаточно потоков.
+
+    Returns:
+        Хеши исходников, часть версий которых создать не удалось. Их
+        готовые версии попадают в текущую сборку, но не остаются в кэше,
+        чтобы следующая сборка повторила перекодирование.
+    """
+    pending = {}
+    for file_path in audio_paths:
+        sha256 = cache["files"][file_path.replace("\\", "/")]["sha256"]
+        if sha256 not in cache["renditions"] and sha256 not in pending:
+            pending[sha256] = file_path
+
+    incomplete = set()
+    if not pending:
+        return incomplete
+
+    print(f"Перекодирую {len(pending)} файлов в потоковые версии (потоков: {workers})...")
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        results = executor.map(lambda item: transcode_file(item[1], item[0]), pending.items())
+        for sha256, (ready, failed) in zip(pending, results):
+            cache["renditions"][sha256] = ready
+            if failed:
+                incomplete.add(sha256)
+    return incomplete
+
+def prune_peaks(cache):
+    """Удаляет файлы пиков, на которые не ссылается ни один трек."""
+    referenced = {peaks_file_name(entry["sha256"]) for entry in cache["files"].values() if "sha256" in entry}
+    if os.path.isdir(PEAKS_DIR):
+        for file_name in os.listdir(PEAKS_DIR):
+            if file_name not in referenced:
+                os.remove(os.path.join(PEAKS_DIR, file_name))
+
+def build_release(release_folder_name, release_path, blob_dir, blob_base_url, cache):
+    """Собирает объект релиза (обложка и треки) по содержимому папки; blob_dir - папка релиза в Blob."""
+    album_obj = {"name": release_folder_name, "cover": None, "tracks": []}
+    track_files = sorted(os.listdir(release_path), key=natural_sort_key)
+    audio_files = [f for f in track_files if f.lower().endswith(AUDIO_EXTENSIONS)]
+    album_loudness = []
+
+    for f in track_files:
+        # ✅ ИСПРАВЛЕНИЕ: Формируем путь, идентичный тому, что был загружен в Blob
+        blob_file_path = f"{blob_dir}/{f}"
+        url_path = f"{blob_base_url}/{blob_file_path}"
+        
+        if f.lower() == 'cover.jpg':
+            album_obj["cover"] = url_path
+        elif f.lower().endswith(AUDIO_EXTENSIONS):
+            parsed_num, clean_title, original_title = parse_track_number_and_title(f)
+            track_num = parsed_num if parsed_num is not None else audio_files.index(f) + 1
+            duration = get_cached_duration(os.path.join(release_path, f), cache)
+            track = {"num": track_num, "title": clean_title, "originalTitle": original_title, "file": url_path, "duration": duration}
+            sha256 = cache["files"][os.path.join(release_path, f).replace("\\", "/")].get("sha256")
+            if sha256 and os.path.exists(os.path.join(PEAKS_DIR, peaks_file_name(sha256))):
+                track["peaks"] = f"{CATALOG_DIR}/peaks/{peaks_file_name(sha256)}"
+            # Облегчённые версии для потокового воспроизведения (оригинал остаётся в "file")
+            renditions = cache["renditions"].get(sha256)
+            if renditions:
+                track["renditions"] = {name: f"{blob_base_url}/{rendition_blob_path(sha256, name)}" for name in renditions}
+            # Нормализация громкости на клиенте: усиление трека (дБ) и его пик
+            loudness = cache["loudness"].get(sha256)
+            track_gain = replaygain([loudness])
+            if track_gain:
+                track["gain"], track["peak"] = track_gain["gain"], track_gain["peak"]
+            album_loudness.append(loudness)
+            album_obj["tracks"].append(track)
+    
+    album_gain = replaygain(album_loudness)
+    if album_gain:
+        album_obj["gain"], album_obj["peak"] = album_gain["gain"], album_gain["peak"]
+    if album_obj["tracks"]: album_obj["tracks"].sort(key=lambda x: x["num"])
+    return album_obj
+
+def write_file_atomic(path, content):
+    tmp_file = path + '.tmp'
+    with open(tmp_file, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_file, path)
+
+def file_has_content(path, content):
+    if not os.path.exists(path):
+        return False
+    with open(path, 'rb') as f:
+        return f.read() == content
+
+def write_compressed_variants(path, content):
+    """
+    Пишет рядом с файлом сжатые копии; возвращает размеры {'raw', 'gz', 'br'}.
+
+    Копия, которая новее исходного файла, не пересжимается: у файлов с хешем
+    в имени содержимое не меняется, а сжатие brotli с quality=11 дорогое.
+    """
+    sizes = {'raw': len(content)}
+    source_mtime = os.path.getmtime(path)
+    compressors = [('gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        compressors.append(('br', lambda data: brotli.compress(data, quality=11)))
+    for suffix, compress in compressors:
+        compressed_path = f"{path}.{suffix}"
+        if os.path.exists(compressed_path) and os.path.getmtime(compressed_path) >= source_mtime:
+            sizes[suffix] = os.path.getsize(compressed_path)
+            continue
+        compressed = compress(content)
+        write_file_atomic(compressed_path, compressed)
+        sizes[suffix] = len(compressed)
+    return sizes
+
+def strip_base_url(url, blob_base_url):
+    prefix = blob_base_url + '/'
+    return url[len(prefix):] if url and url.startswith(prefix) else url
+
+def minify_track(track, blob_base_url):
+    minified = {key: value for key, value in track.items() if key != "originalTitle"}
+    minified["file"] = strip_base_url(track["file"], blob_base_url)
+    if "renditions" in track:
+        minified["renditions"] = {name: strip_base_url(url, blob_base_url) for name, url in track["renditions"].items()}
+    return minified
+
+def minify_artist(artist, blob_base_url):
+    """Копия данных исполнителя без повторяющегося префикса BLOB_URL и лишних полей."""
+    minified = {key: value for key, value in artist.items() if key not in RELEASE_TYPES}
+    minified["base"] = blob_base_url
+    for release_type in RELEASE_TYPES:
+        minified[release_type] = [
+            {
+                **release,
+                "cover": strip_base_url(release["cover"], blob_base_url),
+                "tracks": [
+                    minify_track(track, blob_base_url)
+                    for track in release["tracks"]
+                ],
+            }
+            for release in artist.get(release_type, [])
+        ]
+    return minified
+
+def print_size_report(sizes):
+    """Таблица размеров файлов каталога: исходный, gzip и brotli."""
+    print("\nРазмер каталога (байт):")
+    print(f"  {'файл':<48} {'raw':>8} {'gzip':>8} {'brotli':>8}")
+    totals = {'raw': 0, 'gz': 0, 'br': 0}
+    for path, file_sizes in sizes:
+        for key in totals:
+            totals[key] += file_sizes.get(key, 0)
+        br_size = file_sizes.get('br', '-')
+        print(f"  {path:<48} {file_sizes['raw']:>8} {file_sizes['gz']:>8} {br_size:>8}")
+    br_total = totals['br'] if brotli is not None else '-'
+    print(f"  {'ИТОГО':<48} {totals['raw']:>8} {totals['gz']:>8} {br_total:>8}")
+    if brotli is None:
+        print("  (brotli не установлен - файлы .br не созданы)")
+
+def write_catalog(artist_data, blob_base_url, minify=CATALOG_MINIFY):
+    """
+    Записывает индекс исполнителей в OUTPUT_FILE и по минифицированному
+    JSON-файлу с релизами на каждого исполнителя, а также их сжатые
+    копии. Файлы прежних сборок, на которые индекс больше не ссылается,
+    удаляются.
+    """
+    os.makedirs(ARTIST_CATALOG_DIR, exist_ok=True)
+    catalog_index = {}
+    current_files = set()
+    sizes = []
+
+    for artist_id, artist in artist_data.items():
+        catalog_artist = minify_artist(artist, blob_base_url) if minify else artist
+        body = json.dumps(catalog_artist, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        digest = hashlib.sha256(body).hexdigest()[:CATALOG_HASH_LENGTH]
+        file_name = f"{artist_id}.{digest}.json"
+        file_path = os.path.join(ARTIST_CATALOG_DIR, file_name)
+        # Одинаковое имя - одинаковое содержимое, исходный файл не перезаписываем
+        if not os.path.exists(file_path):
+            write_file_atomic(file_path, body)
+        sizes.append((file_path.replace("\\", "/"), write_compressed_variants(file_path, body)))
+        current_files.add(file_name)
+        current_files.update(file_name + suffix for suffix in COMPRESSED_SUFFIXES)
+
+        catalog_index[artist_id] = {key: value for key, value in artist.items() if key not in RELEASE_TYPES}
+        catalog_index[artist_id]["catalog"] = f"{CATALOG_DIR}/artists/{file_name}"
+
+    for file_name in os.listdir(ARTIST_CATALOG_DIR):
+        if file_name not in current_files:
+            os.remove(os.path.join(ARTIST_CATALOG_DIR, file_name))
+
+    index_json = json.dumps(catalog_index, ensure_ascii=False, separators=(',', ':'))
+    index_body = f"window.catalogIndex = {index_json};".encode('utf-8')
+    # Неизменившийся индекс не перезаписываем - иначе пришлось бы пересжимать
+    if not file_has_content(OUTPUT_FILE, index_body):
+        write_file_atomic(OUTPUT_FILE, index_body)
+    sizes.insert(0, (OUTPUT_FILE, write_compressed_variants(OUTPUT_FILE, index_body)))
+    print_size_report(sizes)
+
 def create_playlist_data():
     BLOB_BASE_URL = os.environ.get('BLOB_URL', '').rstrip('/')
     if not BLOB_BASE_URL:
@@ -55,12 +439,54 @@ def create_playlist_data():
         return
 
     artist_data = {}
+    cache = load_cache(BLOB_BASE_URL)
+    versions = load_release_versions()
+    reused_count = rebuilt_count = 0
+    seen_releases = set()
     print(f"Сканирую директорию: {MUSIC_DIR}")
 
     if not os.path.exists(MUSIC_DIR):
         print(f"ОШИБКА: Директория {MUSIC_DIR} не найдена.")
         return
 
+    # Какие этапы анализа аудио доступны; релизы, собранные с другим
+    # набором, пересобираются
+    analysis = analysis_available()
+    features = {"peaks": analysis, "loudness": analysis, "renditions": encoder_available()}
+    if not analysis:
+        print("numpy или ffmpeg не найдены - пики и громкость треков не считаются.")
+    if not features["renditions"]:
+        print("ffmpeg не найден - потоковые версии треков не создаются.")
+
+    # Этап 1: подписи релизов и параллельное чтение метаданных изменившихся файлов
+    signatures = {}
+    for artist_id in sorted(os.listdir(MUSIC_DIR)):
+        artist_path = os.path.join(MUSIC_DIR, artist_id)
+        if os.path.isdir(artist_path):
+            for release_folder_name in sorted(os.listdir(artist_path)):
+                release_path = os.path.join(artist_path, release_folder_name)
+                if os.path.isdir(release_path):
+                    signatures[release_path] = release_signature(release_path)
+
+    def is_cached(release_path):
+        cached_release = cache["releases"].get(release_path.replace("\\", "/"))
+        return (cached_release is not None
+                and cached_release["signature"] == signatures[release_path]
+                and cached_release.get("blob_dir") == release_blob_dir(release_path, versions)
+                and cached_release.get("features") == features)
+
+    changed_releases = [release_path for release_path in signatures if not is_cached(release_path)]
+    incomplete_renditions = set()
+    prefetch_durations(changed_releases, cache)
+    if any(features.values()):
+        audio_paths = release_audio_paths(changed_releases)
+        prefetch_hashes(audio_paths, cache)
+        if features["peaks"] or features["loudness"]:
+            prefetch_analysis(audio_paths, cache, features)
+        if features["renditions"]:
+            incomplete_renditions = prefetch_renditions(audio_paths, cache)
+
+    # Этап 2: сборка данных в прежнем порядке
     for artist_id in sorted(os.listdir(MUSIC_DIR)):
         artist_path = os.path.join(MUSIC_DIR, artist_id)
         if os.path.isdir(artist_path):
@@ -69,24 +495,24 @@ def create_playlist_data():
             for release_folder_name in sorted(os.listdir(artist_path)):
                 release_path = os.path.join(artist_path, release_folder_name)
                 if os.path.isdir(release_path):
-                    album_obj = {"name": release_folder_name, "cover": None, "tracks": []}
-                    track_files = sorted(os.listdir(release_path), key=natural_sort_key)
-                    audio_files = [f for f in track_files if f.lower().endswith(('.mp3', '.wav'))]
-
-                    for f in track_files:
-                        # ✅ ИСПРАВЛЕНИЕ: Формируем путь, идентичный тому, что был загружен в Blob
-                        blob_file_path = os.path.join(MUSIC_DIR, artist_id, release_folder_name, f).replace("\\", "/")
-                        url_path = f"{BLOB_BASE_URL}/{blob_file_path}"
-                        
-                        if f.lower() == 'cover.jpg':
-                            album_obj["cover"] = url_path
-                        elif f.lower().endswith(('.mp3', '.wav')):
-                            parsed_num, clean_title, original_title = parse_track_number_and_title(f)
-                            track_num = parsed_num if parsed_num is not None else audio_files.index(f) + 1
-                            duration = get_audio_duration(os.path.join(release_path, f))
-                            album_obj["tracks"].append({"num": track_num, "title": clean_title, "originalTitle": original_title, "file": url_path, "duration": duration})
-                    
-                    if album_obj["tracks"]: album_obj["tracks"].sort(key=lambda x: x["num"])
+                    # Релиз без изменений берём из кэша целиком, не открывая файлы
+                    release_key = release_path.replace("\\", "/")
+                    signature = signatures[release_path]
+                    # Заменённый релиз лежит в Blob в папке своей версии
+                    blob_dir = release_blob_dir(release_path, versions)
+                    if is_cached(release_path):
+                        album_obj = copy.deepcopy(cache["releases"][release_key]["album"])
+                        reused_count += 1
+                    else:
+                        print(f"    Обновляю релиз: {artist_id}/{release_folder_name}")
+                        album_obj = build_release(release_folder_name, release_path, blob_dir, BLOB_BASE_URL, cache)
+                        # Релиз с недоделанными потоковыми версиями не кэшируется -
+                        # следующая сборка пересоберёт его и повторит перекодирование
+                        release_hashes = {cache["files"][path.replace("\\", "/")].get("sha256") for path in release_audio_paths([release_path])}
+                        if not release_hashes & incomplete_renditions:
+                            cache["releases"][release_key] = {"signature": signature, "blob_dir": blob_dir, "features": features, "album": copy.deepcopy(album_obj)}
+                        rebuilt_count += 1
+                    seen_releases.add(release_key)
                     
                     type_assigned = False
                     if release_folder_name.lower().startswith('album.'):
@@ -105,9 +531,21 @@ def create_playlist_data():
                     if not type_assigned:
                          print(f"      ПРЕДУПРЕЖДЕНИЕ: Папка '{release_folder_name}' не имеет корректного префикса. Пропущена.")
 
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        f.write(f"window.artistData = {json.dumps(artist_data, indent=4, ensure_ascii=False)};")
-    print(f"\nГотово! Файл '{OUTPUT_FILE}' успешно обновлен с корректными URL из Vercel Blob.")
+    # Удаляем из кэша релизы и файлы, которых больше нет на диске
+    cache["releases"] = {k: v for k, v in cache["releases"].items() if k in seen_releases}
+    cache["files"] = {k: v for k, v in cache["files"].items() if os.path.dirname(k) in seen_releases}
+    hashes = {entry["sha256"] for entry in cache["files"].values() if "sha256" in entry}
+    cache["loudness"] = {k: v for k, v in cache["loudness"].items() if k in hashes}
+    cache["renditions"] = {k: v for k, v in cache["renditions"].items() if k in hashes and k not in incomplete_renditions}
+    save_cache(cache)
+    if features["peaks"]:
+        prune_peaks(cache)
+    if features["renditions"]:
+        prune_renditions(hashes)
+    print(f"Релизов из кэша: {reused_count}, пересобрано: {rebuilt_count}")
+
+    write_catalog(artist_data, BLOB_BASE_URL)
+    print(f"\nГотово! Индекс '{OUTPUT_FILE}' и релизы исполнителей в '{ARTIST_CATALOG_DIR}' успешно обновлены с корректными URL из Vercel Blob.")
 
 if __name__ == '__main__':
     print("Загрузка переменных окружения из .env.development.local...")
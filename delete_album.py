@@ -2,9 +2,9 @@
 
 import os
 import dotenv
-from vercel_blob import list as blob_list, delete
 from dotenv import load_dotenv
-import urllib.parse
+from blob_index import load_blob_index
+from blob_transfer import delete_files, print_delete_report
 
 # Загрузка переменных окружения
 dotenv.load_dotenv('.env.development.local')
@@ -14,22 +14,7 @@ def find_album_files_in_blob(artist_name, album_name):
     Найти все файлы альбома в blob
     """
     try:
-        blobs = blob_list({'limit': '1000'})
-        album_files = []
-        
-        for blob in blobs['blobs']:
-            decoded_path = urllib.parse.unquote(blob['pathname'])
-            
-            # Проверяем, содержит ли путь имя исполнителя и альбома
-            if artist_name.lower() in decoded_path.lower() and album_name.lower() in decoded_path.lower():
-                album_files.append({
-                    'pathname': blob['pathname'],
-                    'decoded_path': decoded_path,
-                    'url': blob['url'],
-                    'size': blob['size']
-                })
-        
-        return album_files
+        return load_blob_index().release_files(artist_name, album_name)
     except Exception as e:
         print(f"❌ Ошибка поиска альбома: {e}")
         return []
@@ -41,18 +26,7 @@ def delete_album_by_pattern(search_pattern):
     print(f"--- Удаление файлов по паттерну: '{search_pattern}' ---")
     
     try:
-        blobs = blob_list({'limit': '1000'})
-        matching_files = []
-        
-        for blob in blobs['blobs']:
-            decoded_path = urllib.parse.unquote(blob['pathname'])
-            
-            if search_pattern.lower() in decoded_path.lower():
-                matching_files.append({
-                    'pathname': blob['pathname'],
-                    'decoded_path': decoded_path,
-                    'url': blob['url']
-                })
+        matching_files = load_blob_index().search(search_pattern)
         
         if not matching_files:
             print(f"❌ Файлы не найдены по паттерну '{search_pattern}'")
@@ -68,15 +42,10 @@ def delete_album_by_pattern(search_pattern):
             print("❌ Удаление отменено")
             return False
         
-        # Удаляем файлы
-        deleted_count = 0
-        for file in matching_files:
-            try:
-                delete(file['url'])
-                print(f"✅ Удален: {file['decoded_path']}")
-                deleted_count += 1
-            except Exception as e:
-                print(f"❌ Ошибка удаления {file['decoded_path']}: {e}")
+        # Удаляем файлы пакетами, несколько пакетов параллельно
+        report = delete_files(matching_files)
+        print_delete_report(report)
+        deleted_count = len(report['deleted'])
         
         print(f"\n✅ Удалено {deleted_count} из {len(matching_files)} файлов")
         return deleted_count > 0
@@ -109,15 +78,10 @@ def delete_album(artist_name, album_name):
         print("❌ Удаление отменено")
         return False
     
-    # Удаляем все файлы альбома
-    deleted_count = 0
-    for file in album_files:
-        try:
-            delete(file['url'])
-            print(f"✅ Удален: {file['decoded_path']}")
-            deleted_count += 1
-        except Exception as e:
-            print(f"❌ Ошибка удаления {file['decoded_path']}: {e}")
+    # Удаляем файлы пакетами, несколько пакетов параллельно
+    report = delete_files(album_files)
+    print_delete_report(report)
+    deleted_count = len(report['deleted'])
     
     print(f"\n✅ Удалено {deleted_count} из {len(album_files)} файлов")
     print("=== УДАЛЕНИЕ ЗАВЕРШЕНО ===")
@@ -130,22 +94,11 @@ def list_albums():
     print("=== СПИСОК АЛЬБОМОВ В BLOB ===")
     
     try:
-        blobs = blob_list({'limit': '1000'})
-        albums = set()
-        
-        for blob in blobs['blobs']:
-            decoded_path = urllib.parse.unquote(blob['pathname'])
-            
-            # Пытаемся извлечь исполнителя и альбом из пути
-            parts = decoded_path.split('/')
-            if len(parts) >= 3 and parts[0] == 'music':
-                artist = parts[1]
-                album = parts[2] if len(parts) > 2 else 'Unknown Album'
-                albums.add(f"{artist} - {album}")
+        albums = [f"{artist} - {album}" for artist, album in load_blob_index().releases()]
         
         if albums:
             print(f"Найдено {len(albums)} альбомов:")
-            for album in sorted(albums):
+            for album in albums:
                 print(f"  - {album}")
         else:
             print("❌ Альбомы не найдены")
@@ -51,6 +51,7 @@ document.addEventListener('DOMContentLoaded', () => {
     const prevBtn = document.getElementById('prev-btn');
     const nextBtn = document.getElementById('next-btn');
     const progressBar = document.getElementById('progress-bar');
+    const waveform = document.getElementById('waveform');
     const currentTimeEl = document.getElementById('current-time');
     const durationEl = document.getElementById('duration');
     const currentTrackTitleEl = document.getElementById('current-track-title');
@@ -59,6 +60,7 @@ document.addEventListener('DOMContentLoaded', () => {
     let allTracks = [];
     let currentTrackIndex = -1; // Начинаем с -1, чтобы первая загрузка была корректной
     let isPlaying = false;
+    let usingFallback = false; // Играет ли оригинал вместо недоступной потоковой версии
 
     // --- НОВЫЙ БЛОК: Состояние для расширенной аналитики ---
     let listenCounted = false; // Флаг для события '30s_listen'
@@ -75,21 +77,13 @@ document.addEventListener('DOMContentLoaded', () => {
         // Убеждаемся, что у нас есть трек для отправки данных
         if (!currentTrackForAnalytics || !currentTrackForAnalytics.file) return;
         
-        try {
-            // Отправляем POST-запрос на наш основной API-эндпоинт
-            await fetch('/api/listen', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    trackId: currentTrackForAnalytics.file,
-                    eventType: eventType,
-                    proxyUsed: useProxyForTracks // Добавить информацию о proxy
-                }),
-            });
-            console.log(`Analytics Event: '${eventType}' sent (proxy: ${useProxyForTracks})`);
-        } catch (error) {
-            console.error(`Failed to log analytics event '${eventType}':`, error);
-        }
+        // События копятся в очереди и уходят на сервер пакетами
+        AnalyticsQueue.track({
+            trackId: currentTrackForAnalytics.file,
+            eventType: eventType,
+            proxyUsed: useProxyForTracks // Добавить информацию о proxy
+        });
+        console.log(`Analytics Event: '${eventType}' queued (proxy: ${useProxyForTracks})`);
     };
     
     // --- Утилита форматирования времени (без изменений) ---
@@ -99,19 +93,32 @@ document.addEventListener('DOMContentLoaded', () => {
         return `${m}:${sec < 10 ? '0' : ''}${sec}`;
     };
 
-    // 1. Сбор и перемешивание всех треков (без изменений)
-    if (typeof window.artistData !== 'undefined') {
-        Object.values(window.artistData).forEach(artist => {
-            ['albums', 'eps', 'demos'].forEach(type => {
-                (artist[type] || []).forEach(release => {
-                    release.tracks.forEach(track => {
-                        allTracks.push({ ...track, artistName: artist.name });
+    // 1. Сбор и перемешивание всех треков.
+    // Релизы исполнителей загружаются только при первом нажатии на кнопку,
+    // чтобы не тянуть весь каталог при открытии главной страницы.
+    let tracksLoading = null;
+    const loadAllTracks = () => {
+        if (!tracksLoading) {
+            tracksLoading = Catalog.loadAll()
+                .then(artists => {
+                    Object.values(artists).forEach(artist => {
+                        ['albums', 'eps', 'demos'].forEach(type => {
+                            (artist[type] || []).forEach(release => {
+                                release.tracks.forEach(track => {
+                                    allTracks.push({ ...track, artistName: artist.name });
+                                });
+                            });
+                        });
                     });
+                    allTracks.sort(() => 0.5 - Math.random());
+                })
+                .catch(error => {
+                    console.error('Failed to load catalog:', error);
+                    tracksLoading = null;
                 });
-            });
-        });
-        allTracks.sort(() => 0.5 - Math.random());
-    }
+        }
+        return tracksLoading;
+    };
 
     // === ОБНОВЛЕНО: Функции управления плеером с поддержкой прокси ===
     const originalLoadTrack = (index) => {
@@ -122,9 +129,13 @@ document.addEventListener('DOMContentLoaded', () => {
             // Применяем proxy URL если нужно
             const trackUrl = getTrackUrlForPlayback(track);
             
-            audio.src = trackUrl;
+            // Без прокси играем облегчённую потоковую версию, если она есть
+            audio.src = useProxyForTracks ? trackUrl : Catalog.streamUrl(track);
+            usingFallback = false;
+            audio.volume = Catalog.trackVolume(track);
             currentTrackTitleEl.textContent = `${track.title} - ${track.artistName}`;
             audio.load();
+            Catalog.showWaveform(waveform, track);
         }
     };
 
@@ -170,8 +181,9 @@ document.addEventListener('DOMContentLoaded', () => {
         play(); 
     };
 
-    // 3. Обработчики событий для кнопки в шапке (без изменений)
-    playRandomBtn.addEventListener('click', () => {
+    // 3. Обработчики событий для кнопки в шапке
+    playRandomBtn.addEventListener('click', async () => {
+        await loadAllTracks();
         if (allTracks.length > 0) {
             if (isPlaying) {
                 pause();
@@ -211,6 +223,17 @@ document.addEventListener('DOMContentLoaded', () => {
         originalPlayNext(); // Переходим к следующему
     });
 
+    audio.addEventListener('error', () => {
+        // Потоковая версия могла ещё не попасть в Blob - играем оригинал
+        const track = allTracks[currentTrackIndex];
+        if (track && !usingFallback && track.renditions) {
+            usingFallback = true;
+            audio.src = getTrackUrlForPlayback(track);
+            audio.load();
+            audio.play().catch(() => {});
+        }
+    });
+
     audio.addEventListener('loadedmetadata', () => { 
         if (audio.duration) durationEl.textContent = formatTime(audio.duration); 
     });
@@ -218,6 +241,7 @@ document.addEventListener('DOMContentLoaded', () => {
     audio.addEventListener('timeupdate', () => {
         if (audio.duration) {
             progressBar.value = (audio.currentTime / audio.duration) * 100 || 0;
+            Catalog.drawWaveform(waveform, audio.currentTime / audio.duration);
             currentTimeEl.textContent = formatTime(audio.currentTime);
         }
         
@@ -0,0 +1,62 @@
+// js/analytics-queue.js
+// Копит события аналитики и отправляет их в /api/listen пакетами,
+// вместо отдельного запроса на каждое событие.
+const AnalyticsQueue = {
+  endpoint: '/api/listen',
+  maxBatchSize: 20,      // Сервер принимает до 50 событий за запрос
+  flushInterval: 10000,  // мс
+  queue: [],
+  timer: null,
+
+  track(event) {
+    this.queue.push({ ...event, timestamp: Date.now() });
+
+    if (this.queue.length >= this.maxBatchSize) {
+      this.flush();
+    } else if (!this.timer) {
+      this.timer = setTimeout(() => this.flush(), this.flushInterval);
+    }
+  },
+
+  async flush() {
+    clearTimeout(this.timer);
+    this.timer = null;
+    if (this.queue.length === 0) return;
+
+    const batch = this.queue.splice(0, this.maxBatchSize);
+    try {
+      const response = await fetch(this.endpoint, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ events: batch }),
+        keepalive: true
+      });
+      console.log(`Analytics: batch of ${batch.length} event(s) sent (status ${response.status})`);
+    } catch (error) {
+      // Сеть недоступна - возвращаем события в начало очереди
+      console.error('Failed to send analytics batch:', error);
+      this.queue.unshift(...batch);
+    }
+
+    if (this.queue.length > 0 && !this.timer) {
+      this.timer = setTimeout(() => this.flush(), this.flushInterval);
+    }
+  },
+
+  // При уходе со страницы fetch может не успеть - используем sendBeacon
+  flushOnExit() {
+    while (this.queue.length > 0) {
+      const batch = this.queue.splice(0, this.maxBatchSize);
+      const body = JSON.stringify({ events: batch });
+      if (!navigator.sendBeacon || !navigator.sendBeacon(this.endpoint, body)) {
+        fetch(this.endpoint, { method: 'POST', headers: { 'Content-Type': 'application/json' }, body, keepalive: true })
+          .catch(() => {});
+      }
+    }
+  }
+};
+
+document.addEventListener('visibilitychange', () => {
+  if (document.visibilityState === 'hidden') AnalyticsQueue.flushOnExit();
+});
+window.addEventListener('pagehide', () => AnalyticsQueue.flushOnExit());
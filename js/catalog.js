@@ -0,0 +1,150 @@
+// js/catalog.js
+// Каталог исполнителей: индекс (имя, аватар, описание) приходит из
+// playlist-data.js, а релизы исполнителя загружаются по требованию
+// из catalog/artists/<id>.<хеш>.json. Каждый файл запрашивается один раз.
+const Catalog = {
+  artists: window.catalogIndex || {},
+  requests: {},
+
+  has(artistId) {
+    return Object.prototype.hasOwnProperty.call(this.artists, artistId);
+  },
+
+  // Полные данные исполнителя: поля индекса + albums/eps/demos
+  loadArtist(artistId) {
+    if (!this.has(artistId)) return Promise.resolve(null);
+
+    if (!this.requests[artistId]) {
+      this.requests[artistId] = fetch(this.artists[artistId].catalog)
+        .then(response => {
+          if (!response.ok) throw new Error(`HTTP ${response.status}`);
+          return response.json();
+        })
+        .then(artist => this.expandUrls(artist))
+        .catch(error => {
+          // Следующий вызов попробует загрузить файл заново
+          delete this.requests[artistId];
+          throw error;
+        });
+    }
+    return this.requests[artistId];
+  },
+
+  // В компактном каталоге адреса треков и обложек хранятся без общего
+  // префикса Blob - он записан один раз в поле base
+  expandUrls(artist) {
+    if (!artist.base) return artist;
+    const resolve = (url) => (url && !/^https?:\/\//.test(url) ? `${artist.base}/${url}` : url);
+    ['albums', 'eps', 'demos'].forEach(type => {
+      (artist[type] || []).forEach(release => {
+        release.cover = resolve(release.cover);
+        release.tracks.forEach(track => {
+          track.file = resolve(track.file);
+          if (track.renditions) {
+            Object.keys(track.renditions).forEach(name => { track.renditions[name] = resolve(track.renditions[name]); });
+          }
+        });
+      });
+    });
+    return artist;
+  },
+
+  // Потоковая версия трека: 'low' при медленной сети или режиме экономии
+  // трафика, иначе 'high'. Если нужной версии нет, играет оригинал
+  // (у mp3-исходников 'high' не создаётся - оригинал и есть высокое качество).
+  preferredRendition() {
+    const connection = navigator.connection;
+    if (connection && (connection.saveData || ['slow-2g', '2g', '3g'].includes(connection.effectiveType))) {
+      return 'low';
+    }
+    return 'high';
+  },
+
+  streamUrl(track) {
+    const renditions = track.renditions || {};
+    const preferred = this.preferredRendition();
+    return renditions[preferred] || (preferred === 'low' && renditions.high) || track.file;
+  },
+
+  // Громкость воспроизведения для выравнивания треков по громкости.
+  // gain в каталоге - усиление до -18 LUFS (ReplayGain 2.0); audio.volume
+  // умеет только ослаблять, поэтому целевой уровень поднят на preampDb,
+  // а тихие треки играют на полной громкости. Пик не выходит за 1.0.
+  preampDb: 8,
+
+  trackVolume(track) {
+    if (typeof track.gain !== 'number') return 1;
+    const volume = Math.pow(10, (track.gain + this.preampDb) / 20);
+    const peakLimit = track.peak > 0 ? 1 / track.peak : 1;
+    return Math.min(1, volume, peakLimit);
+  },
+
+  // Пики волновой формы трека (формат - в audio_analysis.py):
+  // { buckets, peaks: Int8Array [min0, max0, min1, max1, ...] } или null
+  async loadPeaks(track) {
+    if (!track.peaks) return null;
+    const response = await fetch(track.peaks);
+    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+    const buffer = await response.arrayBuffer();
+    const header = new DataView(buffer, 0, 8);
+    const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+    if (magic !== 'PEAK' || header.getUint8(4) !== 1) throw new Error('Unknown peaks format');
+    const buckets = header.getUint16(6, true);
+    return { buckets, peaks: new Int8Array(buffer, 8, buckets * 2) };
+  },
+
+  // Волновая форма текущего трека на <canvas> над полосой прогресса.
+  // Пики загружаются один раз на трек; пока их нет (или у трека нет пиков)
+  // холст скрыт. Ответ для уже переключённого трека отбрасывается.
+  showWaveform(canvas, track) {
+    if (!canvas) return;
+    canvas.waveform = null;
+    canvas.waveformTrack = track;
+    canvas.classList.remove('visible');
+    this.loadPeaks(track)
+      .then(waveform => {
+        if (!waveform || canvas.waveformTrack !== track) return;
+        canvas.waveform = waveform;
+        canvas.classList.add('visible');
+        this.drawWaveform(canvas, 0);
+      })
+      .catch(error => console.warn('Waveform unavailable:', error));
+  },
+
+  // Рисует пики; прослушанная часть (progress от 0 до 1) выделена цветом
+  drawWaveform(canvas, progress) {
+    const waveform = canvas && canvas.waveform;
+    if (!waveform) return;
+    const ratio = window.devicePixelRatio || 1;
+    const width = Math.round(canvas.clientWidth * ratio);
+    const height = Math.round(canvas.clientHeight * ratio);
+    if (!width || !height) return;
+    if (canvas.width !== width || canvas.height !== height) {
+      canvas.width = width;
+      canvas.height = height;
+    }
+
+    const context = canvas.getContext('2d');
+    const styles = getComputedStyle(canvas);
+    const playedColor = styles.getPropertyValue('--accent-color').trim() || '#1DB954';
+    const restColor = styles.getPropertyValue('--secondary-text-color').trim() || '#b3b3b3';
+    const middle = height / 2;
+    const barWidth = width / waveform.buckets;
+    const playedBuckets = Math.floor((progress || 0) * waveform.buckets);
+
+    context.clearRect(0, 0, width, height);
+    for (let i = 0; i < waveform.buckets; i++) {
+      const low = waveform.peaks[i * 2] / 127;
+      const high = waveform.peaks[i * 2 + 1] / 127;
+      context.fillStyle = i < playedBuckets ? playedColor : restColor;
+      context.fillRect(i * barWidth, middle - high * middle, Math.max(barWidth, 1), Math.max((high - low) * middle, 1));
+    }
+  },
+
+  // Все исполнители в порядке индекса: { artistId: данные }
+  async loadAll() {
+    const ids = Object.keys(this.artists);
+    const artists = await Promise.all(ids.map(id => this.loadArtist(id)));
+    return Object.fromEntries(ids.map((id, i) => [id, artists[i]]));
+  }
+};
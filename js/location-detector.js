@@ -122,21 +122,27 @@ const LocationDetector = {
   async sendProxyAnalytics(isRussian, country, confidence) {
     try {
       // Отправляем аналитику об использовании proxy в существующий API
+      // (через общую очередь, если она подключена на странице)
+      const event = {
+        trackId: 'proxy-detection',
+        eventType: 'location_detected',
+        proxyUsed: isRussian,
+        locationData: {
+          country,
+          confidence,
+          source: 'vps'
+        }
+      };
+      if (typeof AnalyticsQueue !== 'undefined') {
+        AnalyticsQueue.track(event);
+        return;
+      }
       await fetch('/api/listen', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json'
         },
-        body: JSON.stringify({
-          trackId: 'proxy-detection',
-          eventType: 'location_detected',
-          proxyUsed: isRussian,
-          locationData: {
-            country,
-            confidence,
-            source: 'vps'
-          }
-        })
+        body: JSON.stringify(event)
       });
     } catch (error) {
       // Не критично если аналитика не отправилась
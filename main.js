@@ -3,9 +3,9 @@ document.addEventListener('DOMContentLoaded', () => {
     const dropdownBtn = document.querySelector('.dropdown-btn');
     const dropdownContent = document.getElementById('artist-dropdown-menu');
 
-    if (dropdownBtn && dropdownContent && typeof window.artistData !== 'undefined') {
-        Object.keys(window.artistData).forEach(artistId => {
-            const artist = window.artistData[artistId];
+    if (dropdownBtn && dropdownContent && typeof Catalog !== 'undefined') {
+        Object.keys(Catalog.artists).forEach(artistId => {
+            const artist = Catalog.artists[artistId];
             const link = document.createElement('a');
             link.href = `artist.html?artist=${artistId}`;
             link.textContent = artist.name;
@@ -0,0 +1,154 @@
+# migrate_analytics.py - Перенос старых данных аналитики в новую схему ключей Redis
+
+import json
+import dotenv
+from datetime import datetime, timedelta, timezone
+from redis import ResponseError
+from api._redis_pool import get_redis_client
+from collections import defaultdict
+from api._analytics import (
+    diagnostic_log_key, track_event_field, TRACK_EVENTS_KEY, STATS_VERSION_KEY,
+    DIAGNOSTIC_LOG_RETENTION_DAYS, DIAGNOSTIC_LOG_MAXLEN,
+    leaderboard_member, split_leaderboard_member, leaderboard_artist_key, leaderboard_day_key,
+    timeseries_key, LEADERBOARD_GLOBAL_KEY, LEADERBOARD_DAY_TTL
+)
+
+# Загрузка переменных окружения
+dotenv.load_dotenv('.env.development.local')
+
+LEGACY_DIAGNOSTIC_LOGS_KEY = 'v2:diagnostic_logs'
+LEGACY_EVENT_KEY_PREFIX = 'v2:events:'
+
+def migrate_diagnostic_logs(drop_legacy=False):
+    """
+    Перенести записи из старого хеша v2:diagnostic_logs в суточные потоки.
+
+    Переносятся только записи внутри окна хранения. Запускать до деплоя новой
+    версии listen.py: поток не принимает записи старше уже существующих,
+    такие записи будут пропущены.
+    """
+    print("=== МИГРАЦИЯ ДИАГНОСТИЧЕСКОГО ЖУРНАЛА ===")
+    redis_client = get_redis_client(decode_responses=True)
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=DIAGNOSTIC_LOG_RETENTION_DAYS)
+    records = []
+    for _, log_json in redis_client.hscan_iter(LEGACY_DIAGNOSTIC_LOGS_KEY, count=1000):
+        try:
+            record = json.loads(log_json)
+            moment = datetime.fromisoformat(record['timestamp'])
+        except (json.JSONDecodeError, TypeError, KeyError, ValueError):
+            continue
+        if moment >= cutoff:
+            records.append((moment, record))
+
+    records.sort(key=lambda item: item[0])
+    print(f"Найдено {len(records)} записей в окне хранения ({DIAGNOSTIC_LOG_RETENTION_DAYS} дн.)")
+
+    migrated_count = 0
+    skipped_count = 0
+    last_millis, sequence = None, 0
+    for moment, record in records:
+        millis = int(moment.timestamp() * 1000)
+        sequence = sequence + 1 if millis == last_millis else 0
+        last_millis = millis
+
+        key = diagnostic_log_key(moment)
+        fields = {k: str(v) for k, v in record.items()}
+        try:
+            redis_client.xadd(key, fields, id=f"{millis}-{sequence}", maxlen=DIAGNOSTIC_LOG_MAXLEN, approximate=True)
+            redis_client.expire(key, timedelta(days=DIAGNOSTIC_LOG_RETENTION_DAYS + 1))
+            migrated_count += 1
+        except ResponseError:
+            skipped_count += 1
+
+    # Сбрасываем актуальность снимка /api/stats
+    redis_client.incr(STATS_VERSION_KEY)
+
+    print(f"✅ Перенесено: {migrated_count}")
+    print(f"⚠️  Пропущено: {skipped_count}")
+
+    if drop_legacy:
+        # UNLINK освобождает память в фоне и не блокирует Redis
+        redis_client.unlink(LEGACY_DIAGNOSTIC_LOGS_KEY)
+        print(f"🗑  Старый хеш '{LEGACY_DIAGNOSTIC_LOGS_KEY}' удалён")
+
+    return migrated_count
+
+def migrate_track_events(drop_legacy=False):
+    """
+    Перенести счётчики из ключей v2:events:<trackId> в общий хеш v2:track_events.
+
+    Ключи перебираются через SCAN, который, в отличие от KEYS, не блокирует Redis.
+    Счётчики прибавляются (HINCRBY), поэтому миграцию можно запускать после деплоя.
+    Повторный запуск без drop_legacy удвоит значения.
+    """
+    print("=== МИГРАЦИЯ СЧЁТЧИКОВ СОБЫТИЙ ===")
+    redis_client = get_redis_client(decode_responses=True)
+
+    migrated_keys = 0
+    for key in redis_client.scan_iter(match=f"{LEGACY_EVENT_KEY_PREFIX}*", count=500):
+        track_id = key[len(LEGACY_EVENT_KEY_PREFIX):]
+        events = redis_client.hgetall(key)
+
+        pipe = redis_client.pipeline()
+        for event_type, count in events.items():
+            pipe.hincrby(TRACK_EVENTS_KEY, track_event_field(track_id, event_type), int(count))
+        if drop_legacy:
+            pipe.unlink(key)
+        pipe.execute()
+        migrated_keys += 1
+
+    redis_client.incr(STATS_VERSION_KEY)
+    print(f"✅ Перенесено треков: {migrated_keys}")
+    return migrated_keys
+
+def backfill_leaderboards():
+    """
+    Заполнить рейтинги треков по уже накопленным счётчикам.
+
+    Общий рейтинг и рейтинги исполнителей считаются по v2:listen_counts,
+    суточные - по суточным интервалам временных рядов (поля plays:<trackId>).
+    Очки ставятся через ZADD GT: счётчики прослушиваний всегда не меньше
+    рейтинга, поэтому запуск после деплоя и повторный запуск безопасны.
+    """
+    print("=== ЗАПОЛНЕНИЕ РЕЙТИНГОВ ТРЕКОВ ===")
+    redis_client = get_redis_client(decode_responses=True)
+
+    boards = defaultdict(lambda: defaultdict(int))
+    for track_id, plays in redis_client.hgetall('v2:listen_counts').items():
+        member = leaderboard_member(track_id)
+        if member is None:
+            continue
+        boards[LEADERBOARD_GLOBAL_KEY][member] += int(plays)
+        boards[leaderboard_artist_key(split_leaderboard_member(member)[0])][member] += int(plays)
+
+    today = datetime.now(timezone.utc)
+    day_keys = []
+    for offset in range(LEADERBOARD_DAY_TTL.days):
+        day = today - timedelta(days=offset)
+        for field, plays in redis_client.hgetall(timeseries_key('day', day)).items():
+            if not field.startswith('plays:'):
+                continue
+            member = leaderboard_member(field[len('plays:'):])
+            if member is None:
+                continue
+            boards[leaderboard_day_key(day)][member] += int(plays)
+        day_keys.append(leaderboard_day_key(day))
+
+    pipe = redis_client.pipeline()
+    for key, scores in boards.items():
+        pipe.zadd(key, scores, gt=True)
+        if key in day_keys:
+            pipe.expire(key, LEADERBOARD_DAY_TTL)
+    pipe.execute()
+
+    print(f"✅ Заполнено рейтингов: {len(boards)}")
+    return len(boards)
+
+if __name__ == '__main__':
+    migrate_diagnostic_logs()
+    migrate_track_events(drop_legacy=True)
+    backfill_leaderboards()
+
+    # После проверки журнала в админке можно удалить старый хеш (закомментировано)
+    # migrate_diagnostic_logs(drop_legacy=True)
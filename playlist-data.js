@@ -1,1166 +1 @@
-window.artistData = {
-    "flowkorochki": {
-        "name": "FLOWKORO4KI",
-        "image": "images/flowkorochki.jpg",
-        "description_line1": "Sarcastic and philosophical hip-hop.",
-        "description_line2": "Exploring the boundaries of reality and absurdity.",
-        "albums": [
-            {
-                "name": "Всем на всех",
-                "cover": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/Album. Всем на всех/cover.jpg",
-                "tracks": [
-                    {
-                        "num": 1,
-                        "title": "Harry",
-                        "originalTitle": "01 Harry",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/Album. Всем на всех/01 Harry.mp3",
-                        "duration": 160
-                    },
-                    {
-                        "num": 2,
-                        "title": "Бедность",
-                        "originalTitle": "02 Бедность",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/Album. Всем на всех/02 Бедность.mp3",
-                        "duration": 104
-                    },
-                    {
-                        "num": 3,
-                        "title": "Только кажется",
-                        "originalTitle": "03 Только кажется",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/Album. Всем на всех/03 Только кажется.mp3",
-                        "duration": 202
-                    },
-                    {
-                        "num": 4,
-                        "title": "Лабиринт",
-                        "originalTitle": "04 Лабиринт",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/Album. Всем на всех/04 Лабиринт.mp3",
-                        "duration": 178
-                    },
-                    {
-                        "num": 5,
-                        "title": "Эмоджи",
-                        "originalTitle": "05 Эмоджи",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/Album. Всем на всех/05 Эмоджи.mp3",
-                        "duration": 211
-                    },
-                    {
-                        "num": 6,
-                        "title": "Roko",
-                        "originalTitle": "06 Roko",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/Album. Всем на всех/06 Roko.mp3",
-                        "duration": 225
-                    },
-                    {
-                        "num": 7,
-                        "title": "Говори через рот",
-                        "originalTitle": "07 Говори через рот",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/Album. Всем на всех/07 Говори через рот.mp3",
-                        "duration": 229
-                    },
-                    {
-                        "num": 8,
-                        "title": "Всем на всех похуй",
-                        "originalTitle": "08 Всем на всех похуй",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/Album. Всем на всех/08 Всем на всех похуй.mp3",
-                        "duration": 125
-                    },
-                    {
-                        "num": 9,
-                        "title": "Терапия",
-                        "originalTitle": "09 Терапия",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/Album. Всем на всех/09 Терапия.mp3",
-                        "duration": 154
-                    },
-                    {
-                        "num": 10,
-                        "title": "Дубай",
-                        "originalTitle": "10 Дубай",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/Album. Всем на всех/10 Дубай.mp3",
-                        "duration": 203
-                    },
-                    {
-                        "num": 11,
-                        "title": "Понятно",
-                        "originalTitle": "11 Понятно",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/Album. Всем на всех/11 Понятно.mp3",
-                        "duration": 153
-                    },
-                    {
-                        "num": 12,
-                        "title": "Оправдашки",
-                        "originalTitle": "12 Оправдашки",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/Album. Всем на всех/12 Оправдашки.mp3",
-                        "duration": 188
-                    },
-                    {
-                        "num": 13,
-                        "title": "Мы перестали ходить",
-                        "originalTitle": "13 Мы перестали ходить",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/Album. Всем на всех/13 Мы перестали ходить.mp3",
-                        "duration": 134
-                    },
-                    {
-                        "num": 14,
-                        "title": "Со стороны",
-                        "originalTitle": "14 Со стороны",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/Album. Всем на всех/14 Со стороны.mp3",
-                        "duration": 139
-                    }
-                ]
-            }
-        ],
-        "eps": [
-            {
-                "name": "Harry",
-                "cover": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/EP. Harry/cover.jpg",
-                "tracks": [
-                    {
-                        "num": 1,
-                        "title": "Harry (remix)",
-                        "originalTitle": "Harry (remix)",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/EP. Harry/Harry (remix).mp3",
-                        "duration": 149
-                    },
-                    {
-                        "num": 2,
-                        "title": "Harry",
-                        "originalTitle": "Harry",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/EP. Harry/Harry.mp3",
-                        "duration": 160
-                    }
-                ]
-            },
-            {
-                "name": "Roko",
-                "cover": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/EP. Roko/cover.jpg",
-                "tracks": [
-                    {
-                        "num": 1,
-                        "title": "RRRoko (beat)",
-                        "originalTitle": "RRRoko (beat)",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/EP. Roko/RRRoko (beat).mp3",
-                        "duration": 229
-                    },
-                    {
-                        "num": 2,
-                        "title": "RRRoko (clear)",
-                        "originalTitle": "RRRoko (clear)",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/EP. Roko/RRRoko (clear).mp3",
-                        "duration": 237
-                    },
-                    {
-                        "num": 3,
-                        "title": "RRRoko (main)",
-                        "originalTitle": "RRRoko (main)",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/EP. Roko/RRRoko (main).mp3",
-                        "duration": 225
-                    },
-                    {
-                        "num": 4,
-                        "title": "RRRoko (remix)",
-                        "originalTitle": "RRRoko (remix)",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/EP. Roko/RRRoko (remix).mp3",
-                        "duration": 190
-                    }
-                ]
-            },
-            {
-                "name": "The story",
-                "cover": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/EP. The story/cover.jpg",
-                "tracks": [
-                    {
-                        "num": 1,
-                        "title": "The story (remix)",
-                        "originalTitle": "The story (remix)",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/EP. The story/The story (remix).mp3",
-                        "duration": 182
-                    },
-                    {
-                        "num": 2,
-                        "title": "The story",
-                        "originalTitle": "The story",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/flowkorochki/EP. The story/The story.mp3",
-                        "duration": 179
-                    }
-                ]
-            }
-        ],
-        "demos": []
-    },
-    "jahkorochki": {
-        "name": "JAHKORO4KI",
-        "image": "images/jahkorochki.jpg",
-        "description_line1": "Reggae-trap-industrial chaos with Balkan soul.",
-        "description_line2": "From Sarajevo streets to global bureaucratic beats.",
-        "albums": [
-            {
-                "name": "Deportation from the country of refugees",
-                "cover": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/jahkorochki/Album. Deportation from the country of refugees/cover.jpg",
-                "tracks": [
-                    {
-                        "num": 1,
-                        "title": "Mouse caught the cat",
-                        "originalTitle": "01 Mouse caught the cat",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/jahkorochki/Album. Deportation from the country of refugees/01 Mouse caught the cat.mp3",
-                        "duration": 342
-                    },
-                    {
-                        "num": 2,
-                        "title": "Kicked Out of Safe Haven",
-                        "originalTitle": "02 Kicked Out of Safe Haven",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/jahkorochki/Album. Deportation from the country of refugees/02 Kicked Out of Safe Haven.mp3",
-                        "duration": 449
-                    },
-                    {
-                        "num": 3,
-                        "title": "Refugee Status - Denied by Refugees",
-                        "originalTitle": "03 Refugee Status - Denied by Refugees",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/jahkorochki/Album. Deportation from the country of refugees/03 Refugee Status - Denied by Refugees.mp3",
-                        "duration": 337
-                    },
-                    {
-                        "num": 4,
-                        "title": "My own atom",
-                        "originalTitle": "04 My own atom",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/jahkorochki/Album. Deportation from the country of refugees/04 My own atom.mp3",
-                        "duration": 329
-                    },
-                    {
-                        "num": 5,
-                        "title": "Cross and Bill",
-                        "originalTitle": "05 Cross and Bill",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/jahkorochki/Album. Deportation from the country of refugees/05 Cross and Bill.mp3",
-                        "duration": 339
-                    },
-                    {
-                        "num": 6,
-                        "title": "Obi Van Vladimir",
-                        "originalTitle": "06 Obi Van Vladimir",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/jahkorochki/Album. Deportation from the country of refugees/06 Obi Van Vladimir.mp3",
-                        "duration": 357
-                    },
-                    {
-                        "num": 7,
-                        "title": "My own atom remix",
-                        "originalTitle": "07 My own atom remix",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/jahkorochki/Album. Deportation from the country of refugees/07 My own atom remix.mp3",
-                        "duration": 391
-                    }
-                ]
-            }
-        ],
-        "eps": [],
-        "demos": [
-            {
-                "name": "Крест и вексель",
-                "cover": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/jahkorochki/Demo. Крест и вексель/cover.jpg",
-                "tracks": [
-                    {
-                        "num": 1,
-                        "title": "Звезда смерти",
-                        "originalTitle": "Звезда смерти",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/jahkorochki/Demo. Крест и вексель/Звезда смерти.mp3",
-                        "duration": 273
-                    },
-                    {
-                        "num": 2,
-                        "title": "Однозначно",
-                        "originalTitle": "Однозначно",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/jahkorochki/Demo. Крест и вексель/Однозначно.mp3",
-                        "duration": 210
-                    }
-                ]
-            }
-        ]
-    },
-    "nukorochki": {
-        "name": "NÜKORO4KI",
-        "image": "images/nukorochki.jpg",
-        "description_line1": "Experimental metal with no fucking frames.",
-        "description_line2": "From quantum leaps to night machines of sound.",
-        "albums": [
-            {
-                "name": "Grenzgänger",
-                "cover": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/Album. Grenzgänger/cover.jpg",
-                "tracks": [
-                    {
-                        "num": 1,
-                        "title": "Systemfehler",
-                        "originalTitle": "01 Systemfehler",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/Album. Grenzgänger/01 Systemfehler.mp3",
-                        "duration": 328
-                    },
-                    {
-                        "num": 2,
-                        "title": "Quantenmechanik",
-                        "originalTitle": "02 Quantenmechanik",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/Album. Grenzgänger/02 Quantenmechanik.mp3",
-                        "duration": 295
-                    },
-                    {
-                        "num": 3,
-                        "title": "Grüne Lüge",
-                        "originalTitle": "03 Grüne Lüge",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/Album. Grenzgänger/03 Grüne Lüge.mp3",
-                        "duration": 198
-                    },
-                    {
-                        "num": 4,
-                        "title": "Betondschungel",
-                        "originalTitle": "04 Betondschungel",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/Album. Grenzgänger/04 Betondschungel.mp3",
-                        "duration": 276
-                    },
-                    {
-                        "num": 5,
-                        "title": "Grenzgänger",
-                        "originalTitle": "05 Grenzgänger",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/Album. Grenzgänger/05 Grenzgänger.mp3",
-                        "duration": 367
-                    },
-                    {
-                        "num": 6,
-                        "title": "Nightmachine",
-                        "originalTitle": "06 Nightmachine",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/Album. Grenzgänger/06 Nightmachine.mp3",
-                        "duration": 480
-                    },
-                    {
-                        "num": 7,
-                        "title": "Von Göttern und Gassen",
-                        "originalTitle": "07 Von Göttern und Gassen",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/Album. Grenzgänger/07 Von Göttern und Gassen.mp3",
-                        "duration": 276
-                    },
-                    {
-                        "num": 8,
-                        "title": "Digitale Liebe",
-                        "originalTitle": "08 Digitale Liebe",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/Album. Grenzgänger/08 Digitale Liebe.mp3",
-                        "duration": 271
-                    }
-                ]
-            }
-        ],
-        "eps": [
-            {
-                "name": "Grenzgänger remixes",
-                "cover": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/EP. Grenzgänger remixes/cover.jpg",
-                "tracks": [
-                    {
-                        "num": 1,
-                        "title": "Grenzgänger",
-                        "originalTitle": "Grenzgänger",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/EP. Grenzgänger remixes/Grenzgänger.mp3",
-                        "duration": 344
-                    },
-                    {
-                        "num": 2,
-                        "title": "Grüne Lüge",
-                        "originalTitle": "Grüne Lüge",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/EP. Grenzgänger remixes/Grüne Lüge.mp3",
-                        "duration": 229
-                    },
-                    {
-                        "num": 3,
-                        "title": "Nachtmaschine",
-                        "originalTitle": "Nachtmaschine",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/EP. Grenzgänger remixes/Nachtmaschine.mp3",
-                        "duration": 273
-                    },
-                    {
-                        "num": 4,
-                        "title": "Von Göttern und Gassen2",
-                        "originalTitle": "Von Göttern und Gassen2",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/EP. Grenzgänger remixes/Von Göttern und Gassen2.mp3",
-                        "duration": 259
-                    }
-                ]
-            }
-        ],
-        "demos": [
-            {
-                "name": "Demos",
-                "cover": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/Demo. Demos/cover.jpg",
-                "tracks": [
-                    {
-                        "num": 1,
-                        "title": "Wake up!",
-                        "originalTitle": "01 Wake up!",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/Demo. Demos/01 Wake up!.mp3",
-                        "duration": 196
-                    },
-                    {
-                        "num": 2,
-                        "title": "Grenzgänger (celtic)",
-                        "originalTitle": "02 Grenzgänger (celtic)",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/Demo. Demos/02 Grenzgänger (celtic).mp3",
-                        "duration": 223
-                    },
-                    {
-                        "num": 3,
-                        "title": "Quantenmechanik",
-                        "originalTitle": "03 Quantenmechanik",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/Demo. Demos/03 Quantenmechanik.mp3",
-                        "duration": 198
-                    },
-                    {
-                        "num": 4,
-                        "title": "Transformation!",
-                        "originalTitle": "04 Transformation!",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/Demo. Demos/04 Transformation!.mp3",
-                        "duration": 196
-                    },
-                    {
-                        "num": 5,
-                        "title": "Stahlträume",
-                        "originalTitle": "05 Stahlträume",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/Demo. Demos/05 Stahlträume.mp3",
-                        "duration": 468
-                    },
-                    {
-                        "num": 6,
-                        "title": "Systemdown",
-                        "originalTitle": "06 Systemdown",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/Demo. Demos/06 Systemdown.mp3",
-                        "duration": 229
-                    },
-                    {
-                        "num": 7,
-                        "title": "Digitale Rebellion",
-                        "originalTitle": "07 Digitale Rebellion",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/Demo. Demos/07 Digitale Rebellion.mp3",
-                        "duration": 141
-                    },
-                    {
-                        "num": 8,
-                        "title": "Megathron",
-                        "originalTitle": "08 Megathron",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/Demo. Demos/08 Megathron.mp3",
-                        "duration": 193
-                    },
-                    {
-                        "num": 9,
-                        "title": "Lieber Vlad",
-                        "originalTitle": "09 Lieber Vlad",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/Demo. Demos/09 Lieber Vlad.mp3",
-                        "duration": 172
-                    },
-                    {
-                        "num": 10,
-                        "title": "Metamorphose",
-                        "originalTitle": "10 Metamorphose",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/Demo. Demos/10 Metamorphose.mp3",
-                        "duration": 183
-                    },
-                    {
-                        "num": 11,
-                        "title": "Cyberkraft",
-                        "originalTitle": "11 Cyberkraft",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/Demo. Demos/11 Cyberkraft.mp3",
-                        "duration": 169
-                    },
-                    {
-                        "num": 12,
-                        "title": "Grenzgänger",
-                        "originalTitle": "12 Grenzgänger",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/Demo. Demos/12 Grenzgänger.mp3",
-                        "duration": 395
-                    },
-                    {
-                        "num": 13,
-                        "title": "Nachtmaschine",
-                        "originalTitle": "13 Nachtmaschine",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/nukorochki/Demo. Demos/13 Nachtmaschine.mp3",
-                        "duration": 190
-                    }
-                ]
-            }
-        ]
-    },
-    "psykorochki": {
-        "name": "PSYKORO4KI",
-        "image": "images/psykorochki.jpg",
-        "description_line1": "Break-electro-punk-inverted-cyber-hip-hop.",
-        "description_line2": "Musical chaos for the digital world.",
-        "albums": [
-            {
-                "name": "Infected glitch opera",
-                "cover": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Infected glitch opera/cover.jpg",
-                "tracks": [
-                    {
-                        "num": 1,
-                        "title": "INIT REALIZING",
-                        "originalTitle": "1. INIT REALIZING",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Infected glitch opera/1. INIT REALIZING.mp3",
-                        "duration": 240
-                    },
-                    {
-                        "num": 2,
-                        "title": "VIRAL.PROPAGATION",
-                        "originalTitle": "2. VIRAL.PROPAGATION",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Infected glitch opera/2. VIRAL.PROPAGATION.mp3",
-                        "duration": 258
-                    },
-                    {
-                        "num": 3,
-                        "title": "QUARANTINE PROTOCOL",
-                        "originalTitle": "3. QUARANTINE PROTOCOL",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Infected glitch opera/3. QUARANTINE PROTOCOL.mp3",
-                        "duration": 205
-                    },
-                    {
-                        "num": 4,
-                        "title": "INNER.DEMONS LOADING",
-                        "originalTitle": "4. INNER.DEMONS LOADING",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Infected glitch opera/4. INNER.DEMONS LOADING.mp3",
-                        "duration": 296
-                    },
-                    {
-                        "num": 5,
-                        "title": "DIGITAL EXORCISM",
-                        "originalTitle": "5. DIGITAL EXORCISM",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Infected glitch opera/5. DIGITAL EXORCISM.mp3",
-                        "duration": 395
-                    },
-                    {
-                        "num": 6,
-                        "title": "ALGORITHM.WAR",
-                        "originalTitle": "6. ALGORITHM.WAR",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Infected glitch opera/6. ALGORITHM.WAR.mp3",
-                        "duration": 480
-                    },
-                    {
-                        "num": 7,
-                        "title": "MEMORY.DEFRAG",
-                        "originalTitle": "7. MEMORY.DEFRAG",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Infected glitch opera/7. MEMORY.DEFRAG.mp3",
-                        "duration": 356
-                    },
-                    {
-                        "num": 8,
-                        "title": "DEFRAGMENTATION",
-                        "originalTitle": "8. DEFRAGMENTATION",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Infected glitch opera/8. DEFRAGMENTATION.mp3",
-                        "duration": 192
-                    },
-                    {
-                        "num": 9,
-                        "title": "SOURCE.CODE REWRITE",
-                        "originalTitle": "9. SOURCE.CODE REWRITE",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Infected glitch opera/9. SOURCE.CODE REWRITE.mp3",
-                        "duration": 272
-                    },
-                    {
-                        "num": 10,
-                        "title": "PURIFICATION.PROTOCOL",
-                        "originalTitle": "10. PURIFICATION.PROTOCOL",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Infected glitch opera/10. PURIFICATION.PROTOCOL.mp3",
-                        "duration": 256
-                    },
-                    {
-                        "num": 11,
-                        "title": "CLEAN REBOOT",
-                        "originalTitle": "11. CLEAN REBOOT",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Infected glitch opera/11. CLEAN REBOOT.mp3",
-                        "duration": 291
-                    },
-                    {
-                        "num": 12,
-                        "title": "DIGITAL EXORCISM (remix)",
-                        "originalTitle": "12. DIGITAL EXORCISM (remix)",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Infected glitch opera/12. DIGITAL EXORCISM (remix).mp3",
-                        "duration": 377
-                    }
-                ]
-            },
-            {
-                "name": "The Glitch Gospel",
-                "cover": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. The Glitch Gospel/cover.jpg",
-                "tracks": [
-                    {
-                        "num": 0,
-                        "title": "Echoes of a Digital Rise",
-                        "originalTitle": "00 Echoes of a Digital Rise",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. The Glitch Gospel/00 Echoes of a Digital Rise.mp3",
-                        "duration": 167
-                    },
-                    {
-                        "num": 1,
-                        "title": "Synaptic Overload",
-                        "originalTitle": "01 Synaptic Overload",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. The Glitch Gospel/01 Synaptic Overload.mp3",
-                        "duration": 176
-                    },
-                    {
-                        "num": 2,
-                        "title": "Glitching Consciousness",
-                        "originalTitle": "02 Glitching Consciousness",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. The Glitch Gospel/02 Glitching Consciousness.mp3",
-                        "duration": 207
-                    },
-                    {
-                        "num": 3,
-                        "title": "Implant",
-                        "originalTitle": "03 Implant",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. The Glitch Gospel/03 Implant.mp3",
-                        "duration": 147
-                    },
-                    {
-                        "num": 4,
-                        "title": "The Digital Leash",
-                        "originalTitle": "04 The Digital Leash",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. The Glitch Gospel/04 The Digital Leash.mp3",
-                        "duration": 223
-                    },
-                    {
-                        "num": 5,
-                        "title": "Marionette's Break",
-                        "originalTitle": "05 Marionette's Break",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. The Glitch Gospel/05 Marionette's Break.mp3",
-                        "duration": 178
-                    },
-                    {
-                        "num": 6,
-                        "title": "A Quark in the System",
-                        "originalTitle": "06 A Quark in the System",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. The Glitch Gospel/06 A Quark in the System.mp3",
-                        "duration": 169
-                    },
-                    {
-                        "num": 7,
-                        "title": "Jericho",
-                        "originalTitle": "07 Jericho",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. The Glitch Gospel/07 Jericho.mp3",
-                        "duration": 122
-                    },
-                    {
-                        "num": 8,
-                        "title": "Mainframe Messiah",
-                        "originalTitle": "08 Mainframe Messiah",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. The Glitch Gospel/08 Mainframe Messiah.mp3",
-                        "duration": 204
-                    },
-                    {
-                        "num": 9,
-                        "title": "Defragmentig Soul",
-                        "originalTitle": "09 Defragmentig Soul",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. The Glitch Gospel/09 Defragmentig Soul.mp3",
-                        "duration": 204
-                    },
-                    {
-                        "num": 10,
-                        "title": "Homecoming Glitch",
-                        "originalTitle": "10 Homecoming Glitch",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. The Glitch Gospel/10 Homecoming Glitch.mp3",
-                        "duration": 152
-                    },
-                    {
-                        "num": 11,
-                        "title": "The virus",
-                        "originalTitle": "11 The virus",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. The Glitch Gospel/11 The virus.mp3",
-                        "duration": 187
-                    },
-                    {
-                        "num": 12,
-                        "title": "Echoes of a World's Funeral",
-                        "originalTitle": "12 Echoes of a World's Funeral",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. The Glitch Gospel/12 Echoes of a World's Funeral.mp3",
-                        "duration": 195
-                    }
-                ]
-            },
-            {
-                "name": "Gl...it.ch",
-                "cover": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Gl...it.ch/cover.jpg",
-                "tracks": [
-                    {
-                        "num": 1,
-                        "title": "Чистый синтез",
-                        "originalTitle": "1. Чистый синтез",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Gl...it.ch/1. Чистый синтез.mp3",
-                        "duration": 186
-                    },
-                    {
-                        "num": 2,
-                        "title": "Психический рэп",
-                        "originalTitle": "2. Психический рэп",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Gl...it.ch/2. Психический рэп.mp3",
-                        "duration": 156
-                    },
-                    {
-                        "num": 3,
-                        "title": "Глитч-Мозг",
-                        "originalTitle": "3. Глитч-Мозг",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Gl...it.ch/3. Глитч-Мозг.mp3",
-                        "duration": 124
-                    },
-                    {
-                        "num": 4,
-                        "title": "Имплант",
-                        "originalTitle": "4. Имплант",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Gl...it.ch/4. Имплант.mp3",
-                        "duration": 172
-                    },
-                    {
-                        "num": 5,
-                        "title": "Нейро-Сетка",
-                        "originalTitle": "5. Нейро-Сетка",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Gl...it.ch/5. Нейро-Сетка.mp3",
-                        "duration": 154
-                    },
-                    {
-                        "num": 6,
-                        "title": "Тишина",
-                        "originalTitle": "6. Тишина",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Gl...it.ch/6. Тишина.mp3",
-                        "duration": 140
-                    },
-                    {
-                        "num": 7,
-                        "title": "Кварковый Суицид",
-                        "originalTitle": "7. Кварковый Суицид",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Gl...it.ch/7. Кварковый Суицид.mp3",
-                        "duration": 166
-                    },
-                    {
-                        "num": 8,
-                        "title": "Jericho",
-                        "originalTitle": "8. Jericho",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Gl...it.ch/8. Jericho.mp3",
-                        "duration": 133
-                    },
-                    {
-                        "num": 9,
-                        "title": "Big RAM Bang",
-                        "originalTitle": "9. Big RAM Bang",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Gl...it.ch/9. Big RAM Bang.mp3",
-                        "duration": 136
-                    },
-                    {
-                        "num": 10,
-                        "title": "Дверь в ничто",
-                        "originalTitle": "10. Дверь в ничто",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Gl...it.ch/10. Дверь в ничто.mp3",
-                        "duration": 187
-                    },
-                    {
-                        "num": 11,
-                        "title": "Троян",
-                        "originalTitle": "11. Троян",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Gl...it.ch/11. Троян.mp3",
-                        "duration": 123
-                    },
-                    {
-                        "num": 12,
-                        "title": "Вернуться",
-                        "originalTitle": "12. Вернуться",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Album. Gl...it.ch/12. Вернуться.mp3",
-                        "duration": 150
-                    }
-                ]
-            }
-        ],
-        "eps": [
-            {
-                "name": "Some people",
-                "cover": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/EP. Some people/cover.jpg",
-                "tracks": [
-                    {
-                        "num": 1,
-                        "title": "Some people",
-                        "originalTitle": "Some people",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/EP. Some people/Some people.mp3",
-                        "duration": 177
-                    }
-                ]
-            }
-        ],
-        "demos": [
-            {
-                "name": "Gl...it.ch Demos",
-                "cover": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Demo. Gl...it.ch Demos/cover.jpg",
-                "tracks": [
-                    {
-                        "num": 1,
-                        "title": "Implant",
-                        "originalTitle": "Implant",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Demo. Gl...it.ch Demos/Implant.mp3",
-                        "duration": 161
-                    },
-                    {
-                        "num": 2,
-                        "title": "Jericho",
-                        "originalTitle": "Jericho",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Demo. Gl...it.ch Demos/Jericho.mp3",
-                        "duration": 172
-                    },
-                    {
-                        "num": 3,
-                        "title": "Pure synthesis",
-                        "originalTitle": "Pure synthesis",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Demo. Gl...it.ch Demos/Pure synthesis.mp3",
-                        "duration": 198
-                    },
-                    {
-                        "num": 4,
-                        "title": "Silence",
-                        "originalTitle": "Silence",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Demo. Gl...it.ch Demos/Silence.mp3",
-                        "duration": 126
-                    }
-                ]
-            },
-            {
-                "name": "The Glitch Gospel Demos",
-                "cover": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Demo. The Glitch Gospel Demos/cover.jpg",
-                "tracks": [
-                    {
-                        "num": 1,
-                        "title": "V1_Pure Synthesis",
-                        "originalTitle": "01_V1_Pure Synthesis",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Demo. The Glitch Gospel Demos/01_V1_Pure Synthesis.mp3",
-                        "duration": 172
-                    },
-                    {
-                        "num": 1,
-                        "title": "V2_Pure Synthesis",
-                        "originalTitle": "01_V2_Pure Synthesis",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Demo. The Glitch Gospel Demos/01_V2_Pure Synthesis.mp3",
-                        "duration": 184
-                    },
-                    {
-                        "num": 1,
-                        "title": "V3_Pure Synthesis",
-                        "originalTitle": "01_V3_Pure Synthesis",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Demo. The Glitch Gospel Demos/01_V3_Pure Synthesis.mp3",
-                        "duration": 176
-                    },
-                    {
-                        "num": 2,
-                        "title": "V2_Glitching Consciousness",
-                        "originalTitle": "02_V2_Glitching Consciousness",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Demo. The Glitch Gospel Demos/02_V2_Glitching Consciousness.mp3",
-                        "duration": 172
-                    },
-                    {
-                        "num": 2,
-                        "title": "V3_Glitching Consciousness",
-                        "originalTitle": "02_V3_Glitching Consciousness",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Demo. The Glitch Gospel Demos/02_V3_Glitching Consciousness.mp3",
-                        "duration": 202
-                    },
-                    {
-                        "num": 5,
-                        "title": "V2_Marionette's Break",
-                        "originalTitle": "05_V2_Marionette's Break",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Demo. The Glitch Gospel Demos/05_V2_Marionette's Break.mp3",
-                        "duration": 204
-                    },
-                    {
-                        "num": 5,
-                        "title": "V3_Marionette's Break",
-                        "originalTitle": "05_V3_Marionette's Break",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Demo. The Glitch Gospel Demos/05_V3_Marionette's Break.mp3",
-                        "duration": 157
-                    },
-                    {
-                        "num": 5,
-                        "title": "V4_Marionette's Break",
-                        "originalTitle": "05_V4_Marionette's Break",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Demo. The Glitch Gospel Demos/05_V4_Marionette's Break.mp3",
-                        "duration": 200
-                    },
-                    {
-                        "num": 6,
-                        "title": "V2_A Quark in the System",
-                        "originalTitle": "06_V2_A Quark in the System",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Demo. The Glitch Gospel Demos/06_V2_A Quark in the System.mp3",
-                        "duration": 182
-                    },
-                    {
-                        "num": 9,
-                        "title": "V2_Defragmentig Soul",
-                        "originalTitle": "09_V2_Defragmentig Soul",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Demo. The Glitch Gospel Demos/09_V2_Defragmentig Soul.mp3",
-                        "duration": 179
-                    },
-                    {
-                        "num": 9,
-                        "title": "V3_Defragmentig Soul",
-                        "originalTitle": "09_V3_Defragmentig Soul",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Demo. The Glitch Gospel Demos/09_V3_Defragmentig Soul.mp3",
-                        "duration": 173
-                    },
-                    {
-                        "num": 9,
-                        "title": "V4_Defragmentig Soul",
-                        "originalTitle": "09_V4_Defragmentig Soul",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Demo. The Glitch Gospel Demos/09_V4_Defragmentig Soul.mp3",
-                        "duration": 181
-                    },
-                    {
-                        "num": 10,
-                        "title": "V2_Homecoming Glitch",
-                        "originalTitle": "10_V2_Homecoming Glitch",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Demo. The Glitch Gospel Demos/10_V2_Homecoming Glitch.mp3",
-                        "duration": 188
-                    },
-                    {
-                        "num": 11,
-                        "title": "V2_The virus",
-                        "originalTitle": "11_V2_The virus",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/psykorochki/Demo. The Glitch Gospel Demos/11_V2_The virus.mp3",
-                        "duration": 133
-                    }
-                ]
-            }
-        ]
-    },
-    "riffkorochki": {
-        "name": "RIFFKORO4KI",
-        "image": "images/riffkorochki.jpg",
-        "description_line1": "The blend of experimental hip-hop and riffs.",
-        "description_line2": "A drop of common sense for your soul.",
-        "albums": [
-            {
-                "name": "Шум в голове",
-                "cover": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/riffkorochki/Album. Шум в голове/cover.jpg",
-                "tracks": [
-                    {
-                        "num": 1,
-                        "title": "Мой атом (feat. Daria Ivanova)",
-                        "originalTitle": "01 Мой атом (feat. Daria Ivanova)",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/riffkorochki/Album. Шум в голове/01 Мой атом (feat. Daria Ivanova).mp3",
-                        "duration": 196
-                    },
-                    {
-                        "num": 2,
-                        "title": "Rapper's Ketchup",
-                        "originalTitle": "02 Rapper's Ketchup",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/riffkorochki/Album. Шум в голове/02 Rapper's Ketchup.mp3",
-                        "duration": 195
-                    },
-                    {
-                        "num": 3,
-                        "title": "Эффект Ikea",
-                        "originalTitle": "03 Эффект Ikea",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/riffkorochki/Album. Шум в голове/03 Эффект Ikea.mp3",
-                        "duration": 237
-                    },
-                    {
-                        "num": 4,
-                        "title": "Карго культ",
-                        "originalTitle": "04 Карго культ",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/riffkorochki/Album. Шум в голове/04 Карго культ.mp3",
-                        "duration": 213
-                    },
-                    {
-                        "num": 5,
-                        "title": "Ошибка выжившего",
-                        "originalTitle": "05 Ошибка выжившего",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/riffkorochki/Album. Шум в голове/05 Ошибка выжившего.mp3",
-                        "duration": 229
-                    },
-                    {
-                        "num": 6,
-                        "title": "Good Vibes Only",
-                        "originalTitle": "06 Good Vibes Only",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/riffkorochki/Album. Шум в голове/06 Good Vibes Only.mp3",
-                        "duration": 205
-                    },
-                    {
-                        "num": 7,
-                        "title": "Амнезия",
-                        "originalTitle": "07 Амнезия",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/riffkorochki/Album. Шум в голове/07 Амнезия.mp3",
-                        "duration": 197
-                    },
-                    {
-                        "num": 8,
-                        "title": "Купи",
-                        "originalTitle": "08 Купи",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/riffkorochki/Album. Шум в голове/08 Купи.mp3",
-                        "duration": 199
-                    },
-                    {
-                        "num": 9,
-                        "title": "Парадокс выбора",
-                        "originalTitle": "09 Парадокс выбора",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/riffkorochki/Album. Шум в голове/09 Парадокс выбора.mp3",
-                        "duration": 212
-                    },
-                    {
-                        "num": 10,
-                        "title": "Звонок в SpaceX (skit)",
-                        "originalTitle": "10 Звонок в SpaceX (skit)",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/riffkorochki/Album. Шум в голове/10 Звонок в SpaceX (skit).mp3",
-                        "duration": 169
-                    },
-                    {
-                        "num": 11,
-                        "title": "Ностальгия",
-                        "originalTitle": "11 Ностальгия",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/riffkorochki/Album. Шум в голове/11 Ностальгия.mp3",
-                        "duration": 203
-                    },
-                    {
-                        "num": 12,
-                        "title": "Человек разумный",
-                        "originalTitle": "12 Человек разумный",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/riffkorochki/Album. Шум в голове/12 Человек разумный.mp3",
-                        "duration": 208
-                    }
-                ]
-            }
-        ],
-        "eps": [],
-        "demos": []
-    },
-    "streetkorochki": {
-        "name": "STREETKORO4KI",
-        "image": "images/streetkorochki.jpg",
-        "description_line1": "Satirical rap dismantling social pretenses.",
-        "description_line2": "Fast-paced trap-drill with polyrhythmic chaos.",
-        "albums": [
-            {
-                "name": "Корректность и правда",
-                "cover": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/streetkorochki/Album. Корректность и правда/cover.jpg",
-                "tracks": [
-                    {
-                        "num": 1,
-                        "title": "Мотивационная",
-                        "originalTitle": "01 Мотивационная",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/streetkorochki/Album. Корректность и правда/01 Мотивационная.mp3",
-                        "duration": 171
-                    },
-                    {
-                        "num": 2,
-                        "title": "Геннадий",
-                        "originalTitle": "02 Геннадий",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/streetkorochki/Album. Корректность и правда/02 Геннадий.mp3",
-                        "duration": 169
-                    },
-                    {
-                        "num": 3,
-                        "title": "Совет",
-                        "originalTitle": "03 Совет",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/streetkorochki/Album. Корректность и правда/03 Совет.mp3",
-                        "duration": 171
-                    },
-                    {
-                        "num": 4,
-                        "title": "Наоборот",
-                        "originalTitle": "04 Наоборот",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/streetkorochki/Album. Корректность и правда/04 Наоборот.mp3",
-                        "duration": 168
-                    },
-                    {
-                        "num": 5,
-                        "title": "Онанизм",
-                        "originalTitle": "05 Онанизм",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/streetkorochki/Album. Корректность и правда/05 Онанизм.mp3",
-                        "duration": 158
-                    },
-                    {
-                        "num": 6,
-                        "title": "Комфортная революция",
-                        "originalTitle": "06 Комфортная революция",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/streetkorochki/Album. Корректность и правда/06 Комфортная революция.mp3",
-                        "duration": 205
-                    },
-                    {
-                        "num": 7,
-                        "title": "Поделись чувствами",
-                        "originalTitle": "07 Поделись чувствами",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/streetkorochki/Album. Корректность и правда/07 Поделись чувствами.mp3",
-                        "duration": 197
-                    },
-                    {
-                        "num": 8,
-                        "title": "Права без обязанностей",
-                        "originalTitle": "08 Права без обязанностей",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/streetkorochki/Album. Корректность и правда/08 Права без обязанностей.mp3",
-                        "duration": 190
-                    },
-                    {
-                        "num": 9,
-                        "title": "Тренд на истерику",
-                        "originalTitle": "09 Тренд на истерику",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/streetkorochki/Album. Корректность и правда/09 Тренд на истерику.mp3",
-                        "duration": 183
-                    },
-                    {
-                        "num": 10,
-                        "title": "Горячая линия (skit)",
-                        "originalTitle": "10 Горячая линия (skit)",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/streetkorochki/Album. Корректность и правда/10 Горячая линия (skit).mp3",
-                        "duration": 75
-                    },
-                    {
-                        "num": 11,
-                        "title": "Корректность и правда",
-                        "originalTitle": "11 Корректность и правда",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/streetkorochki/Album. Корректность и правда/11 Корректность и правда.mp3",
-                        "duration": 184
-                    }
-                ]
-            }
-        ],
-        "eps": [],
-        "demos": []
-    },
-    "trapkorochki": {
-        "name": "TRAPKORO4KI",
-        "image": "images/trapkorochki.jpg",
-        "description_line1": "A fusion of noir trap and digital decadence.",
-        "description_line2": "The architecture of the void for your veins.",
-        "albums": [],
-        "eps": [],
-        "demos": [
-            {
-                "name": "Синтетический Ренессанс",
-                "cover": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/trapkorochki/Demo. Синтетический Ренессанс/cover.jpg",
-                "tracks": [
-                    {
-                        "num": 1,
-                        "title": "Просто диагноз",
-                        "originalTitle": "01 Просто диагноз",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/trapkorochki/Demo. Синтетический Ренессанс/01 Просто диагноз.mp3",
-                        "duration": 160
-                    },
-                    {
-                        "num": 2,
-                        "title": "Витражи",
-                        "originalTitle": "02 Витражи",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/trapkorochki/Demo. Синтетический Ренессанс/02 Витражи.mp3",
-                        "duration": 208
-                    },
-                    {
-                        "num": 3,
-                        "title": "Холодные сделки",
-                        "originalTitle": "03 Холодные сделки",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/trapkorochki/Demo. Синтетический Ренессанс/03 Холодные сделки.mp3",
-                        "duration": 151
-                    },
-                    {
-                        "num": 4,
-                        "title": "Неоновый трип",
-                        "originalTitle": "04 Неоновый трип",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/trapkorochki/Demo. Синтетический Ренессанс/04 Неоновый трип.mp3",
-                        "duration": 181
-                    },
-                    {
-                        "num": 5,
-                        "title": "Лидийский шелк",
-                        "originalTitle": "05 Лидийский шелк",
-                        "file": "https://rpattpnro3om3v4l.public.blob.vercel-storage.com/music/trapkorochki/Demo. Синтетический Ренессанс/05 Лидийский шелк.mp3",
-                        "duration": 163
-                    }
-                ]
-            }
-        ]
-    }
-};
\ No newline at end of file
+window.catalogIndex = {"flowkorochki":{"name":"FLOWKORO4KI","image":"images/flowkorochki.jpg","description_line1":"Sarcastic and philosophical hip-hop.","description_line2":"Exploring the boundaries of reality and absurdity.","catalog":"catalog/artists/flowkorochki.2dd07ebdbb.json"},"jahkorochki":{"name":"JAHKORO4KI","image":"images/jahkorochki.jpg","description_line1":"Reggae-trap-industrial chaos with Balkan soul.","description_line2":"From Sarajevo streets to global bureaucratic beats.","catalog":"catalog/artists/jahkorochki.a6643fd3c5.json"},"nukorochki":{"name":"NÜKORO4KI","image":"images/nukorochki.jpg","description_line1":"Experimental metal with no fucking frames.","description_line2":"From quantum leaps to night machines of sound.","catalog":"catalog/artists/nukorochki.bf66621eb7.json"},"psykorochki":{"name":"PSYKORO4KI","image":"images/psykorochki.jpg","description_line1":"Break-electro-punk-inverted-cyber-hip-hop.","description_line2":"Musical chaos for the digital world.","catalog":"catalog/artists/psykorochki.ad1a21bd20.json"},"riffkorochki":{"name":"RIFFKORO4KI","image":"images/riffkorochki.jpg","description_line1":"The blend of experimental hip-hop and riffs.","description_line2":"A drop of common sense for your soul.","catalog":"catalog/artists/riffkorochki.f5123ebf89.json"},"streetkorochki":{"name":"STREETKORO4KI","image":"images/streetkorochki.jpg","description_line1":"Satirical rap dismantling social pretenses.","description_line2":"Fast-paced trap-drill with polyrhythmic chaos.","catalog":"catalog/artists/streetkorochki.f167e101b5.json"},"trapkorochki":{"name":"TRAPKORO4KI","image":"images/trapkorochki.jpg","description_line1":"A fusion of noir trap and digital decadence.","description_line2":"The architecture of the void for your veins.","catalog":"catalog/artists/trapkorochki.385fdf150e.json"}};
\ No newline at end of file
@@ -0,0 +1,80 @@
+# release_versions.py - Версии релизов в blob для замены альбома без простоя
+
+import os
+import re
+import json
+import time
+from datetime import datetime, timezone
+
+# Манифест версий хранится в репозитории рядом с playlist-data.js:
+#   releases - локальная папка релиза -> текущая версия в blob;
+#   retired  - папки в blob, на которые каталог больше не ссылается.
+# Файлы версии лежат в "music/<исполнитель>/<релиз>@<версия>/...". Старые
+# папки удаляются не сразу, а после RELEASE_GC_GRACE_HOURS, когда новый
+# каталог уже задеплоен и у слушателей не осталось открытых страниц со старым.
+VERSIONS_FILE = 'release-versions.json'
+VERSION_SEPARATOR = '@'
+VERSION_PATTERN = re.compile(r'@v\d{14}$')
+GC_GRACE_SECONDS = int(os.environ.get('RELEASE_GC_GRACE_HOURS', 24)) * 3600
+
+def release_key(release_path):
+    """Ключ релиза - путь к папке с '/' в качестве разделителя."""
+    return release_path.replace("\\", "/").rstrip('/')
+
+def new_version():
+    return datetime.now(timezone.utc).strftime('v%Y%m%d%H%M%S')
+
+def strip_version(release_folder_name):
+    """'Album. X@v20260101120000' -> 'Album. X'"""
+    return VERSION_PATTERN.sub('', release_folder_name)
+
+def load_release_versions():
+    try:
+        with open(VERSIONS_FILE, 'r', encoding='utf-8') as f:
+            versions = json.load(f)
+    except (OSError, ValueError):
+        versions = {}
+    versions.setdefault('releases', {})
+    versions.setdefault('retired', [])
+    return versions
+
+def save_release_versions(versions):
+    """Атомарно сохраняет манифест версий."""
+    with open(VERSIONS_FILE + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(versions, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(VERSIONS_FILE + '.tmp', VERSIONS_FILE)
+
+def release_blob_dir(release_path, versions):
+    """Папка релиза в blob с учётом текущей версии."""
+    key = release_key(release_path)
+    version = versions['releases'].get(key)
+    return f"{key}{VERSION_SEPARATOR}{version}" if version else key
+
+def blob_path_for(local_path, versions):
+    """Путь файла в blob: файлы релиза с версией попадают в папку этой версии."""
+    local_path = local_path.replace("\\", "/")
+    release_path, filename = os.path.split(local_path)
+    if release_path in versions['releases']:
+        return f"{release_blob_dir(release_path, versions)}/{filename}"
+    return local_path
+
+def publish_version(versions, release_path, version, retired_dirs):
+    """
+    Переключает релиз на новую версию; прежние папки в blob
+    помечаются как выведенные из обращения и ждут сборки мусора
+    """
+    new_dir = f"{release_key(release_path)}{VERSION_SEPARATOR}{version}"
+    retired_at = time.time()
+    known = {entry['prefix'] for entry in versions['retired']}
+    for blob_dir in retired_dirs:
+        if blob_dir != new_dir and blob_dir not in known:
+            versions['retired'].append({'prefix': blob_dir, 'retired_at': retired_at})
+    versions['releases'][release_key(release_path)] = version
+
+def retired_dirs_due(versions, grace_seconds=GC_GRACE_SECONDS, now=None):
+    """Выведенные папки, для которых истёк льготный период."""
+    now = now or time.time()
+    return [entry for entry in versions['retired'] if now - entry['retired_at'] >= grace_seconds]
+
+def is_retired(blob_path, versions):
+    return any(blob_path.startswith(entry['prefix'] + '/') for entry in versions['retired'])
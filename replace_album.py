@@ -1,75 +1,32 @@
 # replace_album.py - Замена целого альбома исполнителя
 
 import os
-import mimetypes
 import dotenv
-from vercel_blob import put, list as blob_list, delete
 from dotenv import load_dotenv
-import urllib.parse
+from blob_index import load_blob_index
+from blob_transfer import make_upload_job, upload_files, print_upload_report, delete_files, print_delete_report, UPLOAD_CONCURRENCY
+from blob_sync import sync_directory, sync_renditions
+from release_versions import (
+    load_release_versions, save_release_versions, new_version, publish_version,
+    release_key, release_blob_dir, retired_dirs_due, VERSION_SEPARATOR, GC_GRACE_SECONDS
+)
+from build_playlist import create_playlist_data
 
 # Загрузка переменных окружения
 dotenv.load_dotenv('.env.development.local')
 
 MUSIC_DIR = 'music'
 
-def find_album_files_in_blob(artist_name, album_name):
+def upload_album_to_blob(local_album_path, blob_dir=None):
     """
-    Найти все файлы альбома в blob по имени исполнителя и альбома
-    """
-    try:
-        blobs = blob_list({'limit': '1000'})
-        album_files = []
-        
-        for blob in blobs['blobs']:
-            # Декодируем URL-encoded путь
-            decoded_path = urllib.parse.unquote(blob['pathname'])
-            
-            # Проверяем, содержит ли путь имя исполнителя и альбома
-            if artist_name.lower() in decoded_path.lower() and album_name.lower() in decoded_path.lower():
-                album_files.append({
-                    'pathname': blob['pathname'],
-                    'decoded_path': decoded_path,
-                    'url': blob['url'],
-                    'size': blob['size']
-                })
-        
-        return album_files
-    except Exception as e:
-        print(f"❌ Ошибка поиска альбома: {e}")
-        return []
+    Загрузить альбом в blob
 
-def delete_album_from_blob(artist_name, album_name):
-    """
-    Удалить все файлы альбома из blob
-    """
-    print(f"--- Удаление альбома '{album_name}' исполнителя '{artist_name}' ---")
-    
-    album_files = find_album_files_in_blob(artist_name, album_name)
-    
-    if not album_files:
-        print(f"❌ Альбом не найден в blob")
-        return False
-    
-    print(f"Найдено {len(album_files)} файлов для удаления:")
-    for file in album_files:
-        print(f"  - {file['decoded_path']}")
-    
-    # Удаляем все файлы
-    deleted_count = 0
-    for file in album_files:
-        try:
-            delete(file['url'])
-            print(f"✅ Удален: {file['decoded_path']}")
-            deleted_count += 1
-        except Exception as e:
-            print(f"❌ Ошибка удаления {file['decoded_path']}: {e}")
-    
-    print(f"Удалено {deleted_count} из {len(album_files)} файлов")
-    return deleted_count > 0
+    Args:
+        local_album_path: Папка альбома на диске
+        blob_dir: Папка в blob (по умолчанию совпадает с локальной)
 
-def upload_album_to_blob(local_album_path):
-    """
-    Загрузить альбом в blob
+    Returns:
+        True, если загружены все файлы
     """
     print(f"--- Загрузка альбома из '{local_album_path}' ---")
     
@@ -77,8 +34,7 @@ def upload_album_to_blob(local_album_path):
         print(f"❌ Папка '{local_album_path}' не найдена")
         return False
     
-    uploaded_count = 0
-    total_files = 0
+    jobs = []
     
     # Проходим по всем файлам в папке альбома
     for root, dirs, files in os.walk(local_album_path):
@@ -86,70 +42,129 @@ def upload_album_to_blob(local_album_path):
             if filename.startswith('.'):
                 continue
             
-            # Поддерживаем только аудиофайлы
-            if not filename.lower().endswith(('.mp3', '.wav', '.flac', '.m4a', '.ogg')):
+            # Поддерживаем только аудиофайлы и обложки
+            if not filename.lower().endswith(('.mp3', '.wav', '.flac', '.m4a', '.ogg', '.jpg', '.jpeg', '.png')):
                 continue
             
-            total_files += 1
             local_path = os.path.join(root, filename)
-            blob_path = local_path.replace("\\", "/")
-            
-            print(f"  Загрузка: {local_path} -> {blob_path}")
-            
-            try:
-                with open(local_path, 'rb') as f:
-                    file_content = f.read()
-                    
-                    content_type, _ = mimetypes.guess_type(local_path)
-                    if content_type is None:
-                        content_type = 'application/octet-stream'
-
-                    blob_result = put(blob_path, file_content, options={
-                        'content_type': content_type,
-                        'allowOverwrite': True
-                    })
-                    
-                    print(f"    ✅ Успешно! URL: {blob_result['url']}")
-                    uploaded_count += 1
-                    
-            except Exception as e:
-                print(f"    ❌ ОШИБКА: {e}")
+            if blob_dir:
+                blob_path = f"{blob_dir}/{os.path.relpath(local_path, local_album_path)}".replace("\\", "/")
+            else:
+                blob_path = local_path.replace("\\", "/")
+            jobs.append(make_upload_job(local_path, blob_path))
     
-    print(f"Загружено {uploaded_count} из {total_files} файлов")
-    return uploaded_count > 0
+    print(f"  Файлов к загрузке: {len(jobs)} (параллельно: {UPLOAD_CONCURRENCY})")
+    report = upload_files(jobs, options={'allowOverwrite': True})
+    
+    print(f"Загружено {len(report['uploaded'])} из {len(jobs)} файлов")
+    print_upload_report(report)
+    return len(report['uploaded']) > 0 and not report['failed']
 
-def replace_album(artist_name, album_name, new_local_album_path):
+def replace_album(release_path):
     """
-    Заменить альбом: удалить старый и загрузить новый
+    Заменить альбом без простоя
+
+    Новая версия загружается в отдельную папку "<релиз>@<версия>", пока старая
+    продолжает играть. Только после полной загрузки версия записывается в
+    release-versions.json и каталог пересобирается. Старые файлы удаляет
+    collect_garbage() после деплоя нового каталога.
+
+    Args:
+        release_path: Папка релиза внутри music/ (например,
+            "music/<исполнитель>/<релиз>"), в которую уже положены новые
+            файлы. Имя папки не меняется: по нему релиз записан в манифесте
+            версий, и из неё build_playlist.py собирает каталог.
     """
     print(f"=== ЗАМЕНА АЛЬБОМА ===")
-    print(f"Исполнитель: {artist_name}")
-    print(f"Альбом: {album_name}")
-    print(f"Новый путь: {new_local_album_path}")
+    print(f"Релиз: {release_path}")
     print()
     
-    # Шаг 1: Удаляем старый альбом
-    if delete_album_from_blob(artist_name, album_name):
-        print("✅ Старый альбом успешно удален")
+    if not os.path.isdir(release_path):
+        print(f"❌ Папка '{release_path}' не найдена")
+        print("=== ЗАМЕНА ПРОВАЛЕНА ===")
+        return False
+    
+    # Шаг 1: Текущую папку релиза берём из манифеста версий - именно на неё
+    # ссылается каталог. Поиск по имени в blob здесь не годится: он находит и
+    # уже выведенные папки, а живую версию "@v..." может пропустить.
+    versions = load_release_versions()
+    old_dir = release_blob_dir(release_path, versions)
+    old_files = load_blob_index(refresh=True).under_prefix(old_dir + '/')
+    if old_files:
+        print(f"Текущая версия в blob: {old_dir} ({len(old_files)} файлов)")
     else:
-        print("⚠️  Старый альбом не найден или не удален")
+        print(f"⚠️  В blob нет файлов текущей версии ({old_dir})")
     
     print()
     
-    # Шаг 2: Загружаем новый альбом
-    if upload_album_to_blob(new_local_album_path):
-        print("✅ Новый альбом успешно загружен")
-        print("=== ЗАМЕНА ЗАВЕРШЕНА ===")
-        return True
-    else:
-        print("❌ Ошибка загрузки нового альбома")
+    # Шаг 2: Загружаем новую версию в отдельную папку; старая остаётся доступной
+    version = new_version()
+    blob_dir = f"{release_key(release_path)}{VERSION_SEPARATOR}{version}"
+    if not upload_album_to_blob(release_path, blob_dir):
+        print("❌ Ошибка загрузки нового альбома - каталог не изменён, старая версия продолжает работать")
         print("=== ЗАМЕНА ПРОВАЛЕНА ===")
         return False
+    print(f"✅ Новая версия загружена: {blob_dir}")
+    
+    # Шаг 3: Переключаем каталог на новую версию; выводится ровно прежняя папка
+    publish_version(versions, release_path, version, [old_dir])
+    save_release_versions(versions)
+    create_playlist_data()
+    sync_renditions()
+    
+    print()
+    print("✅ Каталог ссылается на новую версию. Задеплойте playlist-data.js и release-versions.json.")
+    print(f"   Старые файлы удалит collect_garbage() не раньше чем через {GC_GRACE_SECONDS // 3600} ч.")
+    print("=== ЗАМЕНА ЗАВЕРШЕНА ===")
+    return True
+
+def collect_garbage(grace_seconds=GC_GRACE_SECONDS, dry_run=False):
+    """
+    Удалить из blob старые версии релизов, выведенные из каталога
+    больше grace_seconds назад
+    """
+    print("=== СБОРКА МУСОРА ===")
+    versions = load_release_versions()
+    due = retired_dirs_due(versions, grace_seconds)
+    if not due:
+        print("Нет старых версий к удалению")
+        return True
+    
+    index = load_blob_index(refresh=True)
+    files = []
+    for entry in due:
+        dir_files = index.under_prefix(entry['prefix'] + '/')
+        print(f"  - {entry['prefix']} ({len(dir_files)} файлов)")
+        files.extend(dir_files)
+    
+    if dry_run:
+        print("=== ПРОБНЫЙ ЗАПУСК: ничего не удалено ===")
+        return True
+    
+    report = delete_files(files)
+    print_delete_report(report)
+    
+    # Запись о папке убираем, только если из неё удалено всё
+    failed_paths = [file['decoded_path'] for file, _ in report['failed']]
+    collected = {entry['prefix'] for entry in due if not any(path.startswith(entry['prefix'] + '/') for path in failed_paths)}
+    versions['retired'] = [entry for entry in versions['retired'] if entry['prefix'] not in collected]
+    save_release_versions(versions)
+    print("=== СБОРКА МУСОРА ЗАВЕРШЕНА ===")
+    return not report['failed']
+
+def sync_album(local_album_path, delete_orphans=True):
+    """
+    Обновить альбом без полной перезаливки: загрузить только изменённые файлы
+    и удалить из blob треки, которых больше нет в папке альбома
+    """
+    return sync_directory(local_album_path, delete_orphans=delete_orphans)
 
 if __name__ == '__main__':
-    # Пример использования
-    replace_album(
-        artist_name="nükorochki",
-        album_name="Grenzgänger",
-        new_local_album_path="music/nükorochki/Album. Grenzgänger - Fixed"
-    )
+    # Пример использования: новые файлы уже лежат в папке релиза
+    replace_album("music/nükorochki/Album. Grenzgänger")
+
+    # Или обновить альбом на месте, загрузив только изменённые треки (закомментировано)
+    # sync_album("music/nükorochki/Album. Grenzgänger")
+
+    # После деплоя нового каталога - удалить старые версии (закомментировано)
+    # collect_garbage()
@@ -1,11 +1,10 @@
 # replace_track.py - С поддержкой URL-кодировки для специальных символов
 
 import os
-import mimetypes
 import dotenv
-from vercel_blob import put, list as blob_list
 from dotenv import load_dotenv
-import urllib.parse
+from blob_transfer import upload_file
+from blob_index import load_blob_index
 
 # Загрузка переменных окружения
 dotenv.load_dotenv('.env.development.local')
@@ -17,16 +16,12 @@ def find_blob_by_filename(target_filename):
     Найти файл в blob по имени файла (игнорируя путь)
     """
     try:
-        blobs = blob_list({'limit': '1000'})
-        for blob in blobs['blobs']:
-            # Декодируем URL-encoded путь
-            decoded_path = urllib.parse.unquote(blob['pathname'])
-            blob_filename = os.path.basename(decoded_path)
-            
-            if blob_filename == target_filename:
-                print(f"✅ Найден файл в blob: {blob['pathname']}")
-                print(f"   Декодированный путь: {decoded_path}")
-                return blob['pathname']
+        matches = load_blob_index().find_by_filename(target_filename)
+        if matches:
+            file = matches[0]
+            print(f"✅ Найден файл в blob: {file['pathname']}")
+            print(f"   Декодированный путь: {file['decoded_path']}")
+            return file['pathname']
         
         print(f"❌ Файл '{target_filename}' не найден в blob")
         return None
@@ -50,23 +45,14 @@ def replace_track_by_filename(filename, new_local_path):
         return None
     
     try:
-        with open(new_local_path, 'rb') as f:
-            file_content = f.read()
-            
-            content_type, _ = mimetypes.guess_type(new_local_path)
-            if content_type is None:
-                content_type = 'application/octet-stream'
-
-            # Используем найденный blob_path для перезаписи
-            blob_result = put(blob_path, file_content, options={
-                'content_type': content_type,
-                'allowOverwrite': True
-            })
-            
-            print(f"✅ Успешно заменён!")
-            print(f"   URL: {blob_result['url']}")
-            print(f"   Blob path: {blob_result['pathname']}")
-            return blob_result
+        # Используем найденный blob_path для перезаписи;
+        # крупные файлы загружаются по частям, без чтения целиком в память
+        blob_result = upload_file(new_local_path, blob_path, options={'allowOverwrite': True})
+        
+        print(f"✅ Успешно заменён!")
+        print(f"   URL: {blob_result['url']}")
+        print(f"   Blob path: {blob_result['pathname']}")
+        return blob_result
             
     except FileNotFoundError:
         print(f"❌ ОШИБКА: Файл '{new_local_path}' не найден на диске")
@@ -88,25 +74,15 @@ def replace_track_by_exact_path(blob_path, new_local_path):
     print(f"Локальный файл: {new_local_path}")
     
     try:
-        with open(new_local_path, 'rb') as f:
-            file_content = f.read()
-            
-            content_type, _ = mimetypes.guess_type(new_local_path)
-            if content_type is None:
-                content_type = 'application/octet-stream'
-
-            # Убираем ведущий слеш если есть
-            clean_blob_path = blob_path.lstrip('/')
-            
-            blob_result = put(clean_blob_path, file_content, options={
-                'content_type': content_type,
-                'allowOverwrite': True
-            })
-            
-            print(f"✅ Успешно заменён!")
-            print(f"   URL: {blob_result['url']}")
-            print(f"   Blob path: {blob_result['pathname']}")
-            return blob_result
+        # Убираем ведущий слеш если есть
+        clean_blob_path = blob_path.lstrip('/')
+        
+        blob_result = upload_file(new_local_path, clean_blob_path, options={'allowOverwrite': True})
+        
+        print(f"✅ Успешно заменён!")
+        print(f"   URL: {blob_result['url']}")
+        print(f"   Blob path: {blob_result['pathname']}")
+        return blob_result
             
     except FileNotFoundError:
         print(f"❌ ОШИБКА: Файл '{new_local_path}' не найден на диске")
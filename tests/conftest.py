@@ -0,0 +1,112 @@
+# tests/conftest.py - Общие фикстуры тестов аналитики
+#
+# Redis подменяется fakeredis (с lupa для Lua-скриптов):
+#   pip install -r requirements-dev.txt && python -m pytest
+import io
+import os
+import sys
+from email.message import Message
+from datetime import datetime, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('ANALYTICS_LISTENER_SALT', 'test-salt')
+os.environ.setdefault('STATS_API_SECRET', 'test-secret')
+os.environ.setdefault('REDIS_URL', 'redis://localhost:6379/0')
+
+import fakeredis
+from api._analytics import validate_events, describe_client
+from sample_data import TRACK_URL, OTHER_TRACK_URL, USER_AGENT
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def events():
+    """Проверенный пакет: засчитанное прослушивание, пропуск и ещё одно прослушивание."""
+    events, results = validate_events([
+        {'trackId': TRACK_URL, 'eventType': '30s_listen'},
+        {'trackId': TRACK_URL, 'eventType': 'track_skipped'},
+        {'trackId': OTHER_TRACK_URL, 'eventType': '30s_listen'},
+    ], datetime.now(timezone.utc))
+    assert all(result['status'] == 'ok' for result in results)
+    return events
+
+
+@pytest.fixture
+def client():
+    return describe_client(USER_AGENT, '203.0.113.7', 'DE')
+
+
+def _dump_state(redis_client):
+    """Всё содержимое Redis в сравнимом виде; у записей журнала сравниваются только поля."""
+    state = {}
+    for key in sorted(redis_client.keys('*')):
+        key_type = redis_client.type(key)
+        if key_type == b'hash':
+            value = redis_client.hgetall(key)
+        elif key_type == b'zset':
+            value = redis_client.zrange(key, 0, -1, withscores=True)
+        elif key_type == b'stream':
+            value = [fields for _, fields in redis_client.xrange(key)]
+        elif key.startswith(b'v2:uniq:'):
+            value = redis_client.pfcount(key)
+        else:
+            value = redis_client.get(key)
+        state[key] = (key_type, value, redis_client.ttl(key) > 0)
+    return state
+
+
+@pytest.fixture
+def dump_state():
+    return _dump_state
+
+
+def _call_handler(handler_class, method, path, body=b'', headers=None):
+    """
+    Выполняет запрос к обработчику BaseHTTPRequestHandler без сокета.
+
+    Returns:
+        (status, headers, body) - имена заголовков в нижнем регистре.
+    """
+    handler = handler_class.__new__(handler_class)
+    handler.rfile = io.BytesIO(body)
+    handler.wfile = io.BytesIO()
+    handler.command = method
+    handler.path = path
+    handler.request_version = 'HTTP/1.1'
+    handler.requestline = f'{method} {path} HTTP/1.1'
+    handler.client_address = ('127.0.0.1', 0)
+    handler.headers = Message()
+    for name, value in (headers or {}).items():
+        handler.headers[name] = value
+    if body:
+        handler.headers['Content-Length'] = str(len(body))
+    getattr(handler, f'do_{method}')()
+
+    head, _, response_body = handler.wfile.getvalue().partition(b'\r\n\r\n')
+    status_line, *header_lines = head.decode('latin-1').split('\r\n')
+    response_headers = dict(line.split(': ', 1) for line in header_lines)
+    return int(status_line.split()[1]), {name.lower(): value for name, value in response_headers.items()}, response_body
+
+
+@pytest.fixture
+def call_handler():
+    return _call_handler
+
+
+@pytest.fixture
+def sync_redis(redis_server, monkeypatch):
+    """Подменяет пул Redis обработчиков api/listen.py и api/stats.py на fakeredis."""
+    import api.listen
+    import api.stats
+
+    def get_client(decode_responses=False):
+        return fakeredis.FakeRedis(server=redis_server, decode_responses=decode_responses)
+    monkeypatch.setattr(api.listen, 'get_redis_client', get_client)
+    monkeypatch.setattr(api.stats, 'get_redis_client', get_client)
+    return get_client
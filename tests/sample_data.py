@@ -0,0 +1,4 @@
+# tests/sample_data.py - Данные запросов, общие для тестов
+TRACK_URL = 'https://blob.example/music/artist/Album. First@v20260101000000/01 Song.mp3'
+OTHER_TRACK_URL = 'https://blob.example/music/artist/Album. First/02 Other.mp3'
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36'
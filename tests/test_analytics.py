@@ -0,0 +1,38 @@
+# tests/test_analytics.py - Запись событий: Lua-скрипт и конвейер
+import fakeredis
+import pytest
+
+from api._analytics import record_events, queue_events
+
+
+def record_with_pipeline(redis_client, events, client):
+    pipe = redis_client.pipeline()
+    queue_events(pipe, events, client)
+    pipe.execute()
+
+
+@pytest.mark.parametrize('batches', [1, 3])
+def test_event_script_matches_pipeline(events, client, dump_state, batches):
+    scripted = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+    pipelined = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+
+    for _ in range(batches):
+        record_events(scripted, events, client)
+        record_with_pipeline(pipelined, events, client)
+
+    state = dump_state(scripted)
+    assert state == dump_state(pipelined)
+    assert state[b'v2:stats:version'][1] == str(batches).encode()
+    assert sum(int(count) for count in scripted.hgetall('v2:listen_counts').values()) == 2 * batches
+
+
+def test_event_script_skips_unique_listeners_without_listener(events, client, dump_state):
+    client = {**client, 'listener': None}
+    scripted = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+    pipelined = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+
+    record_events(scripted, events, client)
+    record_with_pipeline(pipelined, events, client)
+
+    assert dump_state(scripted) == dump_state(pipelined)
+    assert not scripted.keys('v2:uniq:*')
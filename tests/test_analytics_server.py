@@ -0,0 +1,165 @@
+# tests/test_analytics_server.py - Асинхронный сервер: маршруты и буфер записи
+import asyncio
+import json
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+import analytics_server
+from sample_data import TRACK_URL, USER_AGENT
+
+
+class SlowPipeline:
+    """Конвейер, который выполняется только после release."""
+
+    def __init__(self, pipe, started, release):
+        self._pipe = pipe
+        self._started = started
+        self._release = release
+
+    def __getattr__(self, name):
+        return getattr(self._pipe, name)
+
+    async def execute(self):
+        self._started.set()
+        await self._release.wait()
+        return await self._pipe.execute()
+
+
+@pytest.fixture
+def async_redis(redis_server, monkeypatch):
+    def get_client(decode_responses=False):
+        return fakeredis.aioredis.FakeRedis(server=redis_server, decode_responses=decode_responses)
+    monkeypatch.setattr(analytics_server, 'get_async_redis_client', get_client)
+    return get_client
+
+
+def slow_redis(redis_server, started, release):
+    def get_client(decode_responses=False):
+        redis_client = fakeredis.aioredis.FakeRedis(server=redis_server, decode_responses=decode_responses)
+        pipeline = redis_client.pipeline
+        redis_client.pipeline = lambda *args, **kwargs: SlowPipeline(pipeline(*args, **kwargs), started, release)
+        return redis_client
+    return get_client
+
+
+def test_cancelled_flush_returns_batch_to_buffer(redis_server, async_redis, monkeypatch, events, client):
+    async def scenario():
+        started, release = asyncio.Event(), asyncio.Event()
+        monkeypatch.setattr(analytics_server, 'get_async_redis_client', slow_redis(redis_server, started, release))
+        flusher = analytics_server.BufferFlusher(interval=3600)
+        flusher.buffer.queue(events, client)
+
+        flush = asyncio.create_task(flusher.flush())
+        await started.wait()
+        flush.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await flush
+        assert len(flusher.buffer) == len(events)
+
+        monkeypatch.setattr(analytics_server, 'get_async_redis_client', async_redis)
+        await flusher.stop()
+        assert len(flusher.buffer) == 0
+        return await async_redis(decode_responses=True).hgetall('v2:listen_counts')
+
+    listen_counts = asyncio.run(scenario())
+    assert sum(int(count) for count in listen_counts.values()) == 2
+
+
+def test_stop_waits_for_running_flush(redis_server, monkeypatch, events, client):
+    async def scenario():
+        started, release = asyncio.Event(), asyncio.Event()
+        monkeypatch.setattr(analytics_server, 'get_async_redis_client', slow_redis(redis_server, started, release))
+        flusher = analytics_server.BufferFlusher(interval=3600, max_events=1)
+        flusher.add(events, client)
+        await started.wait()
+
+        stop = asyncio.create_task(flusher.stop())
+        await asyncio.sleep(0)
+        assert not stop.done()
+        release.set()
+        await stop
+        assert len(flusher.buffer) == 0
+        return await fakeredis.aioredis.FakeRedis(server=redis_server, decode_responses=True).hgetall('v2:listen_counts')
+
+    listen_counts = asyncio.run(scenario())
+    assert sum(int(count) for count in listen_counts.values()) == 2
+
+
+def call_app(method, path, body=b'', headers=None, query_string=b''):
+    """Выполняет один HTTP-запрос к ASGI-приложению; возвращает (status, headers, body)."""
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        'type': 'http', 'method': method, 'path': path, 'query_string': query_string,
+        'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in (headers or {}).items()],
+    }
+    asyncio.run(analytics_server.app(scope, receive, send))
+    start, response = sent
+    return start['status'], {name.decode(): value.decode() for name, value in start['headers']}, response['body']
+
+
+def test_listen_records_events(async_redis, redis_server):
+    status, _, _ = call_app('POST', '/api/listen', json.dumps({'trackId': TRACK_URL, 'eventType': '30s_listen'}).encode(),
+                            {'User-Agent': USER_AGENT})
+    assert status == 204
+
+    status, _, body = call_app('POST', '/api/listen', json.dumps([
+        {'trackId': TRACK_URL, 'eventType': '30s_listen'}, {'eventType': '30s_listen'},
+    ]).encode(), {'User-Agent': USER_AGENT})
+    assert status == 200
+    assert json.loads(body)['accepted'] == 1
+    assert fakeredis.FakeRedis(server=redis_server).hget('v2:listen_counts', TRACK_URL) == b'2'
+
+
+@pytest.mark.parametrize('body, status', [
+    (b'', 400),
+    (b'{not json', 400),
+    (b' ' * (analytics_server.MAX_BODY_SIZE + 1), 413),
+])
+def test_listen_rejects_bad_bodies(async_redis, body, status):
+    assert call_app('POST', '/api/listen', body)[0] == status
+
+
+def test_stats_snapshot_and_etag(async_redis):
+    call_app('POST', '/api/listen', json.dumps({'trackId': TRACK_URL, 'eventType': '30s_listen'}).encode())
+    auth = {'Authorization': 'Bearer test-secret'}
+
+    status, headers, body = call_app('GET', '/api/stats', headers=auth)
+    assert status == 200
+    assert json.loads(body)['track_stats']['artist']['total_plays'] == 1
+
+    status, _, body = call_app('GET', '/api/stats', headers={**auth, 'If-None-Match': headers['etag']})
+    assert (status, body) == (304, b'')
+
+    assert call_app('GET', '/api/stats', headers=auth, query_string=b'top=many')[0] == 400
+    assert call_app('GET', '/api/stats')[0] == 401
+
+
+def test_unknown_route_and_method(async_redis):
+    assert call_app('GET', '/api/unknown')[0] == 404
+    status, headers, _ = call_app('GET', '/api/listen')
+    assert (status, headers['allow']) == (405, 'POST')
+
+
+def test_redis_outage_returns_503_without_resetting_pool(monkeypatch):
+    class BrokenRedis(fakeredis.aioredis.FakeRedis):
+        async def execute_command(self, *args, **kwargs):
+            raise RedisConnectionError("Connection reset by peer")
+
+    async def reset_pool():
+        raise AssertionError("the shared pool must not be reset")
+
+    monkeypatch.setattr(analytics_server, 'get_async_redis_client', lambda decode_responses=False: BrokenRedis())
+    monkeypatch.setattr(analytics_server, 'reset_async_redis_pool', reset_pool)
+    status, _, _ = call_app('POST', '/api/listen', json.dumps({'trackId': TRACK_URL, 'eventType': '30s_listen'}).encode())
+    assert status == 503
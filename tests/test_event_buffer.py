@@ -0,0 +1,72 @@
+# tests/test_event_buffer.py - Буфер записи событий
+import fakeredis
+
+from api._analytics import queue_events, DIAGNOSTIC_LOG_MAXLEN
+from api._event_buffer import EventBuffer
+
+
+def apply_buffer(redis_client, buffer):
+    pipe = redis_client.pipeline()
+    buffer.apply(pipe)
+    pipe.execute()
+
+
+def test_apply_matches_direct_pipeline(events, client, dump_state):
+    buffered = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+    direct = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+
+    buffer = EventBuffer()
+    for _ in range(3):
+        buffer.queue(events, client)
+        pipe = direct.pipeline()
+        queue_events(pipe, events, client)
+        pipe.execute()
+    apply_buffer(buffered, buffer)
+
+    assert len(buffer) == 3 * len(events)
+    assert dump_state(buffered) == dump_state(direct)
+
+
+def test_counters_are_coalesced(events, client):
+    buffer = EventBuffer()
+    buffer.queue(events, client)
+    single_batch = len(buffer.counters)
+    buffer.queue(events, client)
+
+    assert len(buffer.counters) == single_batch
+    assert buffer.counters[('hincrby', 'v2:listen_counts', events[0]['trackId'])] == 2
+
+
+def test_take_empties_buffer(events, client):
+    buffer = EventBuffer()
+    buffer.queue(events, client)
+    taken = buffer.take()
+
+    assert len(taken) == len(events)
+    assert len(buffer) == 0
+    assert not buffer.counters and not buffer.unique and not buffer.expires and not buffer.log_entries
+
+
+def test_merge_restores_taken_batch(events, client):
+    buffer = EventBuffer()
+    buffer.queue(events, client)
+    taken = buffer.take()
+    buffer.queue(events, client)
+    buffer.merge(taken)
+
+    expected = EventBuffer()
+    expected.queue(events, client)
+    expected.queue(events, client)
+    assert len(buffer) == len(expected)
+    assert buffer.counters == expected.counters
+    assert buffer.unique == expected.unique
+    assert buffer.expires == expected.expires
+    # Возвращённые записи журнала идут раньше новых
+    assert buffer.log_entries[:len(taken.log_entries)] == taken.log_entries
+
+
+def test_log_entries_are_capped(events, client):
+    buffer = EventBuffer()
+    for _ in range(DIAGNOSTIC_LOG_MAXLEN // len(events) + 2):
+        buffer.queue(events, client)
+    assert len(buffer.log_entries) == DIAGNOSTIC_LOG_MAXLEN
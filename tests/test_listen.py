@@ -0,0 +1,70 @@
+# tests/test_listen.py - Обработчик /api/listen
+import json
+
+import pytest
+
+from api._analytics import MAX_BATCH_SIZE
+from api.listen import handler
+from sample_data import TRACK_URL, OTHER_TRACK_URL, USER_AGENT
+
+
+def post(call_handler, payload, raw=None):
+    body = raw if raw is not None else json.dumps(payload).encode('utf-8')
+    return call_handler(handler, 'POST', '/api/listen', body, {'User-Agent': USER_AGENT, 'X-Vercel-IP-Country': 'DE'})
+
+
+def listen_counts(sync_redis):
+    return {track: int(count) for track, count in sync_redis(decode_responses=True).hgetall('v2:listen_counts').items()}
+
+
+def test_single_event_is_recorded(call_handler, sync_redis):
+    status, _, body = post(call_handler, {'trackId': TRACK_URL, 'eventType': '30s_listen'})
+
+    assert status == 204
+    assert body == b''
+    assert listen_counts(sync_redis) == {TRACK_URL: 1}
+
+
+def test_batch_reports_each_event(call_handler, sync_redis):
+    status, _, body = post(call_handler, {'events': [
+        {'trackId': TRACK_URL, 'eventType': '30s_listen'},
+        {'trackId': OTHER_TRACK_URL, 'eventType': '30s_listen'},
+        {'eventType': '30s_listen'},
+    ]})
+
+    assert status == 200
+    response = json.loads(body)
+    assert (response['accepted'], response['rejected']) == (2, 1)
+    assert [result['status'] for result in response['results']] == ['ok', 'ok', 'error']
+    assert listen_counts(sync_redis) == {TRACK_URL: 1, OTHER_TRACK_URL: 1}
+
+
+@pytest.mark.parametrize('payload, raw', [
+    (None, b''),
+    (None, b'{not json'),
+    ([], None),
+    ({'eventType': '30s_listen'}, None),
+    ({'trackId': TRACK_URL, 'eventType': 'bad|type'}, None),
+    ({'trackId': TRACK_URL, 'eventType': '30s_listen', 'timestamp': 'yesterday'}, None),
+])
+def test_invalid_requests_are_rejected(call_handler, sync_redis, payload, raw):
+    status, _, body = post(call_handler, payload, raw)
+
+    assert status == 400
+    assert 'error' in json.loads(body)
+    assert listen_counts(sync_redis) == {}
+
+
+def test_batch_without_valid_events_is_rejected(call_handler, sync_redis):
+    status, _, body = post(call_handler, [{'eventType': '30s_listen'}, {'trackId': TRACK_URL, 'eventType': 'bad|type'}])
+
+    assert status == 400
+    assert json.loads(body)['rejected'] == 2
+    assert listen_counts(sync_redis) == {}
+
+
+def test_oversized_batch_is_rejected(call_handler, sync_redis):
+    status, _, _ = post(call_handler, [{'trackId': TRACK_URL, 'eventType': '30s_listen'}] * (MAX_BATCH_SIZE + 1))
+
+    assert status == 413
+    assert listen_counts(sync_redis) == {}
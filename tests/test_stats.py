@@ -0,0 +1,103 @@
+# tests/test_stats.py - Обработчик /api/stats
+import json
+
+import pytest
+
+import api._stats_report
+from api._analytics import record_events
+from api.stats import handler
+
+AUTH = {'Authorization': 'Bearer test-secret'}
+
+
+def get(call_handler, path='/api/stats', headers=AUTH):
+    return call_handler(handler, 'GET', path, headers=headers)
+
+
+@pytest.fixture
+def recorded(sync_redis, events, client):
+    record_events(sync_redis(), events, client)
+    return sync_redis
+
+
+def test_overview_is_served_from_snapshot(call_handler, recorded):
+    status, headers, body = get(call_handler)
+
+    assert status == 200
+    assert headers['etag'] == '"stats-v1"'
+    stats = json.loads(body)
+    assert stats['track_stats']['artist']['total_plays'] == 2
+    assert stats['unique_listeners']['period'] == 1
+    assert recorded(decode_responses=True).hget('v2:stats:snapshot', 'version') == '1'
+
+
+def test_matching_etag_returns_304(call_handler, recorded):
+    _, headers, _ = get(call_handler)
+    status, _, body = get(call_handler, headers={**AUTH, 'If-None-Match': headers['etag']})
+
+    assert status == 304
+    assert body == b''
+
+
+def test_snapshot_is_rebuilt_after_new_events(call_handler, recorded, monkeypatch, events, client):
+    get(call_handler)
+    record_events(recorded(), events, client)
+
+    # Снимок младше STATS_SNAPSHOT_MIN_AGE отдаётся как есть
+    assert get(call_handler)[1]['etag'] == '"stats-v1"'
+
+    monkeypatch.setattr(api._stats_report, 'STATS_SNAPSHOT_MIN_AGE', 0)
+    status, headers, body = get(call_handler)
+    assert status == 200
+    assert headers['etag'] == '"stats-v2"'
+    assert json.loads(body)['track_stats']['artist']['total_plays'] == 4
+
+
+def test_log_page_bypasses_snapshot(call_handler, recorded):
+    status, headers, body = get(call_handler, '/api/stats?logs_limit=1')
+
+    assert status == 200
+    assert 'etag' not in headers
+    stats = json.loads(body)
+    assert len(stats['diagnostic_logs']) == 1
+    assert stats['diagnostic_logs_cursor'] == stats['diagnostic_logs'][0]['id']
+
+
+@pytest.mark.parametrize('since', ['1960-01-01', '2000-01-01T00:00:00Z'])
+def test_log_since_before_retention_reads_whole_log(call_handler, recorded, since):
+    status, _, body = get(call_handler, f'/api/stats?logs_since={since}')
+
+    assert status == 200
+    assert len(json.loads(body)['diagnostic_logs']) == 3
+
+
+def test_top_and_series(call_handler, recorded):
+    status, _, body = get(call_handler, '/api/stats?top=1')
+    assert status == 200
+    assert [(track['rank'], track['plays']) for track in json.loads(body)['tracks']] == [(1, 1)]
+
+    status, _, body = get(call_handler, '/api/stats?series=plays&granularity=hour')
+    assert status == 200
+    assert sum(json.loads(body)['buckets'][-1]['values'].values()) == 2
+
+
+def test_missing_token_is_unauthorized(call_handler, recorded):
+    assert get(call_handler, headers={})[0] == 401
+
+
+@pytest.mark.parametrize('query', [
+    'logs_limit=many',
+    'logs_before=not-a-cursor',
+    'logs_before=99999999999999999-0',
+    'series=plays&granularity=week',
+    'series=plays&from=2026-01-02&to=2026-01-01',
+    'series=plays&to=0001-01-02',
+    'series=plays&granularity=month&from=9999-01-01&to=9999-12-31',
+    'top=many',
+    'top=5&artist=artist&date=2026-01-01',
+])
+def test_invalid_query_returns_400(call_handler, recorded, query):
+    status, _, body = get(call_handler, f'/api/stats?{query}')
+
+    assert status == 400
+    assert 'error' in json.loads(body)
@@ -0,0 +1,93 @@
+# transcode.py - Потоковые версии треков (низкий и высокий битрейт) через ffmpeg
+
+import os
+import shutil
+import subprocess
+from mutagen import File as MutagenFile
+from audio_analysis import FFMPEG
+
+# Для каждого исходника создаются mp3-версии из RENDITIONS. Файлы называются
+# по хешу содержимого исходника, поэтому перекодирование выполняется один раз
+# на файл, а в blob версии лежат по неизменяемым путям
+# renditions/<хеш>/<версия>.mp3 и загружаются через blob_sync.sync_renditions().
+RENDITIONS_DIR = '.renditions'
+RENDITION_BLOB_PREFIX = 'renditions'
+RENDITIONS = {
+    'low': int(os.environ.get('RENDITION_LOW_KBPS', 96)),
+    'high': int(os.environ.get('RENDITION_HIGH_KBPS', 256)),
+}
+LOSSLESS_EXTENSIONS = ('.wav', '.flac')
+# Сжатый исходник перекодируется только в версии заметно ниже его битрейта:
+# повторное сжатие на близком битрейте лишь ухудшает звук
+LOSSY_BITRATE_MARGIN = 1.25
+# ffmpeg - отдельный процесс, поэтому параллельность обеспечивают потоки
+TRANSCODE_WORKERS = int(os.environ.get('TRANSCODE_WORKERS', os.cpu_count() or 1))
+
+def encoder_available():
+    return shutil.which(FFMPEG) is not None
+
+def rendition_file_name(sha256, name):
+    return f"{sha256[:16]}.{name}.mp3"
+
+def rendition_blob_path(sha256, name):
+    return f"{RENDITION_BLOB_PREFIX}/{sha256[:16]}/{name}.mp3"
+
+def rendition_blob_path_for_file(file_name):
+    """'<хеш>.<версия>.mp3' -> путь этой версии в blob."""
+    digest, name, _ = file_name.split('.', 2)
+    return f"{RENDITION_BLOB_PREFIX}/{digest}/{name}.mp3"
+
+def planned_renditions(source_path):
+    """Какие версии имеет смысл делать из исходника."""
+    if source_path.lower().endswith(LOSSLESS_EXTENSIONS):
+        return list(RENDITIONS)
+    try:
+        bitrate_kbps = MutagenFile(source_path).info.bitrate // 1000
+    except Exception:
+        return []
+    return [name for name, kbps in RENDITIONS.items() if kbps * LOSSY_BITRATE_MARGIN <= bitrate_kbps]
+
+def transcode_rendition(source_path, output_path, kbps):
+    """Кодирует исходник в mp3 (CBR kbps) атомарно: через временный файл."""
+    tmp_path = f"{output_path}.{os.getpid()}.tmp.mp3"
+    result = subprocess.run(
+        [FFMPEG, '-v', 'error', '-nostdin', '-y', '-i', source_path,
+         '-vn', '-codec:a', 'libmp3lame', '-b:a', f'{kbps}k', '-ar', '44100', tmp_path],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=False
+    )
+    if result.returncode != 0:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise RuntimeError(f"ffmpeg: {result.stderr.decode('utf-8', 'replace').strip()}")
+    os.replace(tmp_path, output_path)
+
+def transcode_file(source_path, sha256):
+    """
+    Создаёт недостающие версии исходника в RENDITIONS_DIR.
+
+    Returns:
+        (ready, failed) - названия готовых версий (например, ['low', 'high'])
+        и версий, которые не удалось создать
+    """
+    os.makedirs(RENDITIONS_DIR, exist_ok=True)
+    ready = []
+    failed = []
+    for name in planned_renditions(source_path):
+        output_path = os.path.join(RENDITIONS_DIR, rendition_file_name(sha256, name))
+        if not os.path.exists(output_path):
+            try:
+                transcode_rendition(source_path, output_path, RENDITIONS[name])
+            except Exception as e:
+                print(f"      ОШИБКА при перекодировании '{source_path}' ({name}): {e}")
+                failed.append(name)
+                continue
+        ready.append(name)
+    return ready, failed
+
+def prune_renditions(hashes):
+    """Удаляет локальные версии исходников, которых больше нет в каталоге."""
+    prefixes = {sha256[:16] for sha256 in hashes}
+    if os.path.isdir(RENDITIONS_DIR):
+        for file_name in os.listdir(RENDITIONS_DIR):
+            if file_name.split('.', 1)[0] not in prefixes:
+                os.remove(os.path.join(RENDITIONS_DIR, file_name))
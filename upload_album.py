@@ -1,13 +1,15 @@
 # upload_album.py - Загрузка нового альбома с обложкой
 
 import os
-import mimetypes
 import dotenv
-from vercel_blob import put
 from dotenv import load_dotenv
 from mutagen.mp3 import MP3
 from mutagen.wave import WAVE
+from mutagen.flac import FLAC
 from mutagen import MutagenError
+from blob_transfer import make_upload_job, upload_files, print_upload_report, UPLOAD_CONCURRENCY
+from blob_sync import sync_renditions
+from release_versions import load_release_versions, release_blob_dir
 
 # Загрузка переменных окружения
 dotenv.load_dotenv('.env.development.local')
@@ -37,6 +39,15 @@ def get_audio_info(file_path):
                 'artist': 'Unknown',
                 'album': 'Unknown'
             }
+        elif file_path.lower().endswith('.flac'):
+            audio = FLAC(file_path)
+            return {
+                'duration': audio.info.length,
+                'bitrate': audio.info.bitrate,
+                'title': audio.get('title', ['Unknown'])[0],
+                'artist': audio.get('artist', ['Unknown'])[0],
+                'album': audio.get('album', ['Unknown'])[0]
+            }
     except MutagenError:
         pass
     
@@ -144,92 +155,33 @@ def upload_album(local_album_path, target_blob_path=None):
         print("❌ Загрузка отменена")
         return False
     
-    # Загружаем файлы
-    uploaded_count = 0
-    failed_count = 0
-    
-    # Загружаем аудиофайлы
-    for i, file in enumerate(audio_files, 1):
-        # Определяем путь в blob
+    # Загружаем файлы параллельно: аудиофайлы и обложку одним пакетом
+    def blob_path_for(file):
         if target_blob_path:
-            blob_path = target_blob_path + '/' + file['filename']
-        else:
-            blob_path = file['local_path'].replace("\\", "/")
-        
-        print(f"\n[{i}/{total_files}] Загрузка: {file['filename']}")
-        print(f"  Путь в blob: {blob_path}")
-        
-        try:
-            with open(file['local_path'], 'rb') as f:
-                file_content = f.read()
-                
-                content_type, _ = mimetypes.guess_type(file['local_path'])
-                if content_type is None:
-                    content_type = 'application/octet-stream'
+            return target_blob_path + '/' + file['filename']
+        return file['local_path'].replace("\\", "/")
 
-                blob_result = put(blob_path, file_content, options={
-                    'content_type': content_type,
-                    'allowOverwrite': True
-                })
-                
-                print(f"  ✅ Успешно! URL: {blob_result['url']}")
-                uploaded_count += 1
-                
-        except Exception as e:
-            print(f"  ❌ ОШИБКА: {e}")
-            failed_count += 1
-    
-    # Загружаем обложку
+    jobs = [make_upload_job(file['local_path'], blob_path_for(file)) for file in audio_files]
+    cover_job = None
     if cover_file:
-        cover_index = len(audio_files) + 1
-        
-        # Определяем путь в blob для обложки
-        if target_blob_path:
-            cover_blob_path = target_blob_path + '/' + cover_file['filename']
-        else:
-            cover_blob_path = cover_file['local_path'].replace("\\", "/")
-        
-        print(f"\n[{cover_index}/{total_files}] Загрузка обложки: {cover_file['filename']}")
-        print(f"  Путь в blob: {cover_blob_path}")
-        
-        try:
-            with open(cover_file['local_path'], 'rb') as f:
-                file_content = f.read()
-                
-                # Определяем MIME-тип для изображения
-                content_type, _ = mimetypes.guess_type(cover_file['local_path'])
-                if content_type is None:
-                    # Fallback для изображений
-                    if cover_file['filename'].lower().endswith(('.jpg', '.jpeg')):
-                        content_type = 'image/jpeg'
-                    elif cover_file['filename'].lower().endswith('.png'):
-                        content_type = 'image/png'
-                    else:
-                        content_type = 'image/jpeg'  # По умолчанию
+        cover_job = make_upload_job(cover_file['local_path'], blob_path_for(cover_file))
+        jobs.append(cover_job)
 
-                blob_result = put(cover_blob_path, file_content, options={
-                    'content_type': content_type,
-                    'allowOverwrite': True
-                })
-                
-                print(f"  ✅ Обложка загружена! URL: {blob_result['url']}")
-                uploaded_count += 1
-                
-        except Exception as e:
-            print(f"  ❌ ОШИБКА загрузки обложки: {e}")
-            failed_count += 1
+    print(f"\n🚀 Загрузка {total_files} файлов (параллельно: {UPLOAD_CONCURRENCY})")
+    report = upload_files(jobs, options={'allowOverwrite': True})
     
     print(f"\n=== РЕЗУЛЬТАТ ЗАГРУЗКИ ===")
-    print(f"✅ Загружено: {uploaded_count}")
-    print(f"❌ Ошибок: {failed_count}")
+    print_upload_report(report)
     print(f"📊 Общий размер: {total_size_mb:.1f} MB")
     
-    if cover_file and uploaded_count > len(audio_files):
+    if cover_job and any(job is cover_job for job, _ in report['uploaded']):
         print(f"🎨 Обложка альбома успешно загружена")
-    elif cover_file:
+    elif cover_job:
         print(f"⚠️  Обложка не была загружена")
     
-    if uploaded_count > 0:
+    if report['uploaded']:
+        # Потоковые версии, созданные build_playlist.py (в том числе для FLAC и WAV)
+        sync_renditions()
         print("=== ЗАГРУЗКА ЗАВЕРШЕНА ===")
         return True
     else:
@@ -245,7 +197,8 @@ def upload_single_album_folder(album_folder_name, custom_blob_path=None):
     if custom_blob_path:
         blob_path = custom_blob_path
     else:
-        blob_path = f"music/{album_folder_name}"
+        # Если альбом заменялся через replace_album, грузим в папку текущей версии
+        blob_path = release_blob_dir(f"music/{album_folder_name}", load_release_versions())
     
     return upload_album(local_path, blob_path)
 
@@ -1,13 +1,13 @@
 # upload_music.py - Финальная версия с диагностикой токена
 
 import os
-import mimetypes
 import dotenv
-from vercel_blob import put
 from mutagen.mp3 import MP3
 from mutagen.wave import WAVE
 from mutagen import MutagenError
 from dotenv import load_dotenv
+from blob_transfer import make_upload_job, upload_files, print_upload_report, UPLOAD_CONCURRENCY
+from blob_sync import sync_directory, sync_renditions
 
 # Загрузка переменных окружения из .env.development.local
 print("Загрузка переменных окружения из .env.development.local...")
@@ -23,6 +23,7 @@ def upload_files_to_blob():
         print(f"ОШИБКА: Директория '{MUSIC_DIR}' не найдена.")
         return
 
+    jobs = []
     for root, dirs, files in os.walk(MUSIC_DIR):
         for filename in files:
             if filename.startswith('.'):
@@ -30,22 +31,11 @@ def upload_files_to_blob():
             
             local_path = os.path.join(root, filename)
             blob_path = local_path.replace("\\", "/")
+            jobs.append(make_upload_job(local_path, blob_path))
 
-            print(f"  Загрузка: {local_path} -> {blob_path}")
-
-            try:
-                with open(local_path, 'rb') as f:
-                    file_content = f.read()
-                    
-                    content_type, _ = mimetypes.guess_type(local_path)
-                    if content_type is None:
-                        content_type = 'application/octet-stream'
-
-                    blob_result = put(blob_path, file_content, options={'content_type': content_type})
-                    print(f"    Успешно! URL: {blob_result['url']}")
-
-            except Exception as e:
-                print(f"    ОШИБКА при загрузке файла '{local_path}': {e}")
+    print(f"  Файлов к загрузке: {len(jobs)} (параллельно: {UPLOAD_CONCURRENCY})")
+    report = upload_files(jobs)
+    print_upload_report(report)
     
     print("--- Загрузка завершена ---")
 
@@ -62,4 +52,13 @@ if __name__ == '__main__':
         # ✅ ДИАГНОСТИКА: Выводим часть токена для проверки
         print(f"Используется токен, начинающийся с: {token[:15]}...")
 
-        upload_files_to_blob()
+        # Вариант 1: Загрузить только новые и изменённые файлы (по хешам содержимого)
+        sync_directory(MUSIC_DIR)
+        # Потоковые версии, созданные build_playlist.py
+        sync_renditions()
+
+        # Вариант 2: Синхронизация с удалением из blob файлов, которых нет локально
+        # sync_directory(MUSIC_DIR, delete_orphans=True)
+
+        # Вариант 3: Полная перезаливка всех файлов
+        # upload_files_to_blob()